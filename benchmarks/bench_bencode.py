@@ -0,0 +1,48 @@
+"""Decoding large multi-file torrents with rtorrent.lib.bencode
+
+Run from the top of the source tree: python -m benchmarks.bench_bencode
+"""
+
+import os
+from timeit import default_timer as timer
+
+import rtorrent.lib.bencode as bencode
+
+
+def _int(i):
+    return(("i%de" % i).encode())
+
+
+def _str(data):
+    if not isinstance(data, bytes):
+        data = data.encode()
+    return(("%d:" % len(data)).encode() + data)
+
+
+def make_torrent(files, pieces_size):
+    """Build a multi-file torrent with random piece hashes"""
+    file_list = b"".join(
+        b"d" + _str("length") + _int(1000 + i) + _str("path") +
+        b"l" + _str("dir%d" % (i % 20)) + _str("file-%06d.bin" % i) + b"ee"
+        for i in range(files))
+    info = b"d" + _str("files") + b"l" + file_list + b"e" + \
+        _str("name") + _str("big") + _str("piece length") + _int(262144) + \
+        _str("pieces") + _str(os.urandom(pieces_size // 20 * 20)) + b"e"
+
+    return(b"d" + _str("announce") + _str("http://tracker/announce") +
+           _str("info") + info + b"e")
+
+
+def main():
+    for files, pieces_size in ((100, 4 << 20), (2000, 4 << 20),
+                               (10000, 1 << 20), (100000, 1 << 20)):
+        data = make_torrent(files, pieces_size)
+
+        start = timer()
+        bencode.decode(data)
+        print("%6d files, %4.1f MB: %.4f s" % (files, len(data) / 1e6,
+                                               timer() - start))
+
+
+if __name__ == "__main__":
+    main()
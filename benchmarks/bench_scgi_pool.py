@@ -0,0 +1,61 @@
+"""Request latency of PooledSCGITransport against a new SCGITransport per
+call, with a fake rTorrent on localhost
+
+Run from the top of the source tree: python -m benchmarks.bench_scgi_pool
+"""
+
+import sys
+import time
+from timeit import default_timer as timer
+
+from rtorrent.lib.xmlrpc.scgi import (SCGIServerProxy, SCGITransport,
+                                      PooledSCGITransport)
+from tests.fakeserver import FakeRTorrent
+
+
+def bench_calls(uri, calls):
+    pooled = PooledSCGITransport()
+    for name, get_proxy in (
+            ("new SCGITransport per call", lambda: SCGIServerProxy(uri)),
+            ("shared PooledSCGITransport",
+             lambda: SCGIServerProxy(uri, transport=pooled))):
+        get_proxy().system.client_version()
+        start = timer()
+        for i in range(calls):
+            get_proxy().system.client_version()
+
+        print("%-28s %7.1f us/call" % (name,
+                                       (timer() - start) / calls * 1e6))
+
+
+def bench_connect(host, requests):
+    """Time spent connecting on the request path, the pool connects ahead
+    of time"""
+    for transport in (SCGITransport(), PooledSCGITransport()):
+        total = 0
+        for i in range(requests):
+            if isinstance(transport, PooledSCGITransport):
+                transport._replenish(host, "/")
+                time.sleep(0)  # whatever the caller does between requests
+            start = timer()
+            transport._connect(host, "/").close()
+            total += timer() - start
+
+        print("%-28s %7.1f us/request" % (
+            transport.__class__.__name__ + "._connect",
+            total / requests * 1e6))
+
+
+def main(calls=2000):
+    fake = FakeRTorrent(torrents=5)
+    # a host name, so the uncached transport resolves it on every request
+    uri = fake.serve().replace("127.0.0.1", "localhost")
+    try:
+        bench_calls(uri, calls)
+        bench_connect(uri[len("scgi://"):], calls)
+    finally:
+        fake.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
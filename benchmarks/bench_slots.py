@@ -0,0 +1,122 @@
+"""Memory kept by the Torrent, Peer, Tracker and File instances built from
+the responses of a fake rTorrent on localhost, compared with copies of the
+classes that store their fields in __dict__
+
+Only building the instances is traced, the responses are received first
+(tracemalloc slows the XML-RPC parsing down a lot).
+
+Run from the top of the source tree:
+python -m benchmarks.bench_slots [torrents] [peers/trackers/files]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import rtorrent
+import rtorrent.file
+import rtorrent.peer
+import rtorrent.rpc
+import rtorrent.tracker
+from rtorrent.file import File
+from rtorrent.peer import Peer
+from rtorrent.torrent import Torrent
+from rtorrent.tracker import Tracker
+from tests.fakeserver import FakeRTorrent
+
+
+def without_slots(class_):
+    """Copy C{B{class_}} without the slots added by rpc._add_slots()"""
+    namespace = {}
+    for k, v in class_.__dict__.items():
+        if isinstance(v, rtorrent.rpc._Field):
+            v = v.method
+        if v is not None and k not in class_.__slots__ and \
+                k != "__slots__":
+            namespace[k] = v
+
+    return(type(class_.__name__, class_.__bases__, namespace))
+
+
+def trace(build):
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return(len(objects), size)
+
+
+def measure(name, build, owner, class_attr, class_):
+    """Build the instances with C{B{class_}}, then with its copy without
+    slots, by setting C{B{class_attr}} of C{B{owner}}"""
+    count, size = trace(build)
+    setattr(owner, class_attr, without_slots(class_))
+    try:
+        dict_size = trace(build)[1]
+    finally:
+        setattr(owner, class_attr, class_)
+
+    print("%-8s x%-6d %5.1f MiB %5.0f B/obj (__dict__: %5.1f MiB %5.0f "
+          "B/obj)" % (name, count, size / 2.0 ** 20, size / count,
+                      dict_size / 2.0 ** 20, dict_size / count))
+
+
+def get_results(rt, obj, multicall_name, method_list, *args):
+    retriever_methods = rtorrent.rpc.get_retriever_methods(method_list, rt)
+    m = rtorrent.rpc.Multicall(obj)
+    m.add(multicall_name, *(args + tuple(method.rpc_call + "="
+                                         for method in retriever_methods)))
+
+    return(retriever_methods, m.call()[0])
+
+
+class TorrentBuilder(object):
+
+    torrent_class = Torrent
+
+    def __init__(self, rt, retriever_methods, results):
+        self.rt = rt
+        self.retriever_methods = retriever_methods
+        self.results = results
+
+    def build(self):
+        """Same as RTorrent._build_torrent(), with self.torrent_class"""
+        torrents = []
+        for result in self.results:
+            fields = dict((m.varname, rtorrent.rpc.process_result(m, r))
+                          for m, r in zip(self.retriever_methods, result[1:]))
+            torrents.append(self.torrent_class(self.rt, result[0], **fields))
+
+        return(torrents)
+
+
+def main(torrents=5000, entries=20000):
+    fake = FakeRTorrent(torrents=torrents, files=entries, peers=entries,
+                        trackers=entries)
+    try:
+        rt = rtorrent.RTorrent(fake.serve())
+        builder = TorrentBuilder(rt, *get_results(
+            rt, rt, "d.multicall", rtorrent.torrent.methods, "main",
+            "d.get_hash="))
+        measure("Torrent", builder.build, builder, "torrent_class", Torrent)
+
+        torrent = rt.get_torrents(fields=["name"])[0]
+        for name, build, multicall_name, method_list, class_attr, class_ in (
+                ("Peer", torrent._build_peers, "p.multicall",
+                 rtorrent.peer.methods, "_peer_class", Peer),
+                ("Tracker", torrent._build_trackers, "t.multicall",
+                 rtorrent.tracker.methods, "_tracker_class", Tracker),
+                ("File", torrent._build_files, "f.multicall",
+                 rtorrent.file.methods, "_file_class", File)):
+            args = get_results(rt, torrent, multicall_name, method_list,
+                               torrent.info_hash, "")
+            measure(name, lambda: build(*args), Torrent, class_attr, class_)
+    finally:
+        fake.close()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
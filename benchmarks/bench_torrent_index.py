@@ -0,0 +1,61 @@
+"""get_torrents() and find_torrent() with many torrents, with a fake
+rTorrent on localhost
+
+The info hash index makes the tracker/peer/file carry-over of
+get_torrents() and each find_torrent() lookup independent of the number of
+torrents, a scan of the torrent list is timed for comparison.
+
+Run from the top of the source tree:
+python -m benchmarks.bench_torrent_index [torrents ...]
+"""
+
+import sys
+from timeit import default_timer as timer
+
+import rtorrent
+from rtorrent.common import find_torrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+LOOKUPS = 200
+
+
+def bench(count):
+    fake = FakeRTorrent(torrents=count, files=0, peers=0, trackers=0)
+    try:
+        rt = rtorrent.RTorrent(fake.serve())
+        rt.get_torrents(fields=["name"])
+
+        start = timer()
+        rt.get_torrents(fields=["name"])
+        get_torrents = timer() - start
+
+        start = timer()
+        rt._manage_torrent_cache()
+        carry_over = timer() - start
+    finally:
+        fake.close()
+
+    # the last torrents are the worst case of a scan
+    info_hashes = [info_hash(i) for i in range(count - LOOKUPS, count)]
+    start = timer()
+    for h in info_hashes:
+        find_torrent(h, rt._torrent_index)
+    lookup = (timer() - start) / LOOKUPS
+
+    start = timer()
+    for h in info_hashes:
+        find_torrent(h, rt.torrents)
+    scan = (timer() - start) / LOOKUPS
+
+    print("%6d torrents: get_torrents %.3f s, carry-over %.4f s, "
+          "find_torrent %.2f us (list scan %.1f us)" % (
+              count, get_torrents, carry_over, lookup * 1e6, scan * 1e6))
+
+
+def main(*counts):
+    for count in counts or (1000, 10000, 50000):
+        bench(count)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
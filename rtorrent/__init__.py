@@ -21,7 +21,11 @@ try:
     import urllib.parse as urlparser
 except ImportError:
     import urllib as urlparser
+import inspect
+import multiprocessing
+import multiprocessing.pool
 import os.path
+import threading
 import time
 try:
     import xmlrpc.client as xmlrpclib
@@ -29,13 +33,20 @@ except ImportError:
     import xmlrpclib
 
 from rtorrent.common import find_torrent, \
-    is_valid_port, convert_version_tuple_to_str
+    is_valid_port, convert_version_tuple_to_str, SingleFlight
 from rtorrent.lib.torrentparser import TorrentParser
+from rtorrent.lib.bencode import BencodeDecodeError
+from rtorrent.err import DuplicateTorrentError
 from rtorrent.lib.xmlrpc.http import HTTPServerProxy
-from rtorrent.lib.xmlrpc.scgi import SCGIServerProxy
-from rtorrent.rpc import Method
+from rtorrent.lib.xmlrpc.scgi import SCGIServerProxy, PooledSCGITransport
+from rtorrent.rpc import Method, CallCache, IMMUTABLE, SLOW
 from rtorrent.lib.xmlrpc.basic_auth import BasicAuthTransport
+from rtorrent.lib.xmlrpc.stream import iter_rows
 from rtorrent.torrent import Torrent
+from rtorrent.bulk import BulkAction
+from rtorrent.poller import Poller
+from rtorrent.table import TorrentTable
+import rtorrent.events
 from rtorrent.group import Group
 import rtorrent.rpc  # @UnresolvedImport
 
@@ -53,7 +64,8 @@ class RTorrent:
     rpc_prefix = None
 
     def __init__(self, uri, username=None, password=None,
-                 verify=False, sp=None, sp_kwargs=None):
+                 verify=False, sp=None, sp_kwargs=None, cache=None,
+                 max_connections=4):
         self.uri = uri  # : From X{__init__(self, url)}
 
         self.username = username
@@ -72,10 +84,32 @@ class RTorrent:
 
         self.sp_kwargs = sp_kwargs or {}
 
+        # SCGI connections can't be reused, but every Multicall instance
+        # shares a transport that keeps connected sockets ready, and sends
+        # at most max_connections requests at a time
+        self._transport = None
+        if inspect.isclass(self.sp) and \
+                issubclass(self.sp, SCGIServerProxy) and \
+                "transport" not in self.sp_kwargs:
+            self._transport = PooledSCGITransport(
+                use_datetime=self.sp_kwargs.get("use_datetime", False),
+                max_connections=max_connections)
+
         self.torrents = []  # : List of L{Torrent} instances
         self._rpc_methods = []  # : List of rTorrent RPC methods
-        self._torrent_cache = []
+        self._capabilities = None  # : see _get_capabilities()
+        self._torrent_index = {}  # : info hash -> L{Torrent}, see get_torrents()
+        self._torrent_cache = {}
+        self._sync_state = {}  # : view -> (fields, torrents, time), see sync()
+        self._snapshots = {}  # : previous snapshots, see _poll_events()
+        self._subscribers = []  # : (callback, event types, view) tuples
+        self._pollers = {}  # : view -> L{Poller}, see start_poller()
         self._client_version_tuple = ()
+        self._cache = cache  # : L{CallCache} for retriever results, or None
+        self.dirty_fields = set()  # : fields a modifier might not have set
+        self._lock = threading.RLock()  # : guards the capabilities and torrent lists
+        self._sync_lock = threading.RLock()  # : one sync()/poll_events() at a time
+        self._single_flight = SingleFlight()  # : see get_torrents()
 
         if verify is True:
             self._verify_conn()
@@ -92,6 +126,10 @@ class RTorrent:
                 **self.sp_kwargs
             )
 
+        if self._transport is not None:
+            return self.sp(self.uri, transport=self._transport,
+                           **self.sp_kwargs)
+
         return self.sp(self.uri, **self.sp_kwargs)
 
     def _verify_conn(self):
@@ -108,23 +146,42 @@ class RTorrent:
         return self._get_client_version_tuple() >= MIN_RTORRENT_VERSION
 
     def _get_client_version_tuple(self):
-        conn = self._get_conn()
-
         if not self._client_version_tuple:
-            if not hasattr(self, "client_version"):
-                setattr(self, "client_version",
-                        conn.system.client_version())
+            with self._lock:
+                if not self._client_version_tuple:
+                    if not hasattr(self, "client_version"):
+                        setattr(self, "client_version",
+                                self._get_conn().system.client_version())
 
-            rtver = getattr(self, "client_version")
-            self._client_version_tuple = tuple([int(i) for i in
-                                                rtver.split(".")])
+                    rtver = getattr(self, "client_version")
+                    self._client_version_tuple = tuple([int(i) for i in
+                                                        rtver.split(".")])
 
         return self._client_version_tuple
 
     def _update_rpc_methods(self):
-        self._rpc_methods = self._get_conn().system.listMethods()
+        rpc_methods = self._get_conn().system.listMethods()
+        with self._lock:
+            self._rpc_methods = rpc_methods
+            self._capabilities = None
+
+        return rpc_methods
 
-        return self._rpc_methods
+    def _get_capabilities(self):
+        """Get the index of supported methods, building it if needed
+
+        @rtype: L{rtorrent.rpc.CapabilityIndex}
+        """
+        capabilities = self._capabilities
+        if capabilities is None:
+            with self._lock:
+                if self._capabilities is None:
+                    self._capabilities = rtorrent.rpc.CapabilityIndex(
+                        self._get_rpc_methods(),
+                        self._get_client_version_tuple())
+                capabilities = self._capabilities
+
+        return capabilities
 
     def _get_rpc_methods(self):
         """ Get list of raw RPC commands
@@ -135,50 +192,454 @@ class RTorrent:
 
         return(self._rpc_methods or self._update_rpc_methods())
 
-    def get_torrents(self, view="main"):
+    def get_torrents(self, view="main", fields=None):
         """Get list of all torrents in specified view
 
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field)
+        @type fields: list
+
         @return: list of L{Torrent} instances
 
         @rtype: list
 
+        @note: threads that call this while an identical call (same view
+        and fields) is in flight wait for it and get the same list
+
         @todo: add validity check for specified view
         """
-        self.torrents = []
-        methods = rtorrent.torrent.methods
-        retriever_methods = [m for m in methods
-                             if m.is_retriever() and m.is_available(self)]
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.torrent.methods, self, fields)
+
+        return(self._single_flight.do(
+            ("get_torrents", view, tuple(retriever_methods)),
+            self._get_torrents, view, retriever_methods))
 
+    def _get_torrents(self, view, retriever_methods):
         m = rtorrent.rpc.Multicall(self)
         m.add("d.multicall", view, "d.get_hash=",
               *[method.rpc_call + "=" for method in retriever_methods])
 
         results = m.call()[0]  # only sent one call, only need first result
 
-        for result in results:
-            results_dict = {}
-            # build results_dict
-            for m, r in zip(retriever_methods, result[1:]):  # result[0] is the info_hash
-                results_dict[m.varname] = rtorrent.rpc.process_result(m, r)
+        torrents = [self._build_torrent(retriever_methods, result)
+                    for result in results]
 
-            self.torrents.append(
-                Torrent(self, info_hash=result[0], **results_dict)
-            )
+        with self._lock:
+            self.torrents = torrents
+            self._torrent_index = dict([(t.info_hash, t) for t in torrents])
+            self._manage_torrent_cache()
+
+        return(torrents)
+
+    def iter_torrents(self, view="main", fields=None):
+        """Iterate over the torrents in specified view as they're received
+
+        Each L{Torrent} is yielded as soon as its row has been read from the
+        response, so only one row needs to be held in memory at a time.
+
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field)
+        @type fields: list
+
+        @return: generator of L{Torrent} instances
+
+        @note: unlike get_torrents(), self.torrents isn't updated. Streaming
+        is only supported by the SCGI transport, other transports receive
+        the full response before the first torrent is yielded.
+        """
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.torrent.methods, self, fields)
+
+        for row in self._iter_torrent_rows(view, retriever_methods):
+            yield self._build_torrent(retriever_methods, row)
+
+    def _iter_torrent_rows(self, view, retriever_methods):
+        """Iterate over the raw d.multicall rows (info hash first), streaming
+        the response if the transport supports it"""
+        args = [view, "d.get_hash="] + \
+            [method.rpc_call + "=" for method in retriever_methods]
+
+        conn = self._get_conn()
+        try:
+            stream = conn("stream")
+        except (AttributeError, TypeError):
+            stream = None
+
+        if stream is not None:
+            rows = iter_rows(stream("d.multicall", tuple(args)),
+                             use_datetime=self.sp_kwargs.get("use_datetime",
+                                                             False))
+        else:
+            m = rtorrent.rpc.Multicall(self)
+            m.add("d.multicall", *args)
+            rows = m.call()[0]
+
+        return(rows)
+
+    def get_torrent_table(self, view="main", fields=None, use_numpy=None):
+        """Get a column-oriented snapshot of the torrents in specified view
+
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field)
+        @type fields: list
+
+        @param use_numpy: store the columns in numpy arrays (default: if
+        numpy is installed)
+        @type use_numpy: bool
+
+        @return: table with an info_hash column and a column per field
+        @rtype: L{TorrentTable}
+        """
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.torrent.methods, self, fields)
+
+        info_hashes = []
+        columns = [[] for m in retriever_methods]
+        process_result = rtorrent.rpc.process_result
+        for row in self._iter_torrent_rows(view, retriever_methods):
+            info_hashes.append(row[0])
+            for column, m, r in zip(columns, retriever_methods, row[1:]):
+                column.append(process_result(m, r))
+
+        return(TorrentTable(
+            [("info_hash", info_hashes)] +
+            [(m.varname, column)
+             for m, column in zip(retriever_methods, columns)],
+            use_numpy))
+
+    def sync(self, view="main", fields=None, static_fields=None,
+             batch_size=1000, slow_fields=None, slow_interval=300):
+        """Update self.torrents, only retrieving what can have changed
+
+        The first sync of a view retrieves every field. After that, a single
+        d.multicall retrieves the info hashes and the volatile C{B{fields}},
+        which tells which torrents were added or removed. The
+        C{B{static_fields}} and C{B{slow_fields}} are only retrieved for the
+        added torrents, and the C{B{slow_fields}} of every torrent once every
+        C{B{slow_interval}} seconds. The L{Torrent} instances of the other
+        torrents are updated in place.
+
+        @param fields: volatile fields, given as varnames or L{Method}
+        instances (default: L{rtorrent.torrent.volatile_fields})
+        @type fields: list
+
+        @param static_fields: fields that don't change once a torrent is
+        loaded (default: L{rtorrent.torrent.static_fields})
+        @type static_fields: list
+
+        @param batch_size: max number of calls per request when retrieving
+        the static fields of added torrents
+        @type batch_size: int
+
+        @param slow_fields: fields that rarely change (default:
+        L{rtorrent.torrent.slow_fields})
+        @type slow_fields: list
+
+        @param slow_interval: min number of seconds between two retrievals
+        of the C{B{slow_fields}} of every torrent
+        @type slow_interval: int
+
+        @return: (added L{Torrent} instances, removed L{Torrent} instances)
+        @rtype: tuple
+
+        @note: concurrent calls are run one after the other
+
+        @note: the modifiers called on the L{Torrent} instances update their
+        local value (see L{rtorrent.rpc.Multicall}), the changes made by
+        other clients show up within C{B{slow_interval}} seconds
+        """
+        with self._sync_lock:
+            return(self._sync(view, fields, static_fields, batch_size,
+                              slow_fields, slow_interval))
+
+    def _sync(self, view, fields, static_fields, batch_size, slow_fields,
+              slow_interval):
+        volatile_methods = self._get_sync_methods(
+            fields, rtorrent.torrent.volatile_fields)
+        slow_methods = [m for m in self._get_sync_methods(
+            slow_fields, rtorrent.torrent.slow_fields)
+            if m not in volatile_methods]
+        static_methods = [m for m in self._get_sync_methods(
+            static_fields, rtorrent.torrent.static_fields)
+            if m not in volatile_methods and m not in slow_methods]
+
+        synced_methods, old_torrents, slow_synced = self._sync_state.get(
+            view, (None, {}, 0))
+        if synced_methods != (static_methods, slow_methods):
+            old_torrents = {}  # first sync, or the static fields changed
+
+        # the slow fields of every torrent, when they're due
+        refresh_methods = []
+        now = time.time()
+        if not old_torrents or now - slow_synced >= slow_interval:
+            refresh_methods = slow_methods
+            slow_synced = now
+
+        process_result = rtorrent.rpc.process_result
+        torrents = {}
+        added = []
+        if not old_torrents:
+            retriever_methods = static_methods + slow_methods + \
+                volatile_methods
+            for row in self._iter_torrent_rows(view, retriever_methods):
+                torrent = self._build_torrent(retriever_methods, row)
+                torrents[torrent.info_hash] = torrent
+                added.append(torrent)
+        else:
+            updated_methods = refresh_methods + volatile_methods
+            new_rows = []
+            for row in self._iter_torrent_rows(view, updated_methods):
+                torrent = old_torrents.get(row[0])
+                if torrent is None:
+                    new_rows.append(row)
+                    torrents[row[0]] = None  # keep the order of the view
+                    continue
+
+                for m, r in zip(updated_methods, row[1:]):
+                    setattr(torrent, m.varname, process_result(m, r))
+                if torrent.dirty_fields:
+                    torrent.dirty_fields.difference_update(
+                        [m.varname for m in updated_methods])
+                torrent._call_custom_methods()
+                torrents[row[0]] = torrent
+
+            # the fields of the added torrents that weren't in their row
+            added_methods = static_methods + \
+                [m for m in slow_methods if m not in refresh_methods]
+            for row, static_row in zip(new_rows, self._get_static_rows(
+                    [row[0] for row in new_rows], added_methods,
+                    batch_size)):
+                if static_row is None:
+                    # removed before its static fields were retrieved
+                    del torrents[row[0]]
+                    continue
+
+                torrent = self._build_torrent(
+                    added_methods + updated_methods,
+                    [row[0]] + static_row + list(row[1:]))
+                torrents[row[0]] = torrent
+                added.append(torrent)
+
+        removed = [t for info_hash, t in old_torrents.items()
+                   if info_hash not in torrents]
+
+        with self._lock:
+            self._sync_state[view] = ((static_methods, slow_methods),
+                                      torrents, slow_synced)
+            self.torrents = list(torrents.values())
+            self._torrent_index = torrents
+            self._torrent_cache = torrents
+
+        return(added, removed)
+
+    def poll_events(self, view="main", fields=None, thresholds=None):
+        """Take a snapshot of the view and report what changed since the
+        previous snapshot
+
+        The events are also passed to the callbacks registered with
+        L{subscribe}.
+
+        @param fields: fields to retrieve besides the ones needed for the
+        events (see L{rtorrent.events.EVENT_FIELDS})
+        @type fields: list
+
+        @param thresholds: see L{rtorrent.events.diff}
+        @type thresholds: dict
+
+        @return: L{rtorrent.events.TorrentEvent} instances, none on the
+        first call for a view and fields (there's nothing to compare with
+        yet)
+        @rtype: list
+
+        @note: calls with different fields or thresholds, and the pollers
+        started with L{start_poller}, each compare with their own previous
+        snapshot
+        """
+        return(self._poll_events(None, view, fields, thresholds))
+
+    def _get_snapshot_fields(self, fields, thresholds):
+        snapshot_fields = []
+        for field in list(rtorrent.events.EVENT_FIELDS) + \
+                list(thresholds or {}) + list(fields or []):
+            if field not in snapshot_fields:
+                snapshot_fields.append(field)
+
+        return(snapshot_fields)
 
-        self._manage_torrent_cache()
-        return(self.torrents)
+    def _poll_events(self, key, view, fields, thresholds):
+        """See L{poll_events}
+
+        @param key: key of the previous snapshot in self._snapshots
+        (default: the view and the snapshot's fields), a L{Poller} uses
+        itself
+        """
+        snapshot_fields = self._get_snapshot_fields(fields, thresholds)
+        if key is None:
+            key = (view, tuple(snapshot_fields))
+
+        # one at a time, so the snapshots are compared in the order they
+        # were taken
+        with self._sync_lock:
+            snapshot = self.get_torrent_table(view, snapshot_fields)
+            previous = self._snapshots.get(key)
+            self._snapshots[key] = snapshot
+            if previous is None:
+                return([])
+
+            events = list(rtorrent.events.diff(previous, snapshot,
+                                               thresholds, view))
+
+        self._dispatch_events(events)
+        return(events)
+
+    def subscribe(self, callback, event_types=None, view=None):
+        """Call C{callback(event)} for each event found by L{poll_events}
+
+        @param event_types: only these event types (default: all), see
+        L{rtorrent.events}
+        @type event_types: list
+
+        @param view: only the events of this view (default: all views)
+        @type view: str
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + [(callback, event_types,
+                                                      view)]
+
+    def unsubscribe(self, callback):
+        """Stop calling C{B{callback}}, see L{subscribe}"""
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers
+                                 if s[0] != callback]
+
+    def start_poller(self, interval=5, fields=None, view="main",
+                     thresholds=None):
+        """Poll the view every C{B{interval}} seconds in a background thread
+
+        Every consumer can read the latest snapshot with L{get_snapshot}
+        without making any requests, and get the changes between two polls
+        with L{subscribe}, so rTorrent is polled once per interval however
+        many consumers there are.
+
+        @param fields: fields to retrieve besides the ones needed for the
+        events, see L{poll_events}
+        @type fields: list
+
+        @param thresholds: see L{rtorrent.events.diff}
+        @type thresholds: dict
+
+        @return: the poller, call its stop() method to stop polling
+        @rtype: L{Poller}
+
+        @note: if the view is already being polled, its poller is returned
+        (the fields and thresholds it was started with are kept)
+        """
+        with self._lock:
+            poller = self._pollers.get(view)
+            if poller is None or not poller.is_alive():
+                if poller is not None:
+                    self._snapshots.pop(poller, None)
+                poller = Poller(self, interval, view, fields, thresholds)
+                poller.start()
+                self._pollers[view] = poller
+
+        return(poller)
+
+    def get_snapshot(self, view="main", fields=None, thresholds=None):
+        """Get the latest snapshot of the view
+
+        Without fields and thresholds, that's the snapshot taken by the
+        view's poller (see L{start_poller}) if it has one, otherwise the one
+        taken by C{poll_events(view)}. Otherwise it's the one taken by
+        L{poll_events} with the same fields and thresholds.
+
+        @return: None if the view hasn't been polled yet
+        @rtype: L{TorrentTable}
+        """
+        if fields is None and thresholds is None:
+            poller = self._pollers.get(view)
+            if poller is not None:
+                return(self._snapshots.get(poller))
+
+        key = (view, tuple(self._get_snapshot_fields(fields, thresholds)))
+        return(self._snapshots.get(key))
+
+    def _dispatch_events(self, events):
+        for callback, event_types, view in self._subscribers:
+            for event in events:
+                if view is not None and event.view != view:
+                    continue
+                if event_types is None or event.event_type in event_types:
+                    callback(event)
+
+    def _get_sync_methods(self, fields, default_fields):
+        if fields is not None:
+            return(rtorrent.rpc.get_retriever_methods(
+                rtorrent.torrent.methods, self, fields))
+
+        # skip the default fields this version of rTorrent doesn't support
+        retriever_methods = []
+        varnames = set()
+        for m in rtorrent.torrent.methods:
+            if m.varname in default_fields and m.varname not in varnames \
+                    and m.is_retriever() and m.is_available(self):
+                retriever_methods.append(m)
+                varnames.add(m.varname)
+
+        return(retriever_methods)
+
+    def _get_static_rows(self, info_hashes, static_methods, batch_size):
+        """Retrieve C{B{static_methods}} of each torrent
+
+        @return: list of results per torrent, or None for the torrents that
+        couldn't be found
+        @rtype: list
+        """
+        if not static_methods:
+            return([[] for info_hash in info_hashes])
+
+        rows = []
+        per_batch = max(1, batch_size // len(static_methods))
+        for i in range(0, len(info_hashes), per_batch):
+            batch = info_hashes[i:i + per_batch]
+
+            m = rtorrent.rpc.Multicall(self)
+            for info_hash in batch:
+                for method in static_methods:
+                    m.add(method, info_hash)
+
+            results = m._send()
+            for j in range(len(batch)):
+                row = list(results[j * len(static_methods):
+                                   (j + 1) * len(static_methods)])
+                if [r for r in row if isinstance(r, xmlrpclib.Fault)]:
+                    row = None
+                rows.append(row)
+
+        return(rows)
+
+    def _build_torrent(self, retriever_methods, result):
+        """Create a L{Torrent} instance from a row of d.multicall results"""
+        results_dict = {}
+        # build results_dict
+        for m, r in zip(retriever_methods, result[1:]):  # result[0] is the info_hash
+            results_dict[m.varname] = rtorrent.rpc.process_result(m, r)
+
+        return(Torrent(self, info_hash=result[0], **results_dict))
 
     def _manage_torrent_cache(self):
         """Carry tracker/peer/file lists over to new torrent list"""
-        for torrent in self._torrent_cache:
-            new_torrent = rtorrent.common.find_torrent(torrent.info_hash,
-                                                       self.torrents)
-            if new_torrent is not None:
+        for new_torrent in self.torrents:
+            torrent = self._torrent_cache.get(new_torrent.info_hash)
+            if torrent is not None:
                 new_torrent.files = torrent.files
+                new_torrent._file_fields = torrent._file_fields
+                new_torrent._file_lookup = torrent._file_lookup
                 new_torrent.peers = torrent.peers
                 new_torrent.trackers = torrent.trackers
 
-        self._torrent_cache = self.torrents
+        self._torrent_cache = self._torrent_index
 
     def _get_load_function(self, file_type, start, verbose):
         """Determine correct "load torrent" RPC method"""
@@ -205,7 +666,9 @@ class RTorrent:
 
         return(func_name)
 
-    def load_torrent(self, torrent, start=False, verbose=False, verify_load=True, verify_retries=3):
+    def load_torrent(self, torrent, start=False, verbose=False,
+                     verify_load=True, verify_retries=3, verify_timeout=3,
+                     fields=None):
         """
         Loads torrent into rTorrent (with various enhancements)
 
@@ -222,9 +685,23 @@ class RTorrent:
         @param verify_load: verify that torrent was added to rTorrent successfully
         @type verify_load: bool
 
+        @param verify_retries: max number of times to check again if the
+        torrent wasn't found (None: until verify_timeout is reached)
+        @type verify_retries: int
+
+        @param verify_timeout: give up verifying after this many seconds, even
+        if there are retries left. The delay between checks starts at 50ms
+        and doubles after each check
+        @type verify_timeout: float
+
+        @param fields: fields of the returned L{Torrent} instance, given as
+        varnames or L{Method} instances (default: every available field)
+        @type fields: list
+
         @return: Depends on verify_load:
                  - if verify_load is True, (and the torrent was
-                 loaded successfully), it'll return a L{Torrent} instance
+                 loaded successfully), it'll return a L{Torrent} instance,
+                 which is added to self.torrents
                  - if verify_load is False, it'll return None
 
         @rtype: L{Torrent} instance or None
@@ -248,22 +725,69 @@ class RTorrent:
 
         # load torrent
         getattr(p, func_name)(torrent)
+        if self._cache is not None:
+            # it might have been erased and loaded again
+            self._cache.evict(info_hash, self.uri)
 
         if verify_load:
+            retriever_methods = rtorrent.rpc.get_retriever_methods(
+                rtorrent.torrent.methods, self, fields)
+            deadline = time.time() + verify_timeout
+            delay = 0.05
             i = 0
-            while i < verify_retries:
-                self.get_torrents()
-                if info_hash in [t.info_hash for t in self.torrents]:
+            while True:
+                # only ask for this torrent, instead of calling get_torrents()
+                loaded = self._get_torrent(info_hash, retriever_methods)
+                if loaded is not None:
+                    self._add_torrent(loaded)
+                    return(loaded)
+
+                remaining = deadline - time.time()
+                if remaining <= 0 or \
+                        (verify_retries is not None and i >= verify_retries):
                     break
 
-                # was still getting AssertionErrors, delay should help
-                time.sleep(1)
+                time.sleep(min(delay, remaining))
+                delay *= 2
                 i += 1
 
-            assert info_hash in [t.info_hash for t in self.torrents],\
-                "Adding torrent was unsuccessful."
+            raise AssertionError("Adding torrent was unsuccessful.")
+
+        return(find_torrent(info_hash, self._torrent_index))
+
+    def _add_torrent(self, torrent):
+        """Add C{B{torrent}} to self.torrents and the info hash index,
+        replacing the instance of the same torrent"""
+        with self._lock:
+            # the index might be a sync() state, it's replaced, not changed
+            index = dict(self._torrent_index)
+            replaced = index.get(torrent.info_hash)
+            index[torrent.info_hash] = torrent
+            if replaced is None:
+                self.torrents = self.torrents + [torrent]
+            else:
+                self.torrents = [torrent if t is replaced else t
+                                 for t in self.torrents]
+            self._torrent_index = index
 
-        return(find_torrent(info_hash, self.torrents))
+    def _get_torrent(self, info_hash, retriever_methods):
+        """Get the given fields of a single torrent
+
+        @return: L{Torrent} instance, or None if rTorrent doesn't have a
+        torrent with that info hash
+        @rtype: Torrent
+        """
+        m = rtorrent.rpc.Multicall(self)
+        m.add("d.get_hash", info_hash)
+        for method in retriever_methods:
+            m.add(method, info_hash)
+
+        results = m._send()
+        if isinstance(results[0], xmlrpclib.Fault):
+            return(None)  # info hash not found
+
+        rtorrent.rpc._raise_faults(results)
+        return(self._build_torrent(retriever_methods, results))
 
     def load_torrent_simple(self, torrent, file_type,
                             start=False, verbose=False):
@@ -311,9 +835,133 @@ class RTorrent:
 
         getattr(p, func_name)(finput)
 
+    def load_torrents(self, torrents, start=False, verbose=False,
+                      workers=None, batch_size=50,
+                      max_batch_bytes=1024 * 1024):
+        """Load many torrents into rTorrent
+
+        The torrents are parsed and hashed in a pool of C{B{workers}}
+        threads, and loaded as they come in using batched system.multicall
+        requests, so the number of round trips stays low.
+
+        @param torrents: paths to local files, and/or the raw data of
+        torrent files
+        @type torrents: list
+
+        @param start: start torrents when loaded
+        @type start: bool
+
+        @param verbose: print error messages to rTorrent log
+        @type verbose: bool
+
+        @param workers: number of threads to parse the torrents with
+        (default: number of CPUs). With 1, they're parsed in this thread
+        @type workers: int
+
+        @param batch_size: max number of torrents per request
+        @type batch_size: int
+
+        @param max_batch_bytes: max size of the torrent data per request,
+        rTorrent rejects requests above network.xmlrpc.size_limit (2 MiB by
+        default, base64 adds a third on top of this)
+        @type max_batch_bytes: int
+
+        @return: an (info hash, outcome) tuple per torrent, in the order of
+        C{B{torrents}}. The outcome is the result of the load call, a
+        xmlrpclib.Fault instance if rTorrent rejected the torrent, the
+        exception raised by L{TorrentParser} if it couldn't be parsed (the
+        info hash is None then), or a L{DuplicateTorrentError} if a previous
+        torrent has the same info hash (it isn't loaded again)
+        @rtype: list
+
+        @note: Like L{load_torrent_simple}, there's no verification that the
+        torrents were actually added, use L{get_torrents} afterwards if needed
+        """
+        assert batch_size > 0, "batch_size must be at least 1"
+
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+
+        func_name = self._get_load_function("raw", start, verbose)
+        # only sent with Multicall._send(), so the varname isn't used
+        load_method = Method(rtorrent.rpc.DummyClass, func_name, func_name,
+                             varname=func_name)
+        outcomes = [None] * len(torrents)
+
+        def send(batch):
+            m = rtorrent.rpc.Multicall(self)
+            for i, info_hash, raw_torrent in batch:
+                m.add(load_method, xmlrpclib.Binary(raw_torrent))
+
+            for (i, info_hash, raw_torrent), r in zip(batch, m._send()):
+                outcomes[i] = (info_hash, r)
+                if self._cache is not None:
+                    self._cache.evict(info_hash, self.uri)
+
+        # threads rather than processes: reading the files and hashing
+        # release the GIL, and forking a process that has threads (pollers,
+        # pooled sockets...) can deadlock the children
+        pool = None
+        if workers > 1 and len(torrents) > 1:
+            pool = multiprocessing.pool.ThreadPool(min(workers,
+                                                       len(torrents)))
+            parsed = pool.imap(_parse_torrent_for_load, torrents,
+                               max(1, len(torrents) // (workers * 4)))
+        else:
+            parsed = map(_parse_torrent_for_load, torrents)
+
+        try:
+            queued = {}  # : info hash -> position of the first torrent
+            batch = []
+            batch_bytes = 0
+            for i, (info_hash, raw_torrent, error) in enumerate(parsed):
+                if error is not None:
+                    outcomes[i] = (None, error)
+                    continue
+
+                if info_hash in queued:
+                    outcomes[i] = (info_hash, DuplicateTorrentError(
+                        info_hash, queued[info_hash]))
+                    continue
+                queued[info_hash] = i
+
+                if batch and batch_bytes + len(raw_torrent) > max_batch_bytes:
+                    send(batch)
+                    batch = []
+                    batch_bytes = 0
+
+                batch.append((i, info_hash, raw_torrent))
+                batch_bytes += len(raw_torrent)
+                if len(batch) >= batch_size:
+                    send(batch)
+                    batch = []
+                    batch_bytes = 0
+
+            if batch:
+                send(batch)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        return(outcomes)
+
+    def bulk(self, torrents, chunk_size=500):
+        """Run commands on many torrents at once
+
+        ex. C{rt.bulk(info_hashes).stop()}, see L{BulkAction}
+
+        @param torrents: info hashes and/or L{Torrent} instances
+        @type torrents: list
+
+        @param chunk_size: max number of calls per request
+        @type chunk_size: int
+
+        @rtype: L{BulkAction}
+        """
+        return(BulkAction(self, torrents, chunk_size))
+
     def get_views(self):
-        p = self._get_conn()
-        return p.view_list()
+        return(self.get_view_list())
 
     def create_group(self, name, persistent=True, view=None):
         p = self._get_conn()
@@ -354,7 +1002,8 @@ class RTorrent:
 
     def find_torrent(self, info_hash):
         """Frontend for rtorrent.common.find_torrent"""
-        return(rtorrent.common.find_torrent(info_hash, self.get_torrents()))
+        self.get_torrents()
+        return(rtorrent.common.find_torrent(info_hash, self._torrent_index))
 
     def poll(self):
         """ poll rTorrent to get latest torrent/peer/tracker/file information
@@ -366,9 +1015,75 @@ class RTorrent:
         @return: None
         """
         self.update()
-        torrents = self.get_torrents()
-        for t in torrents:
-            t.poll()
+        self.poll_torrents(self.get_torrents())
+
+    def poll_torrents(self, torrents=None, batch_size=100):
+        """Get the latest peer/tracker/file information of many torrents
+
+        Instead of three requests per torrent (see L{Torrent.poll}), the
+        p.multicall, t.multicall and f.multicall calls of C{B{batch_size}}
+        torrents are sent together in a single system.multicall request.
+
+        @param torrents: L{Torrent} instances (default: self.torrents)
+        @type torrents: list
+
+        @param batch_size: number of torrents per request
+        @type batch_size: int
+
+        @return: the torrents that couldn't be polled (for example,
+        because they were removed from rTorrent in the meantime)
+        @rtype: list
+        """
+        if torrents is None:
+            torrents = self.torrents
+
+        assert batch_size > 0, "batch_size must be at least 1"
+
+        peer_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.peer.methods, self)
+        tracker_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.tracker.methods, self)
+        file_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.file.methods, self, required=("offset",))
+
+        failed = []
+        for i in range(0, len(torrents), batch_size):
+            batch = torrents[i:i + batch_size]
+
+            m = rtorrent.rpc.Multicall(self)
+            calls = []  # : (torrent, retriever methods, build function)
+            for t in batch:
+                torrent_calls = [
+                    ("p.multicall", peer_methods, Torrent._build_peers),
+                    ("t.multicall", tracker_methods, Torrent._build_trackers),
+                ]
+                # the File instances of self.files are updated, without
+                # retrieving their immutable fields again
+                update_methods = t._get_file_update_methods(file_methods)
+                if update_methods is None:
+                    torrent_calls.append(("f.multicall", file_methods,
+                                          Torrent._build_files))
+                elif update_methods:
+                    torrent_calls.append(("f.multicall", update_methods,
+                                          _update_files))
+
+                for rpc_call, retriever_methods, build in torrent_calls:
+                    m.add(rpc_call, t.info_hash, "",
+                          *[method.rpc_call + "=" for method in retriever_methods])
+                    calls.append((t, retriever_methods, build))
+
+            results = m._send()
+
+            faulted = set([id(t) for (t, retriever_methods, build), r in
+                           zip(calls, results)
+                           if isinstance(r, xmlrpclib.Fault)])
+            failed.extend([t for t in batch if id(t) in faulted])
+
+            for (t, retriever_methods, build), r in zip(calls, results):
+                if id(t) not in faulted:
+                    build(t, retriever_methods, r)
+
+        return(failed)
 
     def update(self):
         """Refresh rTorrent client info
@@ -386,6 +1101,28 @@ class RTorrent:
         multicall.call()
 
 
+def _update_files(torrent, update_methods, results):
+    """Update torrent.files with the results of f.multicall, see
+    L{RTorrent.poll_torrents}"""
+    if not torrent._update_files(update_methods, results):
+        torrent.get_files()  # the file list changed, build it again
+
+
+def _parse_torrent_for_load(torrent):
+    """Parse a torrent for L{RTorrent.load_torrents}
+
+    @return: (info hash, raw torrent data, None), or (None, None, exception)
+    if C{B{torrent}} couldn't be parsed
+    @rtype: tuple
+    """
+    try:
+        tp = TorrentParser(torrent)
+    except (AssertionError, BencodeDecodeError, IOError, TypeError) as e:
+        return(None, None, e)
+
+    return(tp.info_hash, tp._raw_torrent, None)
+
+
 def _build_class_methods(class_obj):
     # multicall add class
     caller = lambda self, multicall, method, *args:\
@@ -432,73 +1169,185 @@ def __check_supported_methods(rt):
 
 methods = [
     # RETRIEVERS
-    Method(RTorrent, 'get_xmlrpc_size_limit', 'get_xmlrpc_size_limit'),
-    Method(RTorrent, 'get_proxy_address', 'get_proxy_address'),
-    Method(RTorrent, 'get_split_suffix', 'get_split_suffix'),
-    Method(RTorrent, 'get_up_limit', 'get_upload_rate'),
-    Method(RTorrent, 'get_max_memory_usage', 'get_max_memory_usage'),
-    Method(RTorrent, 'get_max_open_files', 'get_max_open_files'),
-    Method(RTorrent, 'get_min_peers_seed', 'get_min_peers_seed'),
-    Method(RTorrent, 'get_use_udp_trackers', 'get_use_udp_trackers'),
-    Method(RTorrent, 'get_preload_min_size', 'get_preload_min_size'),
-    Method(RTorrent, 'get_max_uploads', 'get_max_uploads'),
-    Method(RTorrent, 'get_max_peers', 'get_max_peers'),
-    Method(RTorrent, 'get_timeout_sync', 'get_timeout_sync'),
-    Method(RTorrent, 'get_receive_buffer_size', 'get_receive_buffer_size'),
-    Method(RTorrent, 'get_split_file_size', 'get_split_file_size'),
-    Method(RTorrent, 'get_dht_throttle', 'get_dht_throttle'),
-    Method(RTorrent, 'get_max_peers_seed', 'get_max_peers_seed'),
-    Method(RTorrent, 'get_min_peers', 'get_min_peers'),
-    Method(RTorrent, 'get_tracker_numwant', 'get_tracker_numwant'),
-    Method(RTorrent, 'get_max_open_sockets', 'get_max_open_sockets'),
-    Method(RTorrent, 'get_session', 'get_session'),
-    Method(RTorrent, 'get_ip', 'get_ip'),
-    Method(RTorrent, 'get_scgi_dont_route', 'get_scgi_dont_route'),
-    Method(RTorrent, 'get_hash_read_ahead', 'get_hash_read_ahead'),
-    Method(RTorrent, 'get_http_cacert', 'get_http_cacert'),
-    Method(RTorrent, 'get_dht_port', 'get_dht_port'),
-    Method(RTorrent, 'get_handshake_log', 'get_handshake_log'),
-    Method(RTorrent, 'get_preload_type', 'get_preload_type'),
-    Method(RTorrent, 'get_max_open_http', 'get_max_open_http'),
-    Method(RTorrent, 'get_http_capath', 'get_http_capath'),
-    Method(RTorrent, 'get_max_downloads_global', 'get_max_downloads_global'),
-    Method(RTorrent, 'get_name', 'get_name'),
-    Method(RTorrent, 'get_session_on_completion', 'get_session_on_completion'),
-    Method(RTorrent, 'get_down_limit', 'get_download_rate'),
+    Method(RTorrent, 'get_xmlrpc_size_limit', 'get_xmlrpc_size_limit',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_proxy_address', 'get_proxy_address',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_split_suffix', 'get_split_suffix',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_up_limit', 'get_upload_rate',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_memory_usage', 'get_max_memory_usage',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_open_files', 'get_max_open_files',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_min_peers_seed', 'get_min_peers_seed',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_use_udp_trackers', 'get_use_udp_trackers',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_preload_min_size', 'get_preload_min_size',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_uploads', 'get_max_uploads',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_peers', 'get_max_peers',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_timeout_sync', 'get_timeout_sync',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_receive_buffer_size', 'get_receive_buffer_size',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_split_file_size', 'get_split_file_size',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_dht_throttle', 'get_dht_throttle',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_peers_seed', 'get_max_peers_seed',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_min_peers', 'get_min_peers',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_tracker_numwant', 'get_tracker_numwant',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_open_sockets', 'get_max_open_sockets',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_session', 'get_session',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_ip', 'get_ip',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_scgi_dont_route', 'get_scgi_dont_route',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_hash_read_ahead', 'get_hash_read_ahead',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_http_cacert', 'get_http_cacert',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_dht_port', 'get_dht_port',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_handshake_log', 'get_handshake_log',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_preload_type', 'get_preload_type',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_open_http', 'get_max_open_http',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_http_capath', 'get_http_capath',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_downloads_global', 'get_max_downloads_global',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_name', 'get_name',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_session_on_completion', 'get_session_on_completion',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_down_limit', 'get_download_rate',
+           volatility=SLOW,
+           ),
     Method(RTorrent, 'get_down_total', 'get_down_total'),
     Method(RTorrent, 'get_up_rate', 'get_up_rate'),
-    Method(RTorrent, 'get_hash_max_tries', 'get_hash_max_tries'),
-    Method(RTorrent, 'get_peer_exchange', 'get_peer_exchange'),
+    Method(RTorrent, 'get_hash_max_tries', 'get_hash_max_tries',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_peer_exchange', 'get_peer_exchange',
+           volatility=SLOW,
+           ),
     Method(RTorrent, 'get_down_rate', 'get_down_rate'),
-    Method(RTorrent, 'get_connection_seed', 'get_connection_seed'),
-    Method(RTorrent, 'get_http_proxy', 'get_http_proxy'),
+    Method(RTorrent, 'get_connection_seed', 'get_connection_seed',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_http_proxy', 'get_http_proxy',
+           volatility=SLOW,
+           ),
     Method(RTorrent, 'get_stats_preloaded', 'get_stats_preloaded'),
-    Method(RTorrent, 'get_timeout_safe_sync', 'get_timeout_safe_sync'),
-    Method(RTorrent, 'get_hash_interval', 'get_hash_interval'),
-    Method(RTorrent, 'get_port_random', 'get_port_random'),
-    Method(RTorrent, 'get_directory', 'get_directory'),
-    Method(RTorrent, 'get_port_open', 'get_port_open'),
-    Method(RTorrent, 'get_max_file_size', 'get_max_file_size'),
+    Method(RTorrent, 'get_timeout_safe_sync', 'get_timeout_safe_sync',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_hash_interval', 'get_hash_interval',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_port_random', 'get_port_random',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_directory', 'get_directory',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_port_open', 'get_port_open',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_file_size', 'get_max_file_size',
+           volatility=SLOW,
+           ),
     Method(RTorrent, 'get_stats_not_preloaded', 'get_stats_not_preloaded'),
     Method(RTorrent, 'get_memory_usage', 'get_memory_usage'),
-    Method(RTorrent, 'get_connection_leech', 'get_connection_leech'),
+    Method(RTorrent, 'get_connection_leech', 'get_connection_leech',
+           volatility=SLOW,
+           ),
     Method(RTorrent, 'get_check_hash', 'get_check_hash',
            boolean=True,
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_session_lock', 'get_session_lock',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_preload_required_rate', 'get_preload_required_rate',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_uploads_global', 'get_max_uploads_global',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_send_buffer_size', 'get_send_buffer_size',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_port_range', 'get_port_range',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_downloads_div', 'get_max_downloads_div',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_max_uploads_div', 'get_max_uploads_div',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_safe_sync', 'get_safe_sync',
+           volatility=SLOW,
+           ),
+    Method(RTorrent, 'get_bind', 'get_bind',
+           volatility=SLOW,
            ),
-    Method(RTorrent, 'get_session_lock', 'get_session_lock'),
-    Method(RTorrent, 'get_preload_required_rate', 'get_preload_required_rate'),
-    Method(RTorrent, 'get_max_uploads_global', 'get_max_uploads_global'),
-    Method(RTorrent, 'get_send_buffer_size', 'get_send_buffer_size'),
-    Method(RTorrent, 'get_port_range', 'get_port_range'),
-    Method(RTorrent, 'get_max_downloads_div', 'get_max_downloads_div'),
-    Method(RTorrent, 'get_max_uploads_div', 'get_max_uploads_div'),
-    Method(RTorrent, 'get_safe_sync', 'get_safe_sync'),
-    Method(RTorrent, 'get_bind', 'get_bind'),
     Method(RTorrent, 'get_up_total', 'get_up_total'),
-    Method(RTorrent, 'get_client_version', 'system.client_version'),
-    Method(RTorrent, 'get_library_version', 'system.library_version'),
+    Method(RTorrent, 'get_client_version', 'system.client_version',
+           volatility=IMMUTABLE,
+           ),
+    Method(RTorrent, 'get_library_version', 'system.library_version',
+           volatility=IMMUTABLE,
+           ),
     Method(RTorrent, 'get_api_version', 'system.api_version',
-           min_version=(0, 9, 1)
+           min_version=(0, 9, 1),
+           volatility=IMMUTABLE,
            ),
     Method(RTorrent, "get_system_time", "system.time",
            docstring="""Get the current time of the system rTorrent is running on
@@ -506,6 +1355,10 @@ methods = [
            @return: time (posix)
            @rtype: int""",
            ),
+    Method(RTorrent, 'get_view_list', 'view_list',
+           varname='view_list',
+           volatility=SLOW,
+           ),
 
     # MODIFIERS
     Method(RTorrent, 'set_http_proxy', 'set_http_proxy'),
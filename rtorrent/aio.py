@@ -0,0 +1,511 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# asyncio client, requires Python 3.5 or later
+#
+# Usage: rt = AsyncRTorrent("scgi://localhost:5000")
+#        await rt.connect()
+#        torrents = await rt.get_torrents()
+#        await torrents[0].poll()
+
+import asyncio
+import urllib.parse as urlparser
+
+import rtorrent
+import rtorrent.rpc
+from rtorrent.common import bool_to_int, find_torrent
+from rtorrent.compat import xmlrpclib
+from rtorrent.lib.xmlrpc.aio import AsyncSCGITransport, AsyncHTTPTransport
+from rtorrent.file import File
+from rtorrent.peer import Peer
+from rtorrent.torrent import Torrent
+from rtorrent.tracker import Tracker
+
+
+class Multicall(rtorrent.rpc.Multicall):
+    """asyncio counterpart of L{rtorrent.rpc.Multicall}"""
+
+    async def call(self):
+        """Execute added multicall calls
+
+        @return: the results (post-processed), in the order they were added
+        @rtype: tuple
+
+        @raise xmlrpclib.Fault: if any of the calls failed
+        """
+        results = await self._send()
+        rtorrent.rpc._raise_faults(results)
+
+        return(self._process_results(results))
+
+    async def _send(self):
+        pending, results = self._get_cached()
+        if not pending:
+            return(tuple(results))
+
+        calls = [{"methodName": self.calls[i][0].rpc_call,
+                  "params": self.calls[i][1]} for i in pending]
+
+        sent_results = await self.rt_obj._request("system.multicall", calls)
+        self._set_results(pending, results,
+                          rtorrent.rpc._unpack_multicall_results(sent_results))
+
+        return(tuple(results))
+
+
+async def call_method(class_obj, method, *args):
+    """asyncio counterpart of L{rtorrent.rpc.call_method}"""
+    if method.is_retriever():
+        args = args[:-1]
+    else:
+        assert args[-1] is not None, "No argument given."
+
+    m = Multicall(class_obj)
+    m.add(method, *args)
+
+    return((await m.call())[0])
+
+
+async def _update(class_obj, method_list, *args):
+    m = Multicall(class_obj)
+    for method in rtorrent.rpc.get_retriever_methods(method_list, m.rt_obj):
+        m.add(method, *args)
+
+    await m.call()
+
+
+class AsyncRTorrent:
+    """Create a new rTorrent connection using asyncio
+
+    @note: L{connect} must be awaited before anything else, it fetches the
+    list of RPC methods and the client version that are used to check if
+    methods are available.
+    """
+
+    def __init__(self, uri, username=None, password=None, use_datetime=False,
+                 cache=None):
+        self.uri = uri
+        self.username = username
+        self.password = password
+
+        parts = urlparser.urlsplit(uri)
+        self.schema = parts.scheme
+        self._handler = parts.path
+        self._host = parts.netloc.rpartition("@")[2]  # : without user:pass
+        if parts.username and self.username is None:
+            self.username, self.password = parts.username, parts.password
+
+        if self.schema == "scgi":
+            if self.username is not None and self.password is not None:
+                raise NotImplementedError()
+            self._transport = AsyncSCGITransport(use_datetime=use_datetime)
+            if not self._handler:
+                self._handler = "/"
+        elif self.schema in ["http", "https"]:
+            self._transport = AsyncHTTPTransport(
+                use_datetime=use_datetime, username=self.username,
+                password=self.password, use_ssl=self.schema == "https")
+            if not self._handler:
+                self._handler = "/RPC2"
+        else:
+            raise NotImplementedError()
+
+        self.torrents = []  # : List of L{AsyncTorrent} instances
+        self._torrent_index = {}  # : info hash -> L{AsyncTorrent}
+        self._rpc_methods = []  # : List of rTorrent RPC methods
+        self._capabilities = None
+        self._client_version_tuple = ()
+        self._cache = cache  # : L{rtorrent.rpc.CallCache}, or None
+        self.dirty_fields = set()  # : fields a modifier might not have set
+
+    async def _request(self, methodname, *params):
+        request = xmlrpclib.dumps(params, methodname)
+        response = await self._transport.request(self._host, self._handler,
+                                                 request)
+
+        if len(response) == 1:
+            response = response[0]
+
+        return response
+
+    async def connect(self, verify=False):
+        """Fetch the connection info needed before making any other calls
+
+        @param verify: check for the minimum rTorrent version
+        @type verify: bool
+        """
+        self.client_version = await self._request("system.client_version")
+        self._client_version_tuple = tuple(
+            [int(i) for i in self.client_version.split(".")])
+        await self._update_rpc_methods()
+
+        if verify is True:
+            assert self._client_version_tuple >= \
+                rtorrent.MIN_RTORRENT_VERSION, \
+                "Error: Minimum rTorrent version required is {0}".format(
+                    rtorrent.MIN_RTORRENT_VERSION_STR)
+
+    def _get_client_version_tuple(self):
+        assert self._client_version_tuple, "connect() hasn't been called"
+        return self._client_version_tuple
+
+    async def _update_rpc_methods(self):
+        self._rpc_methods = await self._request("system.listMethods")
+        self._capabilities = None
+
+        return self._rpc_methods
+
+    def _get_capabilities(self):
+        if self._capabilities is None:
+            self._capabilities = rtorrent.rpc.CapabilityIndex(
+                self._get_rpc_methods(), self._get_client_version_tuple())
+
+        return self._capabilities
+
+    def _get_rpc_methods(self):
+        assert self._rpc_methods, "connect() hasn't been called"
+        return self._rpc_methods
+
+    async def get_torrents(self, view="main", fields=None):
+        """Get list of all torrents in specified view
+
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field)
+        @type fields: list
+
+        @return: list of L{AsyncTorrent} instances
+        @rtype: list
+        """
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.torrent.methods, self, fields)
+
+        m = Multicall(self)
+        m.add("d.multicall", view, "d.get_hash=",
+              *[method.rpc_call + "=" for method in retriever_methods])
+
+        results = (await m.call())[0]
+
+        torrents = []
+        for result in results:
+            results_dict = {}
+            for method, r in zip(retriever_methods, result[1:]):
+                results_dict[method.varname] = \
+                    rtorrent.rpc.process_result(method, r)
+
+            torrents.append(
+                AsyncTorrent(self, info_hash=result[0], **results_dict))
+
+        self.torrents = torrents
+        self._torrent_index = dict([(t.info_hash, t) for t in torrents])
+        return(self.torrents)
+
+    def find_torrent(self, info_hash):
+        """Find torrent in the list from the last get_torrents() call"""
+        return(find_torrent(info_hash, self._torrent_index))
+
+    async def get_views(self):
+        return await self._request("view_list")
+
+    async def poll(self):
+        """poll rTorrent to get latest torrent/peer/tracker/file information
+
+        The torrents are polled concurrently.
+        """
+        await self.update()
+        torrents = await self.get_torrents()
+        await asyncio.gather(*[t.poll() for t in torrents])
+
+    async def update(self):
+        """Refresh rTorrent client info
+
+        @note: All fields are stored as attributes to self.
+        """
+        await _update(self, rtorrent.methods)
+
+
+class AsyncPeer(Peer):
+    __slots__ = ()
+
+    async def update(self):
+        """Refresh peer data"""
+        await _update(self, rtorrent.peer.methods, self.rpc_id)
+
+
+class AsyncTracker(Tracker):
+    __slots__ = ()
+
+    async def enable(self):
+        """Alias for set_enabled(True)"""
+        await self.set_enabled(True)
+
+    async def disable(self):
+        """Alias for set_enabled(False)"""
+        await self.set_enabled(False)
+
+    async def update(self):
+        """Refresh tracker data"""
+        await _update(self, rtorrent.tracker.methods, self.rpc_id)
+
+    async def append_tracker(self, tracker):
+        """Append tracker to current tracker group"""
+        m = Multicall(self)
+        self.multicall_add(m, "d.tracker.insert", self.index, tracker)
+
+        return((await m.call())[-1])
+
+
+class AsyncFile(File):
+    __slots__ = ()
+
+    async def update(self):
+        """Refresh file data"""
+        await _update(self, rtorrent.file.methods, self.rpc_id)
+
+
+class AsyncTorrent(Torrent):
+    """asyncio counterpart of L{Torrent}"""
+
+    __slots__ = ()
+
+    _peer_class = AsyncPeer
+    _tracker_class = AsyncTracker
+    _file_class = AsyncFile
+
+    async def _multicall(self, multicall_name, method_list, fields,
+                         required):
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            method_list, self._rt_obj, fields, required)
+        m = Multicall(self)
+        m.add(multicall_name, self.info_hash, "",
+              *[method.rpc_call + "=" for method in retriever_methods])
+
+        return(retriever_methods, (await m.call())[0])
+
+    async def get_peers(self, fields=None):
+        """Get list of AsyncPeer instances for given torrent."""
+        return(self._build_peers(*await self._multicall(
+            "p.multicall", rtorrent.peer.methods, fields, ("id",))))
+
+    async def get_trackers(self, fields=None):
+        """Get list of AsyncTracker instances for given torrent."""
+        return(self._build_trackers(*await self._multicall(
+            "t.multicall", rtorrent.tracker.methods, fields, ("group",))))
+
+    async def get_files(self, fields=None):
+        """Get list of AsyncFile instances for given torrent."""
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.file.methods, self._rt_obj, fields, required=("offset",))
+
+        update_methods = self._get_file_update_methods(retriever_methods)
+        if update_methods is not None:
+            if not update_methods:
+                return(self.files)
+
+            results = await self._get_file_results(update_methods)
+            if self._update_files(update_methods, results):
+                return(self.files)
+
+        results = await self._get_file_results(retriever_methods)
+
+        return(self._build_files(retriever_methods, results))
+
+    async def _get_file_results(self, retriever_methods):
+        m = Multicall(self)
+        m.add("f.multicall", self.info_hash, "",
+              *[method.rpc_call + "=" for method in retriever_methods])
+
+        return((await m.call())[0])
+
+    async def get_chunk_bitfield(self):
+        """Get the chunks the torrent has as a L{rtorrent.bitfield.Bitfield}
+        """
+        self.bitfield, self.size_chunks, self.complete = await self._call(
+            ("d.get_bitfield",), ("d.get_size_chunks",), ("d.get_complete",))
+
+        return(self._build_bitfield())
+
+    async def get_file_completion(self):
+        """Get the completed chunks of every file from the torrent's bitfield
+        """
+        bitfield = await self.get_chunk_bitfield()
+        files = await self.get_files(fields=["range_first", "range_second"])
+
+        return(self._get_file_completion(bitfield, files))
+
+    async def poll(self):
+        """poll rTorrent to get latest peer/tracker/file information"""
+        await asyncio.gather(self.get_peers(), self.get_trackers(),
+                             self.get_files())
+
+    async def update(self):
+        """Refresh torrent data"""
+        await _update(self, rtorrent.torrent.methods, self.rpc_id)
+        self._call_custom_methods()
+
+    async def _call(self, *calls):
+        m = Multicall(self)
+        for call in calls:
+            self.multicall_add(m, *call)
+
+        return(await m.call())
+
+    async def start(self):
+        """Start the torrent"""
+        self.active = (await self._call(("d.try_start",), ("d.is_active",)))[-1]
+        return(self.active)
+
+    async def stop(self):
+        """"Stop the torrent"""
+        self.active = (await self._call(("d.try_stop",), ("d.is_active",)))[-1]
+        return(self.active)
+
+    async def pause(self):
+        """Pause the torrent"""
+        return((await self._call(("d.pause",)))[-1])
+
+    async def resume(self):
+        """Resume the torrent"""
+        return((await self._call(("d.resume",)))[-1])
+
+    async def close(self):
+        """Close the torrent and it's files"""
+        return((await self._call(("d.close",)))[-1])
+
+    async def erase(self):
+        """Delete the torrent
+
+        @note: doesn't delete the downloaded files"""
+        return((await self._call(("d.erase",)))[-1])
+
+    async def check_hash(self):
+        """(Re)hash check the torrent"""
+        return((await self._call(("d.check_hash",)))[-1])
+
+    async def announce(self):
+        """Announce torrent info to tracker(s)"""
+        return((await self._call(("d.tracker_announce",)))[-1])
+
+    async def set_directory(self, d):
+        """Modify download directory
+
+        @note: Needs to stop torrent in order to change the directory.
+        Also doesn't restart after directory is set, that must be called
+        separately.
+        """
+        await self._call(("d.try_stop",), ("d.set_directory", d))
+
+    async def set_directory_base(self, d):
+        """Modify base download directory
+
+        @note: Needs to stop torrent in order to change the directory.
+        Also doesn't restart after directory is set, that must be called
+        separately.
+        """
+        await self._call(("d.try_stop",), ("d.set_directory_base", d))
+
+    async def accept_seeders(self, accept_seeds):
+        """Enable/disable whether the torrent connects to seeders"""
+        if accept_seeds:
+            call = "d.accepting_seeders.enable"
+        else:
+            call = "d.accepting_seeders.disable"
+
+        return((await self._call((call,)))[-1])
+
+    async def set_visible(self, view, visible=True):
+        """Make the torrent visible/not visible in the given view"""
+        if visible:
+            call = "view.set_visible"
+        else:
+            call = "view.set_not_visible"
+
+        return((await self._call((call, view)))[-1])
+
+    async def add_tracker(self, group, tracker):
+        """Add tracker to torrent"""
+        return((await self._call(("d.tracker.insert", group, tracker)))[-1])
+
+    async def get_custom(self, key):
+        """Get custom value (key between 1-5)"""
+        self._assert_custom_key_valid(key)
+        field = "custom{0}".format(key)
+        setattr(self, field,
+                (await self._call(("d.get_{0}".format(field),)))[-1])
+
+        return(getattr(self, field))
+
+    async def set_custom(self, key, value):
+        """Set custom value (key between 1-5)"""
+        self._assert_custom_key_valid(key)
+        return((await self._call(("d.set_custom{0}".format(key), value)))[-1])
+
+    async def is_hash_checking_queued(self):
+        """Check if torrent is waiting to be hash checked"""
+        self.hashing, self.hash_checking = await self._call(
+            ("d.get_hashing",), ("d.is_hash_checking",))
+
+        return(self._is_hash_checking_queued())
+
+    async def is_paused(self):
+        """Check if torrent is paused"""
+        await self.get_state()
+        return(self._is_paused())
+
+    async def is_started(self):
+        """Check if torrent is started"""
+        await self.get_state()
+        return(self._is_started())
+
+
+def _build_async_rpc_methods(class_, base_class, method_list):
+    """Build coroutine versions of the methods generated by
+    L{rtorrent.rpc._build_rpc_methods}"""
+    for m in method_list:
+        if m.class_name != base_class.__name__:
+            continue
+
+        if base_class is rtorrent.RTorrent:
+            async def caller(self, arg=None, method=m):
+                return await call_method(self, method, bool_to_int(arg))
+        else:
+            async def caller(self, arg=None, method=m):
+                return await call_method(self, method, self.rpc_id,
+                                         bool_to_int(arg))
+
+        caller.__doc__ = getattr(base_class, m.method_name).__doc__
+
+        for method_name in [m.method_name] + list(m.aliases):
+            rtorrent.rpc._set_method(class_, method_name, caller)
+
+    # multicall_add() is shared with the blocking classes
+    if not hasattr(class_, "multicall_add"):
+        setattr(class_, "multicall_add",
+                getattr(base_class, "multicall_add"))
+
+
+async_class_pair = {
+    AsyncRTorrent: (rtorrent.RTorrent, rtorrent.methods),
+    AsyncTorrent: (Torrent, rtorrent.torrent.methods),
+    AsyncPeer: (Peer, rtorrent.peer.methods),
+    AsyncTracker: (Tracker, rtorrent.tracker.methods),
+    AsyncFile: (File, rtorrent.file.methods),
+}
+for c in async_class_pair.keys():
+    _build_async_rpc_methods(c, *async_class_pair[c])
@@ -0,0 +1,208 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import binascii
+import bisect
+
+from rtorrent.common import safe_repr
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# number of set bits of each byte value
+_POPCOUNT = bytearray([bin(i).count("1") for i in range(256)])
+
+
+def _popcount(data):
+    """Count the set bits of C{B{data}} (bytes)"""
+    return(sum(bytearray(data).translate(_POPCOUNT)))
+
+
+class Bitfield:
+    """Bit vector of the chunks (pieces) a torrent has
+
+    Bit 0 is the most significant bit of the first byte, like the bitfield
+    rTorrent returns (see L{Torrent.get_file_completion}).
+    """
+
+    def __init__(self, data, size=None):
+        """
+        @param data: the bits, 8 per byte
+        @type data: bytes
+
+        @param size: number of bits (default: 8 per byte of C{B{data}})
+        @type size: int
+        """
+        self._data = bytes(data)
+        self.size = len(self._data) * 8 if size is None else size
+        assert 0 <= self.size <= len(self._data) * 8, \
+            "size exceeds the data"
+
+    @classmethod
+    def from_hex(cls, hex_str, size=None):
+        """Create a bitfield from its hex representation (ex. the result of
+        d.get_bitfield)"""
+        if not isinstance(hex_str, bytes):
+            hex_str = hex_str.encode("ascii")
+        return(cls(binascii.unhexlify(hex_str), size))
+
+    def __len__(self):
+        return(self.size)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError("bit index out of range")
+
+        return(bool(bytearray(self._data[i // 8:i // 8 + 1])[0] &
+                    (0x80 >> (i % 8))))
+
+    def __repr__(self):
+        return safe_repr("Bitfield({0}/{1})", self.count(), self.size)
+
+    def _clip(self, start, end):
+        if end is None or end > self.size:
+            end = self.size
+        return(max(start, 0), end)
+
+    def count(self, start=0, end=None):
+        """Count the set bits in [C{B{start}}, C{B{end}})"""
+        start, end = self._clip(start, end)
+        if start >= end:
+            return(0)
+
+        first_byte, last_byte = start // 8, (end - 1) // 8
+        # bits of the first and last byte that are in the range
+        first_mask = 0xFF >> (start % 8)
+        last_mask = (0xFF << (7 - (end - 1) % 8)) & 0xFF
+
+        data = bytearray(self._data[first_byte:last_byte + 1])
+        if first_byte == last_byte:
+            return(_POPCOUNT[data[0] & first_mask & last_mask])
+
+        return(_POPCOUNT[data[0] & first_mask] + _popcount(data[1:-1]) +
+               _POPCOUNT[data[-1] & last_mask])
+
+    def count_ranges(self, ranges):
+        """Count the set bits of many [start, end) ranges at once
+
+        @param ranges: (start, end) tuples
+        @type ranges: list
+
+        @rtype: list
+        """
+        if numpy is None:
+            return([self.count(start, end) for start, end in ranges])
+
+        # sum over any range from the cumulative sum of the bits
+        totals = numpy.zeros(self.size + 1, dtype=numpy.int64)
+        numpy.cumsum(self.to_numpy(), out=totals[1:])
+
+        ranges = numpy.asarray(ranges, dtype=numpy.int64).reshape(-1, 2)
+        starts = numpy.clip(ranges[:, 0], 0, self.size)
+        ends = numpy.clip(ranges[:, 1], 0, self.size)
+        return(numpy.maximum(totals[ends] - totals[starts], 0).tolist())
+
+    def missing_runs(self, start=0, end=None):
+        """Get the runs of unset bits in [C{B{start}}, C{B{end}})
+
+        @return: (start, end) tuples, end not included
+        @rtype: list
+        """
+        start, end = self._clip(start, end)
+        if start >= end:
+            return([])
+
+        if numpy is not None:
+            missing = ~self.to_numpy()[start:end]
+            edges = numpy.diff(numpy.concatenate(([False], missing, [False]))
+                               .astype(numpy.int8))
+            return(list(zip((numpy.flatnonzero(edges == 1) + start).tolist(),
+                            (numpy.flatnonzero(edges == -1) + start)
+                            .tolist())))
+
+        runs = []
+        run_start = None
+        data = bytearray(self._data)
+        i = start
+        while i < end:
+            byte = data[i // 8]
+            if i % 8 == 0 and i + 8 <= end and byte in (0x00, 0xFF):
+                # whole byte at once
+                if byte == 0x00 and run_start is None:
+                    run_start = i
+                elif byte == 0xFF and run_start is not None:
+                    runs.append((run_start, i))
+                    run_start = None
+                i += 8
+                continue
+
+            if byte & (0x80 >> (i % 8)):
+                if run_start is not None:
+                    runs.append((run_start, i))
+                    run_start = None
+            elif run_start is None:
+                run_start = i
+            i += 1
+
+        if run_start is not None:
+            runs.append((run_start, end))
+
+        return(runs)
+
+    def to_numpy(self):
+        """Get the bits as a numpy bool array (requires numpy)"""
+        assert numpy is not None, "numpy isn't installed"
+        bits = numpy.unpackbits(numpy.frombuffer(self._data,
+                                                 dtype=numpy.uint8))
+        return(bits[:self.size].astype(bool))
+
+    def split(self, ranges):
+        """Get the set bit count and runs of unset bits of many ranges
+
+        The runs are found once for the whole bitfield, then divided between
+        the ranges.
+
+        @param ranges: (start, end) tuples
+        @type ranges: list
+
+        @return: (count, runs) per range, see L{count} and L{missing_runs}
+        @rtype: list
+        """
+        counts = self.count_ranges(ranges)
+        runs = self.missing_runs()
+        run_ends = [run_end for run_start, run_end in runs]
+
+        result = []
+        for (start, end), count in zip(ranges, counts):
+            range_runs = []
+            # first run that ends after start
+            i = bisect.bisect_right(run_ends, start)
+            while i < len(runs) and runs[i][0] < end and start < end:
+                run_start, run_end = runs[i]
+                range_runs.append((max(run_start, start), min(run_end, end)))
+                i += 1
+
+            result.append((count, range_runs))
+
+        return(result)
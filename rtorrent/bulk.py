@@ -0,0 +1,187 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import rtorrent.rpc
+import rtorrent.torrent
+
+from rtorrent.common import bool_to_int, safe_repr
+from rtorrent.compat import xmlrpclib
+
+
+class BulkResult:
+    """Outcome of a L{BulkAction} call"""
+
+    def __init__(self):
+        self.results = {}  # : info hash -> result, for the successful calls
+        self.errors = {}  # : info hash -> xmlrpclib.Fault, for the failed calls
+
+    def __repr__(self):
+        return safe_repr("BulkResult(results={0}, errors={1})",
+                         len(self.results), len(self.errors))
+
+    def ok(self):
+        """Check if every call succeeded
+
+        @rtype: bool
+        """
+        return(not self.errors)
+
+
+class BulkAction:
+    """Run the same command on many torrents, with a few requests
+
+    The per-torrent calls are sent in system.multicall requests of
+    C{B{chunk_size}} calls each, instead of one request per torrent.
+
+    Besides the methods below, any of the L{Torrent} modifiers can be
+    called, ex. C{rt.bulk(info_hashes).set_priority(0)}.
+    """
+
+    def __init__(self, _rt_obj, torrents, chunk_size=500):
+        """
+        @param torrents: info hashes and/or L{Torrent} instances
+        @type torrents: list
+
+        @param chunk_size: max number of calls per request
+        @type chunk_size: int
+        """
+        assert chunk_size > 0, "chunk_size must be at least 1"
+
+        self._rt_obj = _rt_obj
+        self.info_hashes = [getattr(t, "info_hash", t) for t in torrents]
+        self.chunk_size = chunk_size
+
+    def __repr__(self):
+        return safe_repr("BulkAction(torrents={0})", len(self.info_hashes))
+
+    def __getattr__(self, name):
+        if name.startswith("set_"):
+            for method in rtorrent.torrent.methods:
+                if method.is_modifier() and method.method_name == name:
+                    return(lambda value: self.call(method,
+                                                   bool_to_int(value)))
+
+        raise AttributeError(name)
+
+    def call(self, method, *args):
+        """Call C{B{method}} on every torrent
+
+        @param method: L{Method} instance or name of raw RPC method, the info
+        hash is passed as the first argument
+        @type method: Method or str
+
+        @param args: additional call arguments
+
+        @rtype: L{BulkResult}
+        """
+        method = rtorrent.rpc._get_method(method)
+        if method.is_modifier():
+            assert args and args[-1] is not None, "No argument given."
+
+        return(self._call([], method, args))
+
+    def _call(self, before, method, args):
+        """See L{call}
+
+        @param before: (method, args) tuples, calls to make on each torrent
+        before C{B{method}}, in the same request. A torrent's result is the
+        first of its calls that failed, if any
+        @type before: list
+        """
+        calls = [(rtorrent.rpc._get_method(m), a) for m, a in before] + \
+            [(method, args)]
+        per_chunk = max(1, self.chunk_size // len(calls))
+
+        bulk_result = BulkResult()
+        for i in range(0, len(self.info_hashes), per_chunk):
+            chunk = self.info_hashes[i:i + per_chunk]
+
+            m = rtorrent.rpc.Multicall(self._rt_obj)
+            for info_hash in chunk:
+                for call_method, call_args in calls:
+                    m.add(call_method, info_hash, *call_args)
+
+            results = m._send()
+            n = len(calls)
+            for j, info_hash in enumerate(chunk):
+                torrent_results = results[j * n:(j + 1) * n]
+                errors = [r for r in torrent_results
+                          if isinstance(r, xmlrpclib.Fault)]
+                if errors:
+                    bulk_result.errors[info_hash] = errors[0]
+                else:
+                    bulk_result.results[info_hash] = \
+                        rtorrent.rpc.process_result(method,
+                                                    torrent_results[-1])
+
+        return(bulk_result)
+
+    def start(self):
+        """Start the torrents"""
+        return(self.call("d.try_start"))
+
+    def stop(self):
+        """Stop the torrents"""
+        return(self.call("d.try_stop"))
+
+    def pause(self):
+        """Pause the torrents"""
+        return(self.call("d.pause"))
+
+    def resume(self):
+        """Resume the torrents"""
+        return(self.call("d.resume"))
+
+    def close(self):
+        """Close the torrents and their files"""
+        return(self.call("d.close"))
+
+    def erase(self):
+        """Delete the torrents
+
+        @note: doesn't delete the downloaded files"""
+        return(self.call("d.erase"))
+
+    def set_directory(self, d):
+        """Modify the download directory of the torrents
+
+        @note: Needs to stop the torrents in order to change the directory.
+        Also doesn't restart them after the directory is set, that must be
+        called separately.
+        """
+        return(self._call([("d.try_stop", ())],
+                          rtorrent.rpc._get_method("d.set_directory"), (d,)))
+
+    def set_directory_base(self, d):
+        """Modify the base download directory of the torrents
+
+        @note: see L{set_directory}
+        """
+        return(self._call([("d.try_stop", ())],
+                          rtorrent.rpc._get_method("d.set_directory_base"),
+                          (d,)))
+
+    def check_hash(self):
+        """(Re)hash check the torrents"""
+        return(self.call("d.check_hash"))
+
+    def announce(self):
+        """Announce the torrents to their tracker(s)"""
+        return(self.call("d.tracker_announce"))
@@ -18,6 +18,7 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
+import threading
 
 from rtorrent.compat import is_py3
 
@@ -53,11 +54,15 @@ def find_torrent(info_hash, torrent_list):
     @param info_hash: info hash of torrent
     @type info_hash: str
 
-    @param torrent_list: list of L{Torrent} instances (see L{RTorrent.get_torrents})
-    @type torrent_list: list
+    @param torrent_list: list of L{Torrent} instances (see L{RTorrent.get_torrents}),
+    or a dict of info hashes to L{Torrent} instances (see L{RTorrent._torrent_index})
+    @type torrent_list: list or dict
 
-    @return: L{Torrent} instance, or -1 if not found
+    @return: L{Torrent} instance, or None if not found
     """
+    if isinstance(torrent_list, dict):
+        return torrent_list.get(info_hash)
+
     for t in torrent_list:
         if t.info_hash == info_hash:
             return t
@@ -84,3 +89,50 @@ def safe_repr(fmt, *args, **kwargs):
         return out.encode("utf-8")
     else:
         return fmt.format(*args, **kwargs)
+
+
+class SingleFlight:
+    """Runs a function once for all the threads that call it concurrently
+    with the same key, the other threads wait and get the same result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # : key -> _Call in flight
+
+    def do(self, key, func, *args, **kwargs):
+        """Call C{func(*args, **kwargs)}, or wait for the call in flight for
+        C{B{key}} to finish
+
+        @return: the result of the call
+        @raise: whatever the call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return(call.result)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
@@ -38,3 +38,14 @@ class MethodError(Exception):
 
     def __str__(self):
         return(self.msg)
+
+
+class DuplicateTorrentError(Exception):
+    def __init__(self, info_hash, index):
+        self.info_hash = info_hash
+        self.index = index  # : position of the first torrent with this info hash
+        self.msg = "Same info hash as torrent #{0}: {1}".format(index,
+                                                                 info_hash)
+
+    def __str__(self):
+        return(self.msg)
@@ -0,0 +1,197 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from rtorrent.common import safe_repr
+from rtorrent.table import numpy
+
+# event types
+ADDED = "added"
+REMOVED = "removed"
+COMPLETED = "completed"
+STATE_CHANGED = "state_changed"
+MESSAGE_CHANGED = "message_changed"
+THRESHOLD_CROSSED = "threshold_crossed"
+
+STATE_FIELDS = ("state", "active")  # : changes reported as STATE_CHANGED
+EVENT_FIELDS = ("complete", "message") + STATE_FIELDS  # : fields diff() needs
+
+
+class TorrentEvent:
+    """A change of a torrent between two snapshots"""
+
+    def __init__(self, event_type, info_hash, field=None, old_value=None,
+                 new_value=None, threshold=None, view=None):
+        self.event_type = event_type  # : one of the event types above
+        self.info_hash = info_hash
+        self.view = view  # : view the snapshots were taken of
+        self.field = field  # : changed field, None for ADDED/REMOVED
+        self.old_value = old_value
+        self.new_value = new_value
+        self.threshold = threshold  # : crossed value, for THRESHOLD_CROSSED
+
+    def __repr__(self):
+        view = ""
+        if self.view is not None:
+            view = safe_repr(", view=\"{0}\"", self.view)
+
+        if self.field is None:
+            return safe_repr("TorrentEvent({0}, info_hash=\"{1}\"{2})",
+                             self.event_type, self.info_hash, view)
+
+        if self.threshold is not None:
+            return safe_repr("TorrentEvent({0}, info_hash=\"{1}\", {2}: {3!r} "
+                             "-> {4!r}, threshold={5!r}{6})", self.event_type,
+                             self.info_hash, self.field, self.old_value,
+                             self.new_value, self.threshold, view)
+
+        return safe_repr("TorrentEvent({0}, info_hash=\"{1}\", {2}: {3!r} -> "
+                         "{4!r}{5})", self.event_type, self.info_hash,
+                         self.field, self.old_value, self.new_value, view)
+
+    def __eq__(self, other):
+        return(isinstance(other, TorrentEvent) and
+               self.__dict__ == other.__dict__)
+
+    def __ne__(self, other):
+        return(not self == other)
+
+
+def _is_array(column):
+    return(numpy is not None and isinstance(column, numpy.ndarray))
+
+
+def _get_value(column, i):
+    value = column[i]
+    if _is_array(column) and column.dtype != object:
+        value = value.item()  # numpy scalar to Python value
+    return(value)
+
+
+def _changed_rows(old_column, old_rows, new_column, new_rows):
+    """Get the positions in C{B{old_rows}}/C{B{new_rows}} where the values
+    of the columns differ"""
+    if _is_array(old_column) and _is_array(new_column):
+        old_rows = numpy.asarray(old_rows, dtype=numpy.intp)
+        new_rows = numpy.asarray(new_rows, dtype=numpy.intp)
+        return(numpy.flatnonzero(old_column[old_rows] !=
+                                 new_column[new_rows]).tolist())
+
+    return([k for k, (i, j) in enumerate(zip(old_rows, new_rows))
+            if old_column[i] != new_column[j]])
+
+
+def _crossed_rows(old_column, old_rows, new_column, new_rows, threshold):
+    """Get the positions where the values went from below C{B{threshold}}
+    to at least C{B{threshold}}, or the other way around"""
+    if _is_array(old_column) and _is_array(new_column):
+        old_rows = numpy.asarray(old_rows, dtype=numpy.intp)
+        new_rows = numpy.asarray(new_rows, dtype=numpy.intp)
+        old_below = old_column[old_rows] < threshold
+        new_below = new_column[new_rows] < threshold
+        return(numpy.flatnonzero(old_below != new_below).tolist())
+
+    return([k for k, (i, j) in enumerate(zip(old_rows, new_rows))
+            if (old_column[i] < threshold) != (new_column[j] < threshold)])
+
+
+def diff(old, new, thresholds=None, view=None):
+    """Compare two snapshots of the same view
+
+    Torrents are matched by info hash, then each field is compared column
+    by column over the torrents in both snapshots.
+
+    @param old: previous snapshot
+    @type old: L{TorrentTable}
+
+    @param new: current snapshot
+    @type new: L{TorrentTable}
+
+    @param thresholds: field -> value or list of values, ex.
+    C{{"ratio": 1000}}: an event is generated when a field's value goes from
+    below a threshold to at least the threshold, or the other way around
+    @type thresholds: dict
+
+    @param view: the view the snapshots were taken of, set on the events
+    @type view: str
+
+    @return: generator of L{TorrentEvent} instances. Fields that aren't in
+    both snapshots are skipped
+    """
+    old_index = old.get_index()
+    new_index = new.get_index()
+
+    for info_hash in new_index:
+        if info_hash not in old_index:
+            yield TorrentEvent(ADDED, info_hash, view=view)
+
+    for info_hash in old_index:
+        if info_hash not in new_index:
+            yield TorrentEvent(REMOVED, info_hash, view=view)
+
+    # rows of the torrents in both snapshots
+    info_hashes = []
+    old_rows = []
+    new_rows = []
+    for info_hash, j in new_index.items():
+        i = old_index.get(info_hash)
+        if i is not None:
+            info_hashes.append(info_hash)
+            old_rows.append(i)
+            new_rows.append(j)
+
+    def events(event_type, field, positions, threshold=None):
+        old_column = old[field]
+        new_column = new[field]
+        for k in positions:
+            yield TorrentEvent(event_type, info_hashes[k], field,
+                               _get_value(old_column, old_rows[k]),
+                               _get_value(new_column, new_rows[k]),
+                               threshold, view)
+
+    def compare(field):
+        if field in old and field in new:
+            return(_changed_rows(old[field], old_rows, new[field], new_rows))
+        return([])
+
+    for event in events(COMPLETED, "complete", compare("complete")):
+        if event.new_value:
+            yield event
+
+    for field in STATE_FIELDS:
+        for event in events(STATE_CHANGED, field, compare(field)):
+            yield event
+
+    for event in events(MESSAGE_CHANGED, "message", compare("message")):
+        yield event
+
+    for field, values in (thresholds or {}).items():
+        if field not in old or field not in new:
+            continue
+
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+
+        for threshold in values:
+            for event in events(THRESHOLD_CROSSED, field,
+                                _crossed_rows(old[field], old_rows,
+                                              new[field], new_rows,
+                                              threshold),
+                                threshold):
+                yield event
@@ -24,6 +24,8 @@ import rtorrent.rpc
 from rtorrent.common import safe_repr
 
 Method = rtorrent.rpc.Method
+IMMUTABLE = rtorrent.rpc.IMMUTABLE
+SLOW = rtorrent.rpc.SLOW
 
 
 class File:
@@ -38,50 +40,79 @@ class File:
 
         self.rpc_id = "{0}:f{1}".format(
             self.info_hash, self.index)  # : unique id to pass to rTorrent
+        self.dirty_fields = set()  # : fields a modifier might not have set
 
     def update(self):
         """Refresh file data
 
-        @note: All fields are stored as attributes to self.
+        @note: All fields are stored as attributes to self. Immutable
+        fields that were retrieved already aren't retrieved again.
 
         @return: None
         """
         multicall = rtorrent.rpc.Multicall(self)
         retriever_methods = [m for m in methods
-                             if m.is_retriever() and m.is_available(self._rt_obj)]
+                             if m.is_retriever() and m.is_available(self._rt_obj)
+                             and not (m.is_immutable() and
+                                      hasattr(self, m.varname))]
         for method in retriever_methods:
             multicall.add(method, self.rpc_id)
 
         multicall.call()
 
     def __repr__(self):
-        return safe_repr("File(index={0} path=\"{1}\")", self.index, self.path)
+        return safe_repr("File(index={0} path=\"{1}\")",
+                        self.index, getattr(self, "path", None))
 
 methods = [
     # RETRIEVERS
     Method(File, 'get_last_touched', 'f.get_last_touched'),
-    Method(File, 'get_range_second', 'f.get_range_second'),
-    Method(File, 'get_size_bytes', 'f.get_size_bytes'),
-    Method(File, 'get_priority', 'f.get_priority'),
-    Method(File, 'get_match_depth_next', 'f.get_match_depth_next'),
+    Method(File, 'get_range_second', 'f.get_range_second',
+           volatility=IMMUTABLE,
+           ),
+    Method(File, 'get_size_bytes', 'f.get_size_bytes',
+           volatility=IMMUTABLE,
+           ),
+    Method(File, 'get_priority', 'f.get_priority',
+           volatility=SLOW,
+           ),
+    Method(File, 'get_match_depth_next', 'f.get_match_depth_next',
+           volatility=SLOW,
+           ),
     Method(File, 'is_resize_queued', 'f.is_resize_queued',
            boolean=True,
            ),
-    Method(File, 'get_range_first', 'f.get_range_first'),
-    Method(File, 'get_match_depth_prev', 'f.get_match_depth_prev'),
-    Method(File, 'get_path', 'f.get_path'),
+    Method(File, 'get_range_first', 'f.get_range_first',
+           volatility=IMMUTABLE,
+           ),
+    Method(File, 'get_match_depth_prev', 'f.get_match_depth_prev',
+           volatility=SLOW,
+           ),
+    Method(File, 'get_path', 'f.get_path',
+           volatility=IMMUTABLE,
+           ),
     Method(File, 'get_completed_chunks', 'f.get_completed_chunks'),
-    Method(File, 'get_path_components', 'f.get_path_components'),
+    Method(File, 'get_path_components', 'f.get_path_components',
+           volatility=IMMUTABLE,
+           ),
     Method(File, 'is_created', 'f.is_created',
            boolean=True,
            ),
     Method(File, 'is_open', 'f.is_open',
            boolean=True,
            ),
-    Method(File, 'get_size_chunks', 'f.get_size_chunks'),
-    Method(File, 'get_offset', 'f.get_offset'),
-    Method(File, 'get_frozen_path', 'f.get_frozen_path'),
-    Method(File, 'get_path_depth', 'f.get_path_depth'),
+    Method(File, 'get_size_chunks', 'f.get_size_chunks',
+           volatility=IMMUTABLE,
+           ),
+    Method(File, 'get_offset', 'f.get_offset',
+           volatility=IMMUTABLE,
+           ),
+    Method(File, 'get_frozen_path', 'f.get_frozen_path',
+           volatility=SLOW,
+           ),
+    Method(File, 'get_path_depth', 'f.get_path_depth',
+           volatility=IMMUTABLE,
+           ),
     Method(File, 'is_create_queued', 'f.is_create_queued',
            boolean=True,
            ),
@@ -89,3 +120,7 @@ methods = [
 
     # MODIFIERS
 ]
+
+File = rtorrent.rpc._add_slots(File, methods,
+                               extra=("_rt_obj", "info_hash", "index", "rpc_id",
+                                      "dirty_fields"))
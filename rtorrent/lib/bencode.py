@@ -22,6 +22,13 @@
 #
 # Changelog
 # ---------
+# 2026-10-18  - Fixed: encode() raised NameError (long) on Python 3
+#             - Decode using offsets into the data instead of returning the
+#               remaining data after every token
+#             - Malformed data raises BencodeDecodeError instead of returning
+#               False
+#             - Added spans argument to decode()
+#             - Added index() and decode_at()
 # 2011-11-07  - Added support for Python2 (tested on 2.6)
 # 2011-10-03  - Fixed: moved check for end of list at the top of the while loop
 #               in _decode_list (in case the list is empty) (Chris Lucas)
@@ -42,171 +49,221 @@ _py3 = sys.version_info[0] == 3
 
 if _py3:
     _VALID_STRING_TYPES = (str,)
+    _INTEGER_TYPES = (int,)
 else:
     _VALID_STRING_TYPES = (str, unicode)  # @UndefinedVariable
+    _INTEGER_TYPES = (int, long)  # @UndefinedVariable
 
-_TYPE_INT = 1
-_TYPE_STRING = 2
-_TYPE_LIST = 3
-_TYPE_DICTIONARY = 4
-_TYPE_END = 5
-_TYPE_INVALID = 6
+_INT = b'i'
+_LIST = b'l'
+_DICT = b'd'
+_END = b'e'
+_DIGITS = frozenset(b'0123456789') if _py3 else frozenset('0123456789')
 
-# Function to determine the type of he next value/item
-#   Arguments:
-#	   char		First character of the string that is to be decoded
-#   Return value:
-#	   Returns an integer that describes what type the next value/item is
-
-
-def _gettype(char):
-    if not isinstance(char, int):
-        char = ord(char)
-    if char == 0x6C:						# 'l'
-        return _TYPE_LIST
-    elif char == 0x64:					  # 'd'
-        return _TYPE_DICTIONARY
-    elif char == 0x69:					  # 'i'
-        return _TYPE_INT
-    elif char == 0x65:					  # 'e'
-        return _TYPE_END
-    elif char >= 0x30 and char <= 0x39:	 # '0' '9'
-        return _TYPE_STRING
-    else:
-        return _TYPE_INVALID
 
-# Function to parse a string from the bendcoded data
-#   Arguments:
-#	   data		bencoded data, must be guaranteed to be a string
-#   Return Value:
-#	   Returns a tuple, the first member of the tuple is the parsed string
-#	   The second member is whatever remains of the bencoded data so it can
-#	   be used to parse the next part of the data
+# Exception raised when the bencoded data is malformed
+#   Attributes:
+#	   position	offset in the data where the error was found
 
 
-def _decode_string(data):
-    end = 1
-    # if py3, data[end] is going to be an int
-    # if py2, data[end] will be a string
-    if _py3:
-        char = 0x3A
-    else:
-        char = chr(0x3A)
+class BencodeDecodeError(ValueError):
+    def __init__(self, msg, position):
+        ValueError.__init__(self, "{0} at position {1}".format(msg, position))
+        self.msg = msg
+        self.position = position
 
-    while data[end] != char:  # ':'
-        end = end + 1
-    strlen = int(data[:end])
-    return (data[end + 1:strlen + end + 1], data[strlen + end + 1:])
+    def __reduce__(self):
+        # so it can be pickled (ex. when raised in a multiprocessing worker)
+        return (BencodeDecodeError, (self.msg, self.position))
 
-# Function to parse an integer from the bencoded data
+# Function to decode the value that starts at the given offset
 #   Arguments:
-#	   data		bencoded data, must be guaranteed to be an integer
+#	   data		bencoded data (bytes, or anything that supports slicing and
+#			   find(), such as an mmap)
+#	   pos		offset of the first character of the value
 #   Return Value:
-#	   Returns a tuple, the first member of the tuple is the parsed string
-#	   The second member is whatever remains of the bencoded data so it can
-#	   be used to parse the next part of the data
+#	   Returns a tuple, the first member is the decoded value, the second
+#	   member is the offset right after the value
+#
+#   The data is never copied, except for the parts that make up the values
+
+
+def _decode(data, pos):
+    char = data[pos:pos + 1]
+    if char == _INT:
+        return _decode_int(data, pos)
+    elif char == _LIST:
+        return _decode_list(data, pos)
+    elif char == _DICT:
+        return _decode_dict(data, pos)
+    elif char and char[0] in _DIGITS:
+        return _decode_string(data, pos)
+    elif not char:
+        raise BencodeDecodeError("Unexpected end of data", pos)
+    else:
+        raise BencodeDecodeError("Invalid value type {0!r}".format(char), pos)
 
 
-def _decode_int(data):
-    end = 1
-    # if py3, data[end] is going to be an int
-    # if py2, data[end] will be a string
-    if _py3:
-        char = 0x65
-    else:
-        char = chr(0x65)
+def _decode_int(data, pos):
+    end = data.find(_END, pos + 1)
+    if end == -1:
+        raise BencodeDecodeError("Unterminated integer", pos)
 
-    while data[end] != char:	 # 'e'
-        end = end + 1
-    return (int(data[1:end]), data[end + 1:])
+    try:
+        return (int(data[pos + 1:end]), end + 1)
+    except ValueError:
+        raise BencodeDecodeError("Invalid integer", pos)
 
-# Function to parse a bencoded list
-#   Arguments:
-#	   data		bencoded data, must be guaranted to be the start of a list
-#   Return Value:
-#	   Returns a tuple, the first member of the tuple is the parsed list
-#	   The second member is whatever remains of the bencoded data so it can
-#	   be used to parse the next part of the data
 
+def _decode_string(data, pos):
+    colon = data.find(b':', pos)
+    if colon == -1:
+        raise BencodeDecodeError("Invalid string length", pos)
+
+    try:
+        strlen = int(data[pos:colon])
+    except ValueError:
+        raise BencodeDecodeError("Invalid string length", pos)
+
+    start = colon + 1
+    end = start + strlen
+    if end > len(data):
+        raise BencodeDecodeError("String exceeds the end of data", pos)
+
+    return (data[start:end], end)
 
-def _decode_list(data):
+
+def _decode_list(data, pos):
     x = []
-    overflow = data[1:]
-    while True:										 # Loop over the data
-        if _gettype(overflow[0]) == _TYPE_END:		  # - Break if we reach the end of the list
-            return (x, overflow[1:])  # and return the list and overflow
+    pos += 1
+    while data[pos:pos + 1] != _END:  # also checked first for empty lists
+        value, pos = _decode(data, pos)
+        x.append(value)
 
-        value, overflow = _decode(overflow)			 #
-        if isinstance(value, bool) or overflow == '':   # - if we have a parse error
-            return (False, False)  # Die with error
-        else:										   # - Otherwise
-            x.append(value)  # add the value to the list
+    return (x, pos + 1)
 
 
-# Function to parse a bencoded list
+def _decode_dict(data, pos, spans=None):
+    x = {}
+    pos += 1
+    while data[pos:pos + 1] != _END:
+        char = data[pos:pos + 1]
+        if not char or char[0] not in _DIGITS:
+            if not char:
+                raise BencodeDecodeError("Unexpected end of data", pos)
+            raise BencodeDecodeError("Dictionary key must be a string", pos)
+
+        key, pos = _decode_string(data, pos)
+        # don't use bytes for the key
+        key = key.decode()
+
+        start = pos
+        x[key], pos = _decode(data, pos)
+        if spans is not None:
+            spans[key] = (start, pos)
+
+    return (x, pos + 1)
+
+# Function to find the end of the value that starts at the given offset,
+# without decoding it
 #   Arguments:
-#	   data		bencoded data, must be guaranted to be the start of a list
+#	   data		bencoded data (see _decode)
+#	   pos		offset of the first character of the value
 #   Return Value:
-#	   Returns a tuple, the first member of the tuple is the parsed dictionary
-#	   The second member is whatever remains of the bencoded data so it can
-#	   be used to parse the next part of the data
-def _decode_dict(data):
-    x = {}
-    overflow = data[1:]
-    while True:										 # Loop over the data
-        if _gettype(overflow[0]) != _TYPE_STRING:	   # - If the key is not a string
-            return (False, False)  # Die with error
-        key, overflow = _decode(overflow)			   #
-        if key == False or overflow == '':			  # - If parse error
-            return (False, False)  # Die with error
-        value, overflow = _decode(overflow)			 #
-        if isinstance(value, bool) or overflow == '':   # - If parse error
-            print("Error parsing value")
-            print(value)
-            print(overflow)
-            return (False, False)  # Die with error
-        else:
-            # don't use bytes for the key
-            key = key.decode()
-            x[key] = value
-        if _gettype(overflow[0]) == _TYPE_END:
-            return (x, overflow[1:])
+#	   Returns the offset right after the value
+
+
+def _skip(data, pos):
+    char = data[pos:pos + 1]
+    if char == _INT:
+        end = data.find(_END, pos + 1)
+        if end == -1:
+            raise BencodeDecodeError("Unterminated integer", pos)
+        return end + 1
+    elif char == _LIST or char == _DICT:
+        pos += 1
+        while data[pos:pos + 1] != _END:
+            if not data[pos:pos + 1]:
+                raise BencodeDecodeError("Unexpected end of data", pos)
+            pos = _skip(data, pos)
+        return pos + 1
+    elif char and char[0] in _DIGITS:
+        colon = data.find(b':', pos)
+        try:
+            end = colon + 1 + int(data[pos:colon])
+        except ValueError:
+            raise BencodeDecodeError("Invalid string length", pos)
+        if colon == -1 or end > len(data):
+            raise BencodeDecodeError("Invalid string length", pos)
+        return end
+    elif not char:
+        raise BencodeDecodeError("Unexpected end of data", pos)
+    else:
+        raise BencodeDecodeError("Invalid value type {0!r}".format(char), pos)
 
+# Function to index the values of a bencoded dictionary without decoding them
 #   Arguments:
-#	   data		bencoded data in bytes format
-#   Return Values:
-#	   Returns a tuple, the first member is the parsed data, could be a string,
-#	   an integer, a list or a dictionary, or a combination of those
-#	   The second member is the leftover of parsing, if everything parses correctly this
-#	   should be an empty byte string
-
-
-def _decode(data):
-    btype = _gettype(data[0])
-    if btype == _TYPE_INT:
-        return _decode_int(data)
-    elif btype == _TYPE_STRING:
-        return _decode_string(data)
-    elif btype == _TYPE_LIST:
-        return _decode_list(data)
-    elif btype == _TYPE_DICTIONARY:
-        return _decode_dict(data)
-    else:
-        return (False, False)
+#	   data		bencoded data (see _decode)
+#	   pos		offset of the dictionary
+#   Return Value:
+#	   Returns a dict mapping each key to the (start, end) offsets of its
+#	   value, the values can be decoded later on with decode_at()
+
+
+def index(data, pos=0):
+    if data[pos:pos + 1] != _DICT:
+        raise BencodeDecodeError("Expected a dictionary", pos)
+
+    spans = {}
+    pos += 1
+    while data[pos:pos + 1] != _END:
+        char = data[pos:pos + 1]
+        if not char or char[0] not in _DIGITS:
+            if not char:
+                raise BencodeDecodeError("Unexpected end of data", pos)
+            raise BencodeDecodeError("Dictionary key must be a string", pos)
+
+        key, pos = _decode_string(data, pos)
+        key = key.decode()
+
+        end = _skip(data, pos)
+        spans[key] = (pos, end)
+        pos = end
+
+    return spans
+
+# Function to decode the value that starts at the given offset
+#   Arguments:
+#	   data		bencoded data (see _decode)
+#	   pos		offset of the value
+#   Return Value:
+#	   Returns the decoded value
+
+
+def decode_at(data, pos):
+    return _decode(data, pos)[0]
 
 # Function to decode bencoded data
 #   Arguments:
 #	   data		bencoded data, can be str or bytes
+#	   spans	optional dict, if the data is a dictionary, the (start, end)
+#			   offsets of each of its values are stored in it, keyed by
+#			   the dictionary key (ex. to hash the info dict of a torrent
+#			   without encoding it again)
 #   Return Values:
-#	   Returns the decoded data on success, this coud be bytes, int, dict or list
+#	   Returns the decoded data, this coud be bytes, int, dict or list
 #	   or a combinatin of those
-#	   If an error occurs the return value is False
+#	   Raises BencodeDecodeError if the data is malformed
 
 
-def decode(data):
-    # if isinstance(data, str):
-    #	data = data.encode()
-    decoded, overflow = _decode(data)
+def decode(data, spans=None):
+    if _py3 and isinstance(data, str):
+        data = data.encode("utf-8")
+
+    if spans is not None and data[0:1] == _DICT:
+        decoded, end = _decode_dict(data, 0, spans)
+    else:
+        decoded, end = _decode(data, 0)
     return decoded
 
 #   Args: data as integer
@@ -267,7 +324,7 @@ def _encode_dict(data):
 def encode(data):
     if isinstance(data, bool):
         return False
-    elif isinstance(data, (int, long)):
+    elif isinstance(data, _INTEGER_TYPES):
         return _encode_int(data)
     elif isinstance(data, bytes):
         return _encode_string(data)
@@ -19,6 +19,7 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 from rtorrent.compat import is_py3
+import mmap
 import os.path
 import re
 import rtorrent.lib.bencode as bencode
@@ -30,6 +31,40 @@ else:
     from urllib2 import urlopen  # @UnresolvedImport @Reimport
 
 
+def _calc_info_hashes(raw_torrent, torrent_decoded, info_span):
+    """Hash the info dict straight from the original data
+
+    The info hash is defined over the bytes of the info dict as they appear
+    in the torrent file, so hashing them directly is both faster and more
+    accurate than encoding the decoded dict again (which changes the hash
+    of torrents that weren't encoded canonically).
+
+    @return: (SHA-1 info hash, SHA-256 info hash for v2 torrents or None)
+    @rtype: tuple
+
+    @raise AssertionError: if the torrent or its info isn't a dict
+    """
+    assert isinstance(torrent_decoded, dict), "Invalid torrent file."
+    if info_span is None:
+        return(None, None)
+
+    assert isinstance(torrent_decoded.get("info"), dict), \
+        "Invalid torrent file."
+
+    if not isinstance(raw_torrent, bytes):
+        # decoded from its UTF-8 encoding, see bencode.decode()
+        raw_torrent = raw_torrent.encode("utf-8")
+
+    info = memoryview(raw_torrent)[info_span[0]:info_span[1]]
+    info_hash = hashlib.sha1(info).hexdigest().upper()
+
+    info_hash_v2 = None
+    if torrent_decoded["info"].get("meta version") == 2:
+        info_hash_v2 = hashlib.sha256(info).hexdigest().upper()
+
+    return(info_hash, info_hash_v2)
+
+
 class TorrentParser():
     def __init__(self, torrent):
         """Decode and parse given torrent
@@ -40,11 +75,14 @@ class TorrentParser():
         @raise AssertionError: Can be raised for a couple reasons:
                                - If _get_raw_torrent() couldn't figure out
                                what X{torrent} is
-                               - if X{torrent} isn't a valid bencoded torrent file
+                               - if X{torrent} isn't a torrent file
+
+        @raise BencodeDecodeError: if X{torrent} isn't valid bencoded data
         """
         self.torrent = torrent
         self._raw_torrent = None  # : testing yo
         self._torrent_decoded = None  # : what up
+        self._info_span = None  # : (start, end) of the info dict in _raw_torrent
         self.file_type = None
 
         self._get_raw_torrent()
@@ -57,10 +95,12 @@ class TorrentParser():
     def _is_raw(self):
         raw = False
         if isinstance(self.torrent, (str, bytes)):
-            if isinstance(self._decode_torrent(self.torrent), dict):
-                raw = True
-            else:
-                # reset self._torrent_decoded (currently equals False)
+            try:
+                raw = isinstance(self._decode_torrent(self.torrent), dict)
+            except bencode.BencodeDecodeError:
+                pass
+
+            if not raw:
                 self._torrent_decoded = None
 
         return(raw)
@@ -71,6 +111,8 @@ class TorrentParser():
         if self._is_raw():
             self.file_type = "raw"
             self._raw_torrent = self.torrent
+            if not isinstance(self._raw_torrent, bytes):
+                self._raw_torrent = self._raw_torrent.encode("utf-8")
             return
         # local file?
         if os.path.isfile(self.torrent):
@@ -84,16 +126,14 @@ class TorrentParser():
     def _decode_torrent(self, raw_torrent=None):
         if raw_torrent is None:
             raw_torrent = self._raw_torrent
-        self._torrent_decoded = bencode.decode(raw_torrent)
+        spans = {}
+        self._torrent_decoded = bencode.decode(raw_torrent, spans)
+        self._info_span = spans.get("info")
         return(self._torrent_decoded)
 
     def _calc_info_hash(self):
-        self.info_hash = None
-        if "info" in self._torrent_decoded.keys():
-            info_encoded = bencode.encode(self._torrent_decoded["info"])
-
-            if info_encoded:
-                self.info_hash = hashlib.sha1(info_encoded).hexdigest().upper()
+        self.info_hash, self.info_hash_v2 = _calc_info_hashes(
+            self._raw_torrent, self._torrent_decoded, self._info_span)
 
         return(self.info_hash)
 
@@ -116,8 +156,8 @@ class NewTorrentParser(object):
         return fp
 
     @staticmethod
-    def _decode_torrent(data):
-        return bencode.decode(data)
+    def _decode_torrent(data, spans=None):
+        return bencode.decode(data, spans)
 
     def __init__(self, input):
         self.input = input
@@ -140,16 +180,16 @@ class NewTorrentParser(object):
 
         assert self._raw_torrent is not None, "Invalid input: input must be a path or a file-like object"
 
-        self._decoded_torrent = self._decode_torrent(self._raw_torrent)
+        spans = {}
+        self._decoded_torrent = self._decode_torrent(self._raw_torrent, spans)
+        self._info_span = spans.get("info")
 
         assert isinstance(
             self._decoded_torrent, dict), "File could not be decoded"
 
     def _calc_info_hash(self):
-        self.info_hash = None
-        info_dict = self._torrent_decoded["info"]
-        self.info_hash = hashlib.sha1(bencode.encode(
-            info_dict)).hexdigest().upper()
+        self.info_hash, self.info_hash_v2 = _calc_info_hashes(
+            self._raw_torrent, self._decoded_torrent, self._info_span)
 
         return(self.info_hash)
 
@@ -158,3 +198,140 @@ class NewTorrentParser(object):
 
     def get_tracker(self):
         return self._decoded_torrent.get("announce")
+
+
+class LazyTorrentParser(object):
+    """Read the metadata of a torrent file on demand
+
+    The file is memory-mapped and only the offsets of the values of the
+    torrent and info dicts are indexed, values are decoded the first time
+    they're accessed. This keeps scanning lots of torrent files cheap, the
+    pieces (often the bulk of the file) are never copied, see L{pieces}.
+    """
+
+    def __init__(self, path):
+        """
+        @param path: path to the torrent file
+        @type path: str
+
+        @raise AssertionError: if X{path} isn't a torrent file
+        @raise BencodeDecodeError: if X{path} isn't valid bencoded data
+        """
+        self.path = path
+        self._cache = {}
+
+        with open(path, "rb") as fp:
+            assert os.fstat(fp.fileno()).st_size > 0, "Invalid torrent file."
+            self._data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._index = bencode.index(self._data)
+        assert "info" in self._index, "Invalid torrent file."
+        self._info_index = bencode.index(self._data, self._index["info"][0])
+
+    def __enter__(self):
+        return(self)
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return("<LazyTorrentParser path=%r>" % self.path)
+
+    def close(self):
+        """Unmap the file
+
+        Any memoryview returned by L{pieces} must be released first.
+        """
+        self._data.close()
+
+    def _get(self, index, key, default):
+        span = index.get(key)
+        if span is None:
+            return(default)
+        return(bencode.decode_at(self._data, span[0]))
+
+    def get(self, key, default=None):
+        """Decode a key of the torrent dict
+
+        @param key: ex. "announce", "announce-list", "comment"
+        @type key: str
+        """
+        return(self._get(self._index, key, default))
+
+    def get_info(self, key, default=None):
+        """Decode a key of the info dict
+
+        @param key: ex. "name", "piece length", "files"
+        @type key: str
+        """
+        return(self._get(self._info_index, key, default))
+
+    def _cached(self, name, func):
+        if name not in self._cache:
+            self._cache[name] = func()
+        return(self._cache[name])
+
+    def _view(self, start, end):
+        """Get the mapped bytes between C{B{start}} and C{B{end}}, without
+        copying them
+
+        @note: Python 2's mmap doesn't support memoryview, the bytes are
+        copied there
+        """
+        if not is_py3():
+            return(self._data[start:end])
+        return(memoryview(self._data)[start:end])
+
+    def _hash_info(self, hash_func):
+        start, end = self._index["info"]
+        info = self._view(start, end)
+        try:
+            return(hash_func(info).hexdigest().upper())
+        finally:
+            if isinstance(info, memoryview):
+                info.release()
+
+    @property
+    def info_hash(self):
+        return(self._cached("info_hash",
+                            lambda: self._hash_info(hashlib.sha1)))
+
+    @property
+    def info_hash_v2(self):
+        """SHA-256 info hash, None unless the torrent is a v2 torrent"""
+        def calc():
+            if self.get_info("meta version") != 2:
+                return(None)
+            return(self._hash_info(hashlib.sha256))
+
+        return(self._cached("info_hash_v2", calc))
+
+    @property
+    def name(self):
+        return(self._cached("name", lambda: self.get_info("name")))
+
+    @property
+    def announce(self):
+        return(self._cached("announce", lambda: self.get("announce")))
+
+    @property
+    def total_size(self):
+        def calc():
+            if "length" in self._info_index:
+                return(self.get_info("length"))
+            return(sum(f["length"] for f in self.get_info("files", [])))
+
+        return(self._cached("total_size", calc))
+
+    @property
+    def pieces(self):
+        """The concatenated SHA-1 piece hashes, as a memoryview into the
+        mapped file (None if the torrent has no pieces key)
+
+        @rtype: memoryview (bytes on Python 2)
+        """
+        span = self._info_index.get("pieces")
+        if span is None:
+            return(None)
+        start = self._data.find(b":", span[0], span[1]) + 1
+        return(self._view(start, span[1]))
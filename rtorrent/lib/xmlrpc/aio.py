@@ -0,0 +1,152 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# asyncio transports, requires Python 3.5 or later
+
+import asyncio
+import base64
+import urllib.parse as urlparser
+
+from rtorrent.compat import xmlrpclib
+from rtorrent.lib.xmlrpc.scgi import SCGITransport, ResponseBodyReader, \
+    RESPONSE_CHUNK_SIZE
+
+
+async def _read_response(transport, reader, verbose=0, check_header=None):
+    """Read a response from C{B{reader}}, feeding the body to the parser as
+    it arrives
+
+    @param check_header: called with the raw response headers before any of
+    the body is parsed
+    @type check_header: callable
+    """
+    p, u = transport.getparser()
+    body_reader = ResponseBodyReader()
+    checked = False
+
+    while True:
+        data = await reader.read(RESPONSE_CHUNK_SIZE)
+        if not data:
+            break
+
+        data = body_reader.feed(data)
+        if body_reader.header is not None and not checked:
+            checked = True
+            if check_header is not None:
+                check_header(body_reader.header)
+
+        if data:
+            if verbose:
+                print('body:', repr(data))
+            p.feed(data)
+
+    body_reader.close()
+    p.close()
+
+    return u.close()
+
+
+class AsyncSCGITransport(SCGITransport):
+    """asyncio counterpart of L{SCGITransport}
+
+    Supports TCP (host given) and unix sockets (handler is the socket path).
+    """
+
+    async def request(self, host, handler, request_body, verbose=0):
+        request_body = self._encode_request(request_body)
+
+        if host:
+            address = urlparser.urlsplit("//" + host)
+            reader, writer = await asyncio.open_connection(address.hostname,
+                                                           address.port)
+        else:
+            reader, writer = await asyncio.open_unix_connection(handler)
+
+        try:
+            writer.write(request_body)
+            await writer.drain()
+
+            return await _read_response(self, reader, verbose)
+        finally:
+            writer.close()
+
+
+class AsyncHTTPTransport(xmlrpclib.Transport):
+    """asyncio transport for rTorrent behind an HTTP(S) server
+
+    Every request opens a new connection (HTTP/1.0), so requests made
+    concurrently never share a connection.
+    """
+
+    def __init__(self, use_datetime=False, username=None, password=None,
+                 use_ssl=False):
+        xmlrpclib.Transport.__init__(self, use_datetime=use_datetime)
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+
+    def _get_headers(self, host, request_body):
+        headers = [
+            ("Host", host),
+            ("User-Agent", self.user_agent),
+            ("Content-Type", "text/xml"),
+            ("Content-Length", str(len(request_body))),
+        ]
+
+        if self.username is not None and self.password is not None:
+            auth = "{0}:{1}".format(self.username, self.password)
+            auth = base64.b64encode(auth.encode("utf-8")).decode("ascii")
+            headers.append(("Authorization", "Basic " + auth))
+
+        return headers
+
+    async def request(self, host, handler, request_body, verbose=0):
+        if not isinstance(request_body, bytes):
+            request_body = request_body.encode("utf-8")
+
+        address = urlparser.urlsplit("//" + host)
+        port = address.port
+        if port is None:
+            port = 443 if self.use_ssl else 80
+
+        reader, writer = await asyncio.open_connection(
+            address.hostname, port, ssl=self.use_ssl or None)
+
+        try:
+            lines = ["POST {0} HTTP/1.0".format(handler)]
+            lines += ["{0}: {1}".format(k, v)
+                      for k, v in self._get_headers(host, request_body)]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            writer.write(request_body)
+            await writer.drain()
+
+            def check_status(header):
+                status = header.split(b"\n", 1)[0].decode("latin-1").split(None, 2)
+                if len(status) < 2 or status[1] != "200":
+                    raise xmlrpclib.ProtocolError(
+                        host + handler,
+                        int(status[1]) if len(status) > 1 else -1,
+                        status[2].strip() if len(status) > 2 else "",
+                        {},
+                    )
+
+            return await _read_response(self, reader, verbose, check_status)
+        finally:
+            writer.close()
@@ -20,7 +20,10 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-from base64 import encodestring
+try:
+    from base64 import encodebytes as encodestring
+except ImportError:  # Python 2
+    from base64 import encodestring
 import string
 try:
     import xmlrpc.client as xmlrpclib
@@ -87,8 +87,11 @@ try:
 except ImportError:
     import httplib
 import re
+import select
 import socket
 import sys
+import threading
+import time
 try:
     import urllib.parse as urlparser
 except ImportError:
@@ -101,6 +104,13 @@ except:
 
 import errno
 
+RESPONSE_CHUNK_SIZE = 64 * 1024  # : bytes read from the socket at a time
+CONNECT_TIMEOUT = 1  # : seconds to wait for a pooled socket to connect
+MAX_HEADER_SIZE = 64 * 1024  # : give up if no header boundary within this
+
+# blank line between the response headers and the body
+_HEADER_END = re.compile(b'\r?\n[ \t]*\r?\n')
+
 
 class SCGITransport(xmlrpclib.Transport):
     # Added request() from Python 2.7 xmlrpclib here to backport to Python 2.6
@@ -117,63 +127,328 @@ class SCGITransport(xmlrpclib.Transport):
                     raise
 
     def single_request(self, host, handler, request_body, verbose=0):
-        # Add SCGI headers to the request.
-        headers = [('CONTENT_LENGTH', str(len(request_body))), ('SCGI', '1')]
-        header = '\x00'.join(['%s\x00%s' % (key, value) for key, value in headers]) + '\x00'
-        header = '%d:%s' % (len(header), header)
-        request_body = '%s,%s' % (header, request_body)
+        request_body = self._encode_request(request_body)
 
         sock = None
 
         try:
-            if host:
-                host, port = urlparser.splitport(host)
-                addrinfo = socket.getaddrinfo(host, int(port), socket.AF_INET,
-                                              socket.SOCK_STREAM)
-                sock = socket.socket(*addrinfo[0][:3])
-                sock.connect(addrinfo[0][4])
-            else:
-                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                sock.connect(handler)
+            sock = self._connect(host, handler)
 
             self.verbose = verbose
 
-            if sys.version_info[0] > 2:
-                sock.send(bytes(request_body, "utf-8"))
-            else:
-                sock.send(request_body)
-            return self.parse_response(sock.makefile())
+            sock.sendall(request_body)
+            return self.parse_response(sock.makefile("rb"))
         finally:
             if sock:
                 sock.close()
 
+    def stream_request(self, host, handler, request_body, verbose=0):
+        """Send a request, yielding the response body in chunks as it arrives
+
+        @note: the response isn't parsed, see L{rtorrent.lib.xmlrpc.stream}
+        """
+        request_body = self._encode_request(request_body)
+
+        sock = self._connect(host, handler)
+        try:
+            self.verbose = verbose
+
+            sock.sendall(request_body)
+            for data in self._iter_body(sock.makefile("rb")):
+                if self.verbose:
+                    print('body:', repr(data))
+                yield data
+        finally:
+            sock.close()
+
+    def _encode_request(self, request_body):
+        """Prepend the SCGI headers to the request body
+
+        @return: the complete request, ready to be sent
+        @rtype: bytes
+        """
+        if not isinstance(request_body, bytes):
+            request_body = request_body.encode("utf-8")
+
+        # Add SCGI headers to the request.
+        headers = [('CONTENT_LENGTH', str(len(request_body))), ('SCGI', '1')]
+        header = '\x00'.join(['%s\x00%s' % (key, value) for key, value in headers]) + '\x00'
+        header = '%d:%s,' % (len(header), header)
+
+        return header.encode("ascii") + request_body
+
+    def _get_address(self, host, handler):
+        """Resolve the address of the SCGI server
+
+        @return: (family, type, proto, sockaddr)
+        @rtype: tuple
+        """
+        if host:
+            host, port = urlparser.splitport(host)
+            addrinfo = socket.getaddrinfo(host, int(port), socket.AF_INET,
+                                          socket.SOCK_STREAM)
+            family, type, proto, canonname, sockaddr = addrinfo[0]
+            return (family, type, proto, sockaddr)
+        else:
+            return (socket.AF_UNIX, socket.SOCK_STREAM, 0, handler)
+
+    def _connect(self, host, handler):
+        family, type, proto, sockaddr = self._get_address(host, handler)
+        sock = socket.socket(family, type, proto)
+        try:
+            sock.connect(sockaddr)
+        except socket.error:
+            sock.close()
+            raise
+
+        return sock
+
     def parse_response(self, response):
         p, u = self.getparser()
 
-        response_body = ''
+        # feed the body to the parser as it arrives instead of
+        # buffering the whole response first
+        for data in self._iter_body(response):
+            if self.verbose:
+                print('body:', repr(data))
+            p.feed(data)
+
+        p.close()
+
+        return u.close()
+
+    def _iter_body(self, response):
+        """Read the response, yielding the body in chunks
+
+        @param response: file-like object for the response (binary mode)
+
+        @raise xmlrpclib.ResponseError: if the end of the SCGI/HTTP headers
+        couldn't be found
+        """
+        reader = ResponseBodyReader()
         while True:
-            data = response.read(1024)
+            data = response.read(RESPONSE_CHUNK_SIZE)
             if not data:
                 break
-            response_body += data
 
-        # Remove SCGI headers from the response.
+            data = reader.feed(data)
+            if data:
+                yield data
+
+        reader.close()
+
 
-        if self.verbose:
-            print('body:', repr(response_body))
+class ResponseBodyReader(object):
+    """Strips the SCGI/HTTP headers off a response that's read in chunks"""
 
+    def __init__(self):
+        self.header = None  # : the raw response headers, once complete
+        self._head = b''
+
+    def feed(self, data):
+        """Feed the next chunk of the response
+
+        @return: the part of C{B{data}} that belongs to the body
+        @rtype: bytes
+
+        @raise xmlrpclib.ResponseError: if no header boundary was found in
+        the first L{MAX_HEADER_SIZE} bytes
+        """
+        if self.header is not None:
+            return data
+
+        # only rescan the tail of what was already searched, in case
+        # the separator was split between two reads
+        start = max(len(self._head) - 3, 0)
+        self._head += data
+        match = _HEADER_END.search(self._head, start)
+        if match is None:
+            if len(self._head) > MAX_HEADER_SIZE:
+                raise xmlrpclib.ResponseError(
+                    "error in response: %r" % self._head[:256])
+            return b''
+
+        self.header = self._head[:match.start()]
+        body = self._head[match.end():]
+        self._head = None
+
+        return body
+
+    def close(self):
+        """@raise xmlrpclib.ResponseError: if the response ended before the
+        end of the headers"""
+        if self.header is None:
+            raise xmlrpclib.ResponseError(
+                "error in response: %r" % self._head[:256])
+
+
+class PooledSCGITransport(SCGITransport):
+    """SCGITransport that keeps connected sockets ready for the next request
+
+    SCGI only allows one request per connection, so sockets can't be reused.
+    Instead, resolved addresses are cached and up to C{pool_size} sockets
+    per server are connected ahead of time (without blocking), so the
+    connection setup overlaps with whatever the caller does between requests.
+
+    A single instance is meant to be shared by every ServerProxy that
+    talks to the same rTorrent instance (see L{RTorrent._get_conn}), from
+    any number of threads. At most C{max_connections} requests are sent at
+    a time, the other threads wait for one of them to finish. Streamed
+    responses (see L{stream_request}) aren't counted.
+
+    Every pooled socket is an open connection on the server's side too, and
+    servers (or the proxies and NATs in between) drop connections that
+    stay idle. So each finished request opens at most one socket, the pool
+    only grows to C{pool_size} under concurrent use, and sockets that sat in
+    the pool for more than C{max_idle} seconds are closed instead of used.
+    """
+
+    def __init__(self, use_datetime=False, pool_size=2, max_connections=None,
+                 max_idle=30):
+        SCGITransport.__init__(self, use_datetime=use_datetime)
+        self.pool_size = pool_size  # : connected sockets to keep per server
+        self.max_connections = max_connections  # : max concurrent requests (None: no limit)
+        self.max_idle = max_idle  # : seconds a socket can stay in the pool
+        self._addresses = {}  # : (host, handler) -> resolved address
+        self._idle = {}  # : (host, handler) -> list of (socket, time) pairs
+        self._lock = threading.Lock()  # : guards _addresses and _idle
+        self._slots = None
+        if max_connections is not None:
+            assert max_connections > 0, "max_connections must be positive"
+            self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _get_address(self, host, handler):
+        key = (host, handler)
+        address = self._addresses.get(key)
+        if address is None:
+            address = SCGITransport._get_address(self, host, handler)
+            with self._lock:
+                self._addresses[key] = address
+
+        return address
+
+    def _preconnect(self, host, handler):
+        """Start a non-blocking connect, the socket is finished in _acquire()"""
+        family, type, proto, sockaddr = self._get_address(host, handler)
+        sock = socket.socket(family, type, proto)
+        sock.setblocking(False)
+
+        err = sock.connect_ex(sockaddr)
+        if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            sock.close()
+            return None
+
+        return sock
+
+    def _is_usable(self, sock):
+        """Wait for a pending connect to finish, and make sure the server
+        hasn't closed the connection while it sat in the pool"""
         try:
-            response_header, response_body = re.split(r'\n\s*?\n', response_body,
-                                                  maxsplit=1)
-        except ValueError:
-            print("error in response: %s", response_body)
-            p.close()
-            u.close()
-
-        p.feed(response_body)
-        p.close()
+            # never wait forever: a server that doesn't accept the
+            # connection in time is better off with a new one
+            timeout = socket.getdefaulttimeout()
+            if timeout is None:
+                timeout = CONNECT_TIMEOUT
+            writable = select.select([], [sock], [], timeout)[1]
+            if not writable or sock.getsockopt(socket.SOL_SOCKET,
+                                               socket.SO_ERROR) != 0:
+                return False
+
+            # the server never sends anything before a request, so a
+            # readable socket means it was closed on us
+            try:
+                if not sock.recv(1, socket.MSG_PEEK):
+                    return False
+            except socket.error as e:
+                if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    return False
+        except (socket.error, select.error, ValueError):
+            return False
 
-        return u.close()
+        sock.setblocking(True)
+        return True
+
+    def _connect(self, host, handler):
+        while True:
+            with self._lock:
+                idle = self._idle.get((host, handler))
+                if not idle:
+                    break
+                sock, since = idle.pop(0)
+
+            if time.time() - since <= self.max_idle and \
+                    self._is_usable(sock):
+                return sock
+            sock.close()
+
+        return SCGITransport._connect(self, host, handler)
+
+    def _replenish(self, host, handler):
+        """Replace the socket used by a finished request, if the pool isn't
+        full"""
+        with self._lock:
+            if len(self._idle.get((host, handler), [])) >= self.pool_size:
+                return
+
+        sock = self._preconnect(host, handler)
+        if sock is None:
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault((host, handler), [])
+            if len(idle) >= self.pool_size:
+                # another thread filled the pool in the meantime
+                sock.close()
+                return
+            idle.append((sock, time.time()))
+
+    def _discard(self, host, handler):
+        with self._lock:
+            socks = self._idle.pop((host, handler), [])
+
+        for sock, since in socks:
+            sock.close()
+
+    def _acquire_slot(self):
+        if self._slots is not None:
+            self._slots.acquire()
+
+    def _release_slot(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    def single_request(self, host, handler, request_body, verbose=0):
+        self._acquire_slot()
+        try:
+            response = SCGITransport.single_request(self, host, handler,
+                                                    request_body, verbose)
+        except socket.error:
+            # the pooled sockets are most likely stale as well
+            self._discard(host, handler)
+            raise
+        finally:
+            self._release_slot()
+
+        self._replenish(host, handler)
+        return response
+
+    def stream_request(self, host, handler, request_body, verbose=0):
+        # streamed responses don't count against max_connections: the
+        # caller decides when the response is read, and could be waiting
+        # for a slot itself (ex. a call made for each streamed torrent)
+        for data in SCGITransport.stream_request(self, host, handler,
+                                                 request_body, verbose):
+            yield data
+
+        self._replenish(host, handler)
+
+    def close(self):
+        with self._lock:
+            keys = list(self._idle.keys())
+
+        for key in keys:
+            self._discard(*key)
+        SCGITransport.close(self)
 
 
 class SCGIServerProxy(xmlrpclib.ServerProxy):
@@ -215,6 +490,19 @@ class SCGIServerProxy(xmlrpclib.ServerProxy):
 
         return response
 
+    def __stream(self, methodname, params):
+        # call a method on the remote server, without parsing the response
+
+        request = xmlrpclib.dumps(params, methodname, encoding=self.__encoding,
+                                  allow_none=self.__allow_none)
+
+        return self.__transport.stream_request(
+            self.__host,
+            self.__handler,
+            request,
+            verbose=self.__verbose
+        )
+
     def __repr__(self):
         return (
             "<SCGIServerProxy for %s%s>" %
@@ -238,4 +526,6 @@ class SCGIServerProxy(xmlrpclib.ServerProxy):
             return self.__close
         elif attr == "transport":
             return self.__transport
+        elif attr == "stream":
+            return self.__stream
         raise AttributeError("Attribute %r not found" % (attr,))
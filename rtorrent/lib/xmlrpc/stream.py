@@ -0,0 +1,75 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from collections import deque
+
+from rtorrent.compat import xmlrpclib
+
+
+class RowUnmarshaller(xmlrpclib.Unmarshaller):
+    """Unmarshaller that hands over the rows of an array of arrays
+    (such as the result of d.multicall) as soon as each row is complete,
+    instead of keeping them in the final result.
+
+    Completed rows are appended to L{rows}, the caller is expected to
+    consume them between calls to the parser's feed().
+    """
+
+    dispatch = dict(xmlrpclib.Unmarshaller.dispatch)
+
+    def __init__(self, use_datetime=False, depth=2):
+        xmlrpclib.Unmarshaller.__init__(self, use_datetime)
+        self.depth = depth  # : nesting level of the row arrays
+        self.rows = deque()  # : completed rows that haven't been consumed
+
+    def end_array(self, data):
+        xmlrpclib.Unmarshaller.end_array(self, data)
+        if len(self._marks) == self.depth - 1:
+            self.rows.append(self._stack.pop())
+    dispatch["array"] = end_array
+
+
+def iter_rows(chunks, depth=2, use_datetime=False):
+    """Parse an XML-RPC response incrementally, yielding rows as they close
+
+    @param chunks: iterable of response body chunks
+    (see L{SCGITransport.stream_request})
+
+    @param depth: nesting level of the row arrays, 2 for a method that
+    returns a list of lists (d.multicall, f.multicall, etc.)
+    @type depth: int
+
+    @raise xmlrpclib.Fault: if rTorrent returned a fault, after any rows
+    that were received
+    """
+    u = RowUnmarshaller(use_datetime, depth)
+    p = xmlrpclib.ExpatParser(u)
+
+    for data in chunks:
+        p.feed(data)
+        while u.rows:
+            yield u.rows.popleft()
+
+    p.close()
+    while u.rows:
+        yield u.rows.popleft()
+
+    # raises Fault, or ResponseError on a truncated response
+    u.close()
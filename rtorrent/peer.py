@@ -24,6 +24,8 @@ import rtorrent.rpc
 from rtorrent.common import safe_repr
 
 Method = rtorrent.rpc.Method
+IMMUTABLE = rtorrent.rpc.IMMUTABLE
+SLOW = rtorrent.rpc.SLOW
 
 
 class Peer:
@@ -36,6 +38,7 @@ class Peer:
 
         self.rpc_id = "{0}:p{1}".format(
             self.info_hash, self.id)  # : unique id to pass to rTorrent
+        self.dirty_fields = set()  # : fields a modifier might not have set
 
     def __repr__(self):
         return safe_repr("Peer(id={0})", self.id)
@@ -59,40 +62,64 @@ methods = [
     # RETRIEVERS
     Method(Peer, 'is_preferred', 'p.is_preferred',
            boolean=True,
+           volatility=SLOW,
            ),
     Method(Peer, 'get_down_rate', 'p.get_down_rate'),
     Method(Peer, 'is_unwanted', 'p.is_unwanted',
            boolean=True,
+           volatility=SLOW,
            ),
     Method(Peer, 'get_peer_total', 'p.get_peer_total'),
     Method(Peer, 'get_peer_rate', 'p.get_peer_rate'),
-    Method(Peer, 'get_port', 'p.get_port'),
+    Method(Peer, 'get_port', 'p.get_port',
+           volatility=IMMUTABLE,
+           ),
     Method(Peer, 'is_snubbed', 'p.is_snubbed',
            boolean=True,
            ),
-    Method(Peer, 'get_id_html', 'p.get_id_html'),
+    Method(Peer, 'get_id_html', 'p.get_id_html',
+           volatility=IMMUTABLE,
+           ),
     Method(Peer, 'get_up_rate', 'p.get_up_rate'),
     Method(Peer, 'is_banned', 'p.banned',
            boolean=True,
+           volatility=SLOW,
            ),
     Method(Peer, 'get_completed_percent', 'p.get_completed_percent'),
     Method(Peer, 'completed_percent', 'p.completed_percent'),
-    Method(Peer, 'get_id', 'p.get_id'),
+    Method(Peer, 'get_id', 'p.get_id',
+           volatility=IMMUTABLE,
+           ),
     Method(Peer, 'is_obfuscated', 'p.is_obfuscated',
            boolean=True,
+           volatility=IMMUTABLE,
            ),
     Method(Peer, 'get_down_total', 'p.get_down_total'),
-    Method(Peer, 'get_client_version', 'p.get_client_version'),
-    Method(Peer, 'get_address', 'p.get_address'),
+    Method(Peer, 'get_client_version', 'p.get_client_version',
+           volatility=IMMUTABLE,
+           ),
+    Method(Peer, 'get_address', 'p.get_address',
+           volatility=IMMUTABLE,
+           ),
     Method(Peer, 'is_incoming', 'p.is_incoming',
            boolean=True,
+           volatility=IMMUTABLE,
            ),
     Method(Peer, 'is_encrypted', 'p.is_encrypted',
            boolean=True,
+           volatility=IMMUTABLE,
+           ),
+    Method(Peer, 'get_options_str', 'p.get_options_str',
+           volatility=SLOW,
+           ),
+    Method(Peer, 'get_client_version', 'p.client_version',
+           volatility=IMMUTABLE,
            ),
-    Method(Peer, 'get_options_str', 'p.get_options_str'),
-    Method(Peer, 'get_client_version', 'p.client_version'),
     Method(Peer, 'get_up_total', 'p.get_up_total'),
 
     # MODIFIERS
 ]
+
+Peer = rtorrent.rpc._add_slots(Peer, methods,
+                               extra=("_rt_obj", "info_hash", "rpc_id",
+                                      "dirty_fields"))
@@ -0,0 +1,101 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+import time
+
+from rtorrent.common import safe_repr
+
+
+class Poller:
+    """Polls a view of an rTorrent instance in a background thread
+
+    Each poll takes a snapshot of the view like L{RTorrent.poll_events},
+    which replaces the poller's previous snapshot (see
+    L{RTorrent.get_snapshot}) and passes the changes to the callbacks
+    registered with L{RTorrent.subscribe}. The poller has its own previous
+    snapshot, calling L{RTorrent.poll_events} doesn't change what it
+    reports. Started with L{RTorrent.start_poller}.
+    """
+
+    def __init__(self, _rt_obj, interval, view="main", fields=None,
+                 thresholds=None):
+        """
+        @param interval: seconds between the start of two polls
+        @type interval: float
+
+        @param fields: see L{RTorrent.poll_events}
+        @type fields: list
+
+        @param thresholds: see L{rtorrent.events.diff}
+        @type thresholds: dict
+        """
+        assert interval > 0, "interval must be positive"
+
+        self._rt_obj = _rt_obj
+        self.interval = interval
+        self.view = view
+        self.fields = fields
+        self.thresholds = thresholds
+        self.polls = 0  # : number of successful polls
+        self.error = None  # : exception raised by the last poll, if it failed
+        self.ready = threading.Event()  # : set once there's a snapshot
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run,
+                                        name="rtorrent-poller-" + view)
+        self._thread.daemon = True
+
+    def __repr__(self):
+        return safe_repr("Poller(view=\"{0}\", interval={1}, polls={2})",
+                         self.view, self.interval, self.polls)
+
+    def start(self):
+        self._thread.start()
+
+    def is_alive(self):
+        return(self._thread.is_alive())
+
+    def stop(self, timeout=None):
+        """Stop polling, and wait for the poll in progress (if any) to finish
+
+        @param timeout: max seconds to wait (default: no limit)
+        @type timeout: float
+        """
+        self._stopped.set()
+        if self._thread.is_alive() and \
+                self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.time()
+            try:
+                self._rt_obj._poll_events(self, self.view, self.fields,
+                                          self.thresholds)
+            except Exception as e:
+                # keep polling, the connection might come back
+                self.error = e
+            else:
+                self.error = None
+                self.polls += 1
+                self.ready.set()
+
+            self._stopped.wait(max(self.interval - (time.time() - started),
+                                   0))
@@ -21,6 +21,9 @@
 import inspect
 import rtorrent
 import re
+import threading
+import time
+from collections import OrderedDict
 from rtorrent.common import bool_to_int, convert_version_tuple_to_str,\
     safe_repr
 from rtorrent.err import MethodError
@@ -53,6 +56,12 @@ def _handle_unavailable_rpc_method(method, rt_obj):
     raise MethodError(msg)
 
 
+# how often the result of a retriever can change (see Method.volatility)
+IMMUTABLE = "immutable"  # : never changes (ex. a torrent's size)
+SLOW = "slow"  # : settings, only changes when set (ex. a torrent's priority)
+VOLATILE = "volatile"  # : can change at any time (ex. rates, totals)
+
+
 class DummyClass:
     def __init__(self):
         pass
@@ -76,6 +85,10 @@ class Method:
             "post_process_func", None)  # : custom post process function
         self.aliases = kwargs.get(
             "aliases", [])  # : aliases for method (optional)
+        self.volatility = kwargs.get(
+            "volatility", VOLATILE)  # : IMMUTABLE, SLOW or VOLATILE
+        self.ttl = kwargs.get(
+            "ttl", None)  # : seconds a L{CallCache} keeps the result for (default: by volatility)
         self.required_args = []
             #: Arguments required when calling the method (not utilized)
 
@@ -107,21 +120,286 @@ class Method:
         else:
             return(False)
 
+    def is_immutable(self):
+        """Check if the result of this retriever never changes"""
+        return(self.volatility == IMMUTABLE)
+
     def is_available(self, rt_obj):
-        if rt_obj._get_client_version_tuple() < self.min_version or \
-                self.rpc_call not in rt_obj._get_rpc_methods():
-            return(False)
+        return(rt_obj._get_capabilities().is_available(self))
+
+
+class CapabilityIndex:
+    """Tells which L{Method} instances an rTorrent instance supports
+
+    Built once from the results of system.listMethods and
+    system.client_version (see L{RTorrent._get_capabilities}), so checking
+    availability doesn't require any connections.
+    """
+
+    def __init__(self, rpc_methods, client_version):
+        self.rpc_methods = frozenset(rpc_methods)  # : names of all RPC methods
+        self.client_version = tuple(client_version)
+        self._available = {}  # : Method -> bool, for all registered methods
+
+        for method_list in rtorrent._all_methods_list:
+            for m in method_list:
+                self._available[m] = self._check(m)
+
+    def _check(self, method):
+        return(self.client_version >= method.min_version and
+               method.rpc_call in self.rpc_methods)
+
+    def is_available(self, method):
+        """Check if C{B{method}} is supported
+
+        @param method: L{Method} instance
+        @type method: Method
+
+        @rtype: bool
+        """
+        available = self._available.get(method)
+        if available is None:
+            # not in a method list (ex. Group methods, raw rpc calls)
+            available = self._check(method)
+
+        return(available)
+
+
+def _is_modifier(method):
+    """Check if C{B{method}} sets a field, including raw RPC calls that
+    don't have a L{Method} (ex. "d.set_directory")"""
+    if method._class is DummyClass:
+        return(re.match(r"([ptdf]\.)?set_", method.rpc_call) is not None)
+
+    return(method.is_modifier())
+
+
+def _get_field(method):
+    """Get the (RPC call prefix, varname) of the field C{B{method}} gets or
+    sets, ex. ("d.", "directory") for d.get_directory and d.set_directory"""
+    prefix = re.match(r"([ptdf]\.|system\.)?", method.rpc_call).group(0)
+    return((prefix, method.varname))
+
+
+_field_retrievers = None  # : (call prefix, varname) -> retrievers
+
+
+def _get_retrievers(method):
+    """Get the registered retrievers of the field C{B{method}} gets or sets
+
+    @return: L{Method} instances
+    @rtype: list
+    """
+    global _field_retrievers
+    if _field_retrievers is None:
+        retrievers = {}
+        for method_list in rtorrent._all_methods_list:
+            for m in method_list:
+                if m.is_retriever():
+                    retrievers.setdefault(_get_field(m), []).append(m)
+
+        _field_retrievers = retrievers
+
+    return(_field_retrievers.get(_get_field(method), []))
+
+
+# time.monotonic() isn't available before Python 3.3
+_monotonic = getattr(time, "monotonic", time.time)
+
+
+class CallCache:
+    """Read-through cache for the results of retrievers
+
+    Results are keyed by server, RPC call and arguments, and kept for the
+    TTL of their L{Method} (Method.ttl, or the TTL of its volatility). The
+    least recently used results are dropped once there are max_size of
+    them.
+
+    A successful modifier call drops the cached results of the retrievers
+    for the same field of the same target (ex. d.set_directory drops
+    d.get_directory for that info hash). Erasing a torrent, or loading it
+    with L{RTorrent.load_torrent} or L{RTorrent.load_torrents}, drops all
+    the cached results of that torrent.
+
+    @note: pass an instance to L{RTorrent} to enable caching, ex.
+    C{RTorrent(uri, cache=CallCache())}. An instance can be shared by
+    clients of different servers
+
+    @note: if a torrent is erased by another client, or loaded with
+    L{RTorrent.load_torrent_simple}, call L{evict} for it
+    """
+
+    #: volatility -> seconds (None: never expires, 0: not cached)
+    default_ttls = {IMMUTABLE: None, SLOW: 30, VOLATILE: 0}
+
+    def __init__(self, max_size=1024, ttls=None):
+        """
+        @param max_size: max number of cached results
+        @type max_size: int
+
+        @param ttls: volatility -> seconds, overrides L{default_ttls}
+        @type ttls: dict
+        """
+        assert max_size > 0, "max_size must be positive"
+        self.max_size = max_size
+        self.ttls = dict(self.default_ttls)
+        self.ttls.update(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        # (server, rpc_call, args) -> (expires, result)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_ttl(self, method):
+        """Get the number of seconds the result of C{B{method}} is kept
+
+        @return: seconds, None if it never expires, 0 if it isn't cached
+        """
+        if not method.is_retriever() or method._class is DummyClass:
+            return(0)
+        if method.ttl is not None:
+            return(method.ttl)
+
+        return(self.ttls.get(method.volatility, 0))
+
+    def get(self, method, args, server=None):
+        """Look up the cached result of a call
+
+        @param server: identifies the rTorrent instance the call is made on
+        (ex. its URI)
+
+        @return: (True, result) if the result is cached, (False, None)
+        otherwise
+        @rtype: tuple
+        """
+        if self.get_ttl(method) == 0:
+            return((False, None))
+
+        key = (server, method.rpc_call, args)
+        with self._lock:
+            try:
+                expires, result = self._entries.pop(key)
+            except (KeyError, TypeError):  # TypeError: unhashable args
+                self.misses += 1
+                return((False, None))
+
+            if expires is not None and expires <= _monotonic():
+                self.misses += 1
+                return((False, None))
+
+            # reinsert, the most recently used results are last
+            self._entries[key] = (expires, result)
+            self.hits += 1
+
+        if isinstance(result, list):
+            result = list(result)
+        return((True, result))
+
+    def update(self, method, args, result, server=None):
+        """Cache the result of a retriever call, or invalidate the results
+        a modifier call changed
+
+        @param result: raw result of the call, xmlrpclib.Fault instances
+        are ignored
+
+        @param server: see L{get}
+        """
+        if isinstance(result, xmlrpclib.Fault):
+            return
+
+        if method.rpc_call == "d.erase":
+            self.evict(args[0], server)
+            return
+
+        if _is_modifier(method):
+            self.invalidate(method, args, server)
+            return
+
+        ttl = self.get_ttl(method)
+        if ttl == 0:
+            return
+
+        key = (server, method.rpc_call, args)
+        expires = None if ttl is None else _monotonic() + ttl
+        with self._lock:
+            try:
+                self._entries.pop(key, None)
+                self._entries[key] = (expires, result)
+            except TypeError:
+                return
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, modifier, args, server=None):
+        """Drop the cached results C{B{modifier}} called with C{B{args}}
+        changed
+
+        @param args: the modifier's arguments, the last one is the new value
+        and the others identify the target (ex. an info hash)
+
+        @param server: see L{get}
+        """
+        target = tuple(args[:-1])
+        with self._lock:
+            for m in _get_retrievers(modifier):
+                try:
+                    self._entries.pop((server, m.rpc_call, target), None)
+                except TypeError:
+                    pass
+
+    def evict(self, info_hash, server=None):
+        """Drop the cached results of the calls on a torrent, and on its
+        peers, trackers and files
+
+        @param server: see L{get}
+        """
+        with self._lock:
+            for key in list(self._entries):
+                args = key[2]
+                if key[0] == server and args and \
+                        hasattr(args[0], "split") and \
+                        args[0].split(":")[0] == info_hash:
+                    del self._entries[key]
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return(len(self._entries))
+
+
+def _get_method(method):
+    """Get the L{Method} instance for C{B{method}}
+
+    @param method: L{Method} instance or name of raw RPC method
+    @type method: Method or str
+    """
+    # if a raw rpc method was given instead of a Method instance,
+    # try and find the instance for it. And if all else fails, create a
+    # dummy Method instance
+    if isinstance(method, str):
+        result = find_method(method)
+        # if result not found
+        if result == -1:
+            method = Method(DummyClass, method, method)
         else:
-            return(True)
+            method = result
+
+    return(method)
+
+
+def _get_rt_obj(class_obj):
+    """Get the L{RTorrent} instance a Peer/File/Torrent/etc. belongs to"""
+    return(getattr(class_obj, "_rt_obj", class_obj))
 
 
 class Multicall:
     def __init__(self, class_obj, **kwargs):
         self.class_obj = class_obj
-        if class_obj.__class__.__name__ == "RTorrent":
-            self.rt_obj = class_obj
-        else:
-            self.rt_obj = class_obj._rt_obj
+        self.rt_obj = _get_rt_obj(class_obj)
         self.calls = []
 
     def add(self, method, *args):
@@ -132,16 +410,7 @@ class Multicall:
 
         @param args: call arguments
         """
-        # if a raw rpc method was given instead of a Method instance,
-        # try and find the instance for it. And if all else fails, create a
-        # dummy Method instance
-        if isinstance(method, str):
-            result = find_method(method)
-            # if result not found
-            if result == -1:
-                method = Method(DummyClass, method, method)
-            else:
-                method = result
+        method = _get_method(method)
 
         # ensure method is available before adding
         if not method.is_available(self.rt_obj):
@@ -158,28 +427,177 @@ class Multicall:
 
         @return: the results (post-processed), in the order they were added
         @rtype: tuple
+
+        @raise xmlrpclib.Fault: if any of the calls failed
+        """
+        results = self._send()
+        _raise_faults(results)
+
+        return(self._process_results(results))
+
+    def _send(self):
+        """Send the added calls in a single system.multicall request
+
+        Calls whose results are in the cache of rt_obj aren't sent, see
+        L{CallCache}.
+
+        @return: the raw results, in the order the calls were added, with a
+        xmlrpclib.Fault instance in place of each call that failed
+        @rtype: tuple
         """
+        pending, results = self._get_cached()
+        if not pending:
+            return(tuple(results))
+
         m = xmlrpclib.MultiCall(self.rt_obj._get_conn())
-        for call in self.calls:
-            method, args = call
+        for i in pending:
+            method, args = self.calls[i]
             rpc_call = getattr(method, "rpc_call")
             getattr(m, rpc_call)(*args)
 
-        results = m()
-        results = tuple(results)
+        self._set_results(pending, results,
+                          _unpack_multicall_results(m().results))
+
+        return(tuple(results))
+
+    def _get_cached(self):
+        """Look up the added calls in the L{CallCache} of rt_obj (if any)
+
+        @return: indexes of the calls that have to be sent, and the list of
+        results with the cached results filled in
+        @rtype: tuple
+        """
+        results = [None] * len(self.calls)
+        cache = getattr(self.rt_obj, "_cache", None)
+        if cache is None:
+            return(list(range(len(self.calls))), results)
+
+        pending = []
+        modified = False
+        for i, (method, args) in enumerate(self.calls):
+            # results retrieved after a modifier might have been changed by it
+            if _is_modifier(method):
+                modified = True
+            elif not modified:
+                cached, result = cache.get(method, args, self.rt_obj.uri)
+                if cached:
+                    results[i] = result
+                    continue
+
+            pending.append(i)
+
+        return(pending, results)
+
+    def _set_results(self, pending, results, sent_results):
+        """Fill in the results of the sent calls and update the cache
+
+        @param pending: indexes of the sent calls, see L{_get_cached}
+        @type pending: list
+        """
+        cache = getattr(self.rt_obj, "_cache", None)
+        for i, r in zip(pending, sent_results):
+            results[i] = r
+            if cache is not None:
+                method, args = self.calls[i]
+                cache.update(method, args, r, self.rt_obj.uri)
+
+    def _process_results(self, results):
+        """Post-process the results of the calls and assign them to class_obj
+
+        @param results: raw results, in the order the calls were added
+        @type results: tuple
+        """
         results_processed = []
 
         for r, c in zip(results, self.calls):
-            method = c[0]  # Method instance
+            method, args = c  # Method instance, call arguments
             result = process_result(method, r)
             results_processed.append(result)
-            # assign result to class_obj
-            exists = hasattr(self.class_obj, method.varname)
-            if not exists or not inspect.ismethod(getattr(self.class_obj, method.varname)):
-                setattr(self.class_obj, method.varname, result)
+            if _is_modifier(method):
+                self._write_through(method, args, r)
+            else:
+                # assign result to class_obj
+                self._assign(method.varname, result)
 
         return(tuple(results_processed))
 
+    def _assign(self, varname, value):
+        exists = hasattr(self.class_obj, varname)
+        if not exists or not inspect.ismethod(getattr(self.class_obj, varname)):
+            try:
+                setattr(self.class_obj, varname, value)
+            except AttributeError:
+                # no slot for it, ex. the result of a raw call like
+                # p.multicall on a Torrent, see _add_slots()
+                return
+            dirty_fields = getattr(self.class_obj, "dirty_fields", None)
+            if dirty_fields:
+                dirty_fields.discard(varname)
+
+    def _write_through(self, method, args, result):
+        """Assign the value a modifier set to class_obj, so it doesn't have to
+        be retrieved again
+
+        rTorrent returns 0 when a value is set. If it returns anything else,
+        the field is added to class_obj.dirty_fields instead (retrieving
+        the field again removes it).
+
+        @param args: the modifier's arguments, the value is the last one
+        @type args: tuple
+        """
+        # only the modifiers of class_obj's own fields (ex. not the
+        # d.set_* calls of RTorrent.bulk())
+        rpc_id = getattr(self.class_obj, "rpc_id", None)
+        if rpc_id is None:
+            is_own_field = len(args) == 1 and \
+                _get_field(method)[0] in ("", "system.")
+        else:
+            is_own_field = len(args) == 2 and args[0] == rpc_id
+
+        if not is_own_field:
+            return
+
+        if result != 0:
+            dirty_fields = getattr(self.class_obj, "dirty_fields", None)
+            if dirty_fields is None:
+                dirty_fields = set()
+                setattr(self.class_obj, "dirty_fields", dirty_fields)
+
+            dirty_fields.add(method.varname)
+            return
+
+        # convert the value like a retrieved one (ex. 1 to True)
+        value = args[-1]
+        retrievers = _get_retrievers(method)
+        if retrievers:
+            value = process_result(retrievers[0], value)
+
+        self._assign(method.varname, value)
+
+
+def _unpack_multicall_results(results):
+    """Unpack the raw results of system.multicall
+
+    @return: the result of each call, or a xmlrpclib.Fault instance
+    @rtype: tuple
+    """
+    unpacked = []
+    for r in results:
+        if isinstance(r, dict):
+            unpacked.append(xmlrpclib.Fault(r["faultCode"], r["faultString"]))
+        elif isinstance(r, list):
+            unpacked.append(r[0])
+        else:
+            raise ValueError("unexpected type in multicall result")
+
+    return(tuple(unpacked))
+
+
+def _raise_faults(results):
+    for r in results:
+        if isinstance(r, xmlrpclib.Fault):
+            raise r
+
 
 def call_method(class_obj, method, *args):
     """Handles single RPC calls
@@ -195,10 +613,7 @@ def call_method(class_obj, method, *args):
     else:
         assert args[-1] is not None, "No argument given."
 
-    if class_obj.__class__.__name__ == "RTorrent":
-        rt_obj = class_obj
-    else:
-        rt_obj = class_obj._rt_obj
+    rt_obj = _get_rt_obj(class_obj)
 
     # check if rpc method is even available
     if not method.is_available(rt_obj):
@@ -222,6 +637,61 @@ def call_method(class_obj, method, *args):
     return(ret_value)
 
 
+def get_retriever_methods(method_list, rt_obj, fields=None, required=()):
+    """Get the available retrievers from C{B{method_list}}
+
+    @param method_list: methods to choose from (ex. rtorrent.torrent.methods)
+    @type method_list: list
+
+    @param rt_obj: L{RTorrent} instance
+    @type rt_obj: RTorrent
+
+    @param fields: only return the retrievers for these fields, given as
+    varnames or L{Method} instances. If None, every available retriever is
+    returned
+    @type fields: list
+
+    @param required: varnames that are always included when C{B{fields}}
+    is given (ex. the fields needed to build an rpc_id)
+    @type required: tuple
+
+    @return: L{Method} instances
+    @rtype: list
+
+    @raise AssertionError: if a field doesn't match any retriever
+    @raise MethodError: if a requested field isn't supported by rTorrent
+    """
+    if fields is None:
+        return([m for m in method_list
+                if m.is_retriever() and m.is_available(rt_obj)])
+
+    retrievers = {}  # : varname -> retrievers, in method_list's order
+    for m in method_list:
+        if m.is_retriever():
+            retrievers.setdefault(m.varname, []).append(m)
+
+    retriever_methods = []
+    for field in list(required) + list(fields):
+        if isinstance(field, Method):
+            method = field
+        else:
+            # the first alias rTorrent supports, like when fields is None
+            methods = retrievers.get(field, [])
+            available = [m for m in methods if m.is_available(rt_obj)]
+            method = (available + methods + [None])[0]
+
+        assert method is not None and method.is_retriever(), \
+            "Invalid field: {0}".format(field)
+
+        if not method.is_available(rt_obj):
+            _handle_unavailable_rpc_method(method, rt_obj)
+
+        if method not in retriever_methods:
+            retriever_methods.append(method)
+
+    return(retriever_methods)
+
+
 def find_method(rpc_call):
     """Return L{Method} instance associated with given RPC call"""
     method_lists = [
@@ -266,6 +736,104 @@ def process_result(method, result):
     return(result)
 
 
+class _Field(object):
+    """A field stored in a slot of another name, because its varname isn't
+    an identifier (ex. timestamp.started) or is also the name of a method
+    (ex. Peer.completed_percent), see L{_add_slots}
+
+    Until the field is set, the method is returned instead, like an instance
+    attribute shadowing a method.
+    """
+
+    __slots__ = ("slot", "method")
+
+    def __init__(self, slot, method=None):
+        self.slot = slot  # : member descriptor of the slot
+        self.method = method
+
+    def __get__(self, obj, class_=None):
+        if obj is None:
+            return(self if self.method is None else self.method)
+
+        try:
+            return(self.slot.__get__(obj, class_))
+        except AttributeError:
+            if self.method is None:
+                raise
+            return(self.method.__get__(obj, class_))
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        self.slot.__delete__(obj)
+
+
+def _set_method(class_, name, method):
+    """setattr(class_, name, method), but a L{_Field} of the same name keeps
+    its slot"""
+    for c in class_.__mro__:
+        if name in c.__dict__:
+            if isinstance(c.__dict__[name], _Field):
+                method = _Field(c.__dict__[name].slot, method)
+            break
+
+    setattr(class_, name, method)
+
+
+def _add_slots(class_, method_list, extra=()):
+    """Recreate C{B{class_}} with a slot for each of its fields
+
+    An instance dict with dozens of attributes costs more than a kilobyte,
+    a slot costs one pointer. The slots are named after the varnames of the
+    methods in C{B{method_list}} and C{B{extra}}, instances have no
+    __dict__.
+
+    @param extra: names of other attributes set on instances
+    @type extra: tuple
+
+    @return: the new class, which replaces C{B{class_}} in the L{Method}
+    instances of C{B{method_list}}
+    @rtype: class
+    """
+    # names that are (or will be, see _build_rpc_methods) class attributes,
+    # or aren't identifiers, get a slot named after them and a _Field
+    reserved = set([m.method_name for m in method_list])
+    for m in method_list:
+        reserved.update(m.aliases)
+
+    slots = []
+    fields = {}  # : varname -> slot name
+    for name in list(extra) + [m.varname for m in method_list
+                               if m.class_name == class_.__name__]:
+        if name in slots or name in fields:
+            continue
+        if name not in reserved and not hasattr(class_, name) and \
+                re.match(r"^[a-z_]\w*$", name, re.I):
+            slots.append(name)
+        else:
+            fields[name] = "_" + re.sub(r"\W", "_", name)
+
+    namespace = dict(class_.__dict__)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(slots) + tuple(fields.values()) + \
+        ("__weakref__",)
+
+    new_class = type(class_.__name__, class_.__bases__ or (object,),
+                     namespace)
+
+    for name, slot in fields.items():
+        setattr(new_class, name, _Field(new_class.__dict__[slot],
+                                        namespace.get(name)))
+
+    for m in method_list:
+        if m._class is class_:
+            m._class = new_class
+
+    return(new_class)
+
+
 def _build_rpc_methods(class_, method_list):
     """Build glorified aliases to raw RPC methods"""
     instance = None
@@ -314,6 +882,6 @@ def _build_rpc_methods(class_, method_list):
 
         for method_name in [m.method_name] + list(m.aliases):
             if instance is None:
-                setattr(class_, method_name, caller)
+                _set_method(class_, method_name, caller)
             else:
                 setattr(instance, method_name, caller)
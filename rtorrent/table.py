@@ -0,0 +1,358 @@
+# Copyright (c) 2013 Chris Lucas, <chris@chrisjlucas.com>
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import array
+import operator
+
+from rtorrent.common import safe_repr
+from rtorrent.compat import is_py3
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if is_py3():
+    _INT_TYPES = (int,)
+else:
+    _INT_TYPES = (int, long)  # @UndefinedVariable
+
+try:
+    array.array("q")
+    _INT_TYPECODE = "q"
+except ValueError:  # no long long support (Python 2)
+    _INT_TYPECODE = "l"
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _get_column_type(values):
+    """Get the type shared by all C{B{values}}
+
+    @return: bool, int, float, or None if the values can't be stored in
+    a typed array
+    """
+    types = set([type(v) for v in values])
+    if types and types == set([bool]):
+        return(bool)
+    if types <= set(_INT_TYPES):
+        return(int)
+    if types <= set(_INT_TYPES + (float,)):
+        return(float)
+
+    return(None)
+
+
+def _make_column(values, use_numpy):
+    """Store C{B{values}} in a numpy array, a typed array.array, or in a
+    list if the values aren't numbers"""
+    column_type = _get_column_type(values)
+    if column_type is None:
+        try:
+            values = _share_equal_values(values)
+        except TypeError:  # unhashable (ex. lists)
+            pass
+
+    if use_numpy:
+        if column_type is None:
+            # assign instead of passing values to numpy.array(), so lists
+            # aren't turned into extra dimensions
+            column = numpy.empty(len(values), dtype=object)
+            column[:] = values
+            return(column)
+
+        return(numpy.array(values, dtype={bool: numpy.bool_,
+                                          int: numpy.int64,
+                                          float: numpy.float64}[column_type]))
+
+    if column_type is bool:
+        return(array.array("b", values))
+    elif column_type is int:
+        return(array.array(_INT_TYPECODE, values))
+    elif column_type is float:
+        return(array.array("d", values))
+    else:
+        return(list(values))
+
+
+def _share_equal_values(values):
+    """Replace equal values with the same object, so a column with few
+    distinct strings (ex. directory, message) holds only one copy of each"""
+    shared = {}
+    return([shared.setdefault(v, v) for v in values])
+
+
+def _factorize(column):
+    """Get the distinct values of a numpy column, and the index of each
+    row's value among them
+
+    @return: (values, indices)
+    @rtype: tuple
+    """
+    if column.dtype == object:
+        # hashing is much faster than numpy.unique()'s sort for objects
+        codes = {}
+        indices = numpy.fromiter([codes.setdefault(v, len(codes))
+                                  for v in column],
+                                 dtype=numpy.intp, count=len(column))
+        return(list(codes.keys()), indices)
+
+    values, indices = numpy.unique(column, return_inverse=True)
+    return(values.tolist(), indices.reshape(-1))
+
+
+def _take(column, indices):
+    """Get the values of C{B{column}} at C{B{indices}}, as the same type
+    of column"""
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return(column[numpy.asarray(indices, dtype=numpy.intp)])
+
+    values = [column[i] for i in indices]
+    if isinstance(column, array.array):
+        return(array.array(column.typecode, values))
+
+    return(values)
+
+
+class TorrentTable:
+    """Snapshot of torrent fields, stored column by column
+
+    Each field is one column: a numpy array if numpy is installed, or
+    otherwise an array.array for numbers and a list for anything else.
+    This is much smaller than a L{Torrent} instance per torrent, and
+    filtering, sorting and aggregating runs over whole columns.
+
+    ex. C{rt.get_torrent_table(fields=["directory", "up_rate"]).sum(
+    "up_rate", by="directory")}
+
+    @note: see L{RTorrent.get_torrent_table}
+    """
+
+    def __init__(self, columns, use_numpy=None):
+        """
+        @param columns: list of (field, values) tuples, the first one being
+        the info hashes
+        @type columns: list
+
+        @param use_numpy: store the columns in numpy arrays (default: if
+        numpy is installed)
+        @type use_numpy: bool
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        assert not use_numpy or numpy is not None, "numpy isn't installed"
+
+        self.use_numpy = use_numpy
+        self.fields = [field for field, values in columns]  # : column names
+        self._columns = dict([(field, _make_column(values, use_numpy))
+                              for field, values in columns])
+        self._index = None  # : info hash -> row, built on first use
+
+    def _new(self, columns):
+        """Create a table from existing columns"""
+        table = TorrentTable([], self.use_numpy)
+        table.fields = list(self.fields)
+        table._columns = columns
+        return(table)
+
+    def __len__(self):
+        return(len(self._columns[self.fields[0]]) if self.fields else 0)
+
+    def __contains__(self, field):
+        return(field in self._columns)
+
+    def __getitem__(self, field):
+        """Get the column of C{B{field}}"""
+        return(self._columns[field])
+
+    def __repr__(self):
+        return safe_repr("TorrentTable(rows={0}, fields={1})",
+                         len(self), self.fields)
+
+    def row(self, i):
+        """Get the fields of the C{B{i}}th torrent
+
+        @rtype: dict
+        """
+        return(dict([(field, self._columns[field][i])
+                     for field in self.fields]))
+
+    def rows(self):
+        """Iterate over the rows, as dicts (see L{row})"""
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def get_index(self):
+        """Get the row number of each info hash
+
+        @rtype: dict
+        """
+        if self._index is None:
+            self._index = dict([(h, i) for i, h in
+                                enumerate(self._columns[self.fields[0]])])
+
+        return(self._index)
+
+    def find(self, info_hash):
+        """Get the row of the torrent with the given info hash
+
+        @rtype: dict or None
+        """
+        i = self.get_index().get(info_hash)
+        if i is None:
+            return(None)
+        return(self.row(i))
+
+    def select(self, mask):
+        """Get the rows where C{B{mask}} is true
+
+        @param mask: one bool per row (ex. a numpy expression over columns)
+
+        @rtype: L{TorrentTable}
+        """
+        if self.use_numpy:
+            indices = numpy.flatnonzero(numpy.asarray(mask, dtype=bool))
+        else:
+            indices = [i for i, m in enumerate(mask) if m]
+
+        return(self._take(indices))
+
+    def _take(self, indices):
+        return(self._new(dict([(field, _take(column, indices))
+                               for field, column in self._columns.items()])))
+
+    def filter(self, field, op, value):
+        """Get the rows where C{field op value} is true
+
+        ex. C{table.filter("down_rate", ">", 0)}
+
+        @param op: one of ==, !=, <, <=, >, >=, in
+        @type op: str
+
+        @rtype: L{TorrentTable}
+        """
+        column = self._columns[field]
+
+        if op == "in":
+            value = list(value)
+            if self.use_numpy:
+                mask = numpy.isin(column, value)
+            else:
+                mask = [v in value for v in column]
+        else:
+            assert op in _OPERATORS, "Invalid operator: {0}".format(op)
+            func = _OPERATORS[op]
+            if self.use_numpy:
+                mask = func(column, value)
+            else:
+                mask = [func(v, value) for v in column]
+
+        return(self.select(mask))
+
+    def sort(self, field, reverse=False):
+        """Sort the rows by C{B{field}} (stable)
+
+        @rtype: L{TorrentTable}
+        """
+        column = self._columns[field]
+
+        if self.use_numpy:
+            if reverse:
+                # sort the reversed column and map the indices back, so
+                # equal values keep their order
+                indices = numpy.argsort(column[::-1], kind="stable")[::-1]
+                indices = len(column) - 1 - indices
+            else:
+                indices = numpy.argsort(column, kind="stable")
+        else:
+            indices = sorted(range(len(column)), key=column.__getitem__,
+                             reverse=reverse)
+
+        return(self._take(indices))
+
+    def _group_indices(self, field):
+        """Get the distinct values of C{B{field}} and the rows of each one
+
+        @return: (values, row indices of each value)
+        @rtype: tuple
+        """
+        column = self._columns[field]
+
+        if self.use_numpy:
+            values, inverse = _factorize(column)
+            order = numpy.argsort(inverse, kind="stable")
+            bounds = numpy.cumsum(numpy.bincount(inverse,
+                                                 minlength=len(values)))
+            return(values, numpy.split(order, bounds[:-1]))
+
+        groups = {}
+        for i, v in enumerate(column):
+            groups.setdefault(v, []).append(i)
+
+        return(list(groups.keys()), list(groups.values()))
+
+    def group_by(self, field):
+        """Split the rows by the value of C{B{field}}
+
+        @return: value -> L{TorrentTable}
+        @rtype: dict
+        """
+        values, groups = self._group_indices(field)
+        return(dict([(v, self._take(indices))
+                     for v, indices in zip(values, groups)]))
+
+    def sum(self, field, by=None):
+        """Sum the values of C{B{field}}
+
+        @param by: sum separately for each value of this field
+        @type by: str
+
+        @return: the sum, or a dict of value of C{B{by}} -> sum
+        """
+        column = self._columns[field]
+
+        if by is None:
+            if self.use_numpy:
+                return(column.sum().item())
+            return(sum(column))
+
+        if self.use_numpy:
+            values, inverse = _factorize(self._columns[by])
+            if column.dtype.kind == "f":
+                sums = numpy.bincount(inverse, weights=column,
+                                      minlength=len(values))
+            else:
+                sums = numpy.zeros(len(values), dtype=numpy.int64)
+                numpy.add.at(sums, inverse, column)
+
+            return(dict(zip(values, sums.tolist())))
+
+        sums = {}
+        for v, n in zip(self._columns[by], column):
+            sums[v] = sums.get(v, 0) + n
+
+        return(sums)
@@ -25,17 +25,24 @@ import rtorrent.tracker
 import rtorrent.file
 import rtorrent.compat
 
+from rtorrent.bitfield import Bitfield
 from rtorrent.common import safe_repr
 
 Peer = rtorrent.peer.Peer
 Tracker = rtorrent.tracker.Tracker
 File = rtorrent.file.File
 Method = rtorrent.rpc.Method
+IMMUTABLE = rtorrent.rpc.IMMUTABLE
+SLOW = rtorrent.rpc.SLOW
 
 
 class Torrent:
     """Represents an individual torrent within a L{RTorrent} instance."""
 
+    _peer_class = Peer
+    _tracker_class = Tracker
+    _file_class = File
+
     def __init__(self, _rt_obj, info_hash, **kwargs):
         self._rt_obj = _rt_obj
         self.info_hash = info_hash  # : info hash for the torrent
@@ -46,30 +53,40 @@ class Torrent:
         self.peers = []
         self.trackers = []
         self.files = []
+        self._file_fields = frozenset()  # : immutable fields of self.files
+        self._file_lookup = None  # : see _get_file_lookup()
+        self.dirty_fields = set()  # : fields a modifier might not have set
 
         self._call_custom_methods()
 
     def __repr__(self):
         return safe_repr("Torrent(info_hash=\"{0}\" name=\"{1}\")",
-                        self.info_hash, self.name)
+                        self.info_hash, getattr(self, "name", None))
 
     def _call_custom_methods(self):
         """only calls methods that check instance variables."""
-        self._is_hash_checking_queued()
-        self._is_started()
-        self._is_paused()
-
-    def get_peers(self):
+        # the variables are missing if only some fields were retrieved
+        if hasattr(self, "hashing") and hasattr(self, "hash_checking"):
+            self._is_hash_checking_queued()
+        if hasattr(self, "state"):
+            self._is_started()
+            self._is_paused()
+
+    def get_peers(self, fields=None):
         """Get list of Peer instances for given torrent.
 
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field). Peer.id is
+        always retrieved.
+        @type fields: list
+
         @return: L{Peer} instances
         @rtype: list
 
         @note: also assigns return value to self.peers
         """
-        self.peers = []
-        retriever_methods = [m for m in rtorrent.peer.methods
-                             if m.is_retriever() and m.is_available(self._rt_obj)]
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.peer.methods, self._rt_obj, fields, required=("id",))
         # need to leave 2nd arg empty (dunno why)
         m = rtorrent.rpc.Multicall(self)
         m.add("p.multicall", self.info_hash, "",
@@ -77,28 +94,37 @@ class Torrent:
 
         results = m.call()[0]  # only sent one call, only need first result
 
+        return(self._build_peers(retriever_methods, results))
+
+    def _build_peers(self, retriever_methods, results):
+        """Create the L{Peer} instances from the results of p.multicall"""
+        self.peers = []
         for result in results:
             results_dict = {}
             # build results_dict
             for m, r in zip(retriever_methods, result):
                 results_dict[m.varname] = rtorrent.rpc.process_result(m, r)
 
-            self.peers.append(Peer(
+            self.peers.append(self._peer_class(
                 self._rt_obj, self.info_hash, **results_dict))
 
         return(self.peers)
 
-    def get_trackers(self):
+    def get_trackers(self, fields=None):
         """Get list of Tracker instances for given torrent.
 
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field). Tracker.group is
+        always retrieved.
+        @type fields: list
+
         @return: L{Tracker} instances
         @rtype: list
 
         @note: also assigns return value to self.trackers
         """
-        self.trackers = []
-        retriever_methods = [m for m in rtorrent.tracker.methods
-                             if m.is_retriever() and m.is_available(self._rt_obj)]
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.tracker.methods, self._rt_obj, fields, required=("group",))
 
         # need to leave 2nd arg empty (dunno why)
         m = rtorrent.rpc.Multicall(self)
@@ -107,58 +133,212 @@ class Torrent:
 
         results = m.call()[0]  # only sent one call, only need first result
 
+        return(self._build_trackers(retriever_methods, results))
+
+    def _build_trackers(self, retriever_methods, results):
+        """Create the L{Tracker} instances from the results of t.multicall"""
+        self.trackers = []
         for result in results:
             results_dict = {}
             # build results_dict
             for m, r in zip(retriever_methods, result):
                 results_dict[m.varname] = rtorrent.rpc.process_result(m, r)
 
-            self.trackers.append(Tracker(
+            self.trackers.append(self._tracker_class(
                 self._rt_obj, self.info_hash, **results_dict))
 
         return(self.trackers)
 
-    def get_files(self):
+    def get_files(self, fields=None):
         """Get list of File instances for given torrent.
 
+        @param fields: only retrieve these fields, given as varnames or
+        L{Method} instances (default: every available field). File.offset is
+        always retrieved.
+        @type fields: list
+
         @return: L{File} instances
         @rtype: list
 
         @note: also assigns return value to self.files
         """
+        retriever_methods = rtorrent.rpc.get_retriever_methods(
+            rtorrent.file.methods, self._rt_obj, fields, required=("offset",))
 
-        self.files = []
-        retriever_methods = [m for m in rtorrent.file.methods
-                             if m.is_retriever() and m.is_available(self._rt_obj)]
+        update_methods = self._get_file_update_methods(retriever_methods)
+        if update_methods is not None:
+            if not update_methods:
+                return(self.files)
+
+            results = self._get_file_results(update_methods)
+            if self._update_files(update_methods, results):
+                return(self.files)
+
+        results = self._get_file_results(retriever_methods)
+
+        return(self._build_files(retriever_methods, results))
+
+    def _get_file_update_methods(self, retriever_methods):
+        """Get the methods of C{B{retriever_methods}} that have to be called
+        to update self.files, or None if the files have to be built again
+
+        @note: the immutable fields of self.files don't need to be
+        retrieved again
+        """
+        cached_methods = [m for m in retriever_methods
+                          if m.is_immutable() and m.varname in self._file_fields]
+        if not (self.files and cached_methods):
+            return(None)
+
+        return([m for m in retriever_methods if m not in cached_methods])
+
+    def _update_files(self, update_methods, results):
+        """Set the results of f.multicall on self.files
+
+        @return: False if the file list changed (the files have to be built
+        again)
+        @rtype: bool
+        """
+        # f.multicall lists the files in the same order every time
+        if len(results) != len(self.files):
+            return(False)
+
+        for f, result in zip(self.files, results):
+            for m, r in zip(update_methods, result):
+                setattr(f, m.varname, rtorrent.rpc.process_result(m, r))
+
+        return(True)
+
+    def _get_file_results(self, retriever_methods):
         # 2nd arg can be anything, but it'll return all files in torrent
         # regardless
         m = rtorrent.rpc.Multicall(self)
         m.add("f.multicall", self.info_hash, "",
               *[method.rpc_call + "=" for method in retriever_methods])
 
-        results = m.call()[0]  # only sent one call, only need first result
+        return(m.call()[0])  # only sent one call, only need first result
 
+    def _build_files(self, retriever_methods, results):
+        """Create the L{File} instances from the results of f.multicall"""
+        self.files = []
+        self._file_fields = frozenset([m.varname for m in retriever_methods
+                                       if m.is_immutable()])
+        self._file_lookup = None
         offset_method_index = retriever_methods.index(
             rtorrent.rpc.find_method("f.get_offset"))
 
-        # make a list of the offsets of all the files, sort appropriately
-        offset_list = sorted([r[offset_method_index] for r in results])
+        # get proper index positions for each file (based on the file
+        # offset), the sort is stable so zero-length files that share an
+        # offset keep the order they're listed in
+        order = sorted(range(len(results)),
+                       key=lambda i: results[i][offset_method_index])
+        indexes = [0] * len(results)
+        for f_index, i in enumerate(order):
+            indexes[i] = f_index
 
-        for result in results:
+        for result, f_index in zip(results, indexes):
             results_dict = {}
             # build results_dict
             for m, r in zip(retriever_methods, result):
                 results_dict[m.varname] = rtorrent.rpc.process_result(m, r)
 
-            # get proper index positions for each file (based on the file
-            # offset)
-            f_index = offset_list.index(results_dict["offset"])
-
-            self.files.append(File(self._rt_obj, self.info_hash,
-                                   f_index, **results_dict))
+            self.files.append(self._file_class(self._rt_obj, self.info_hash,
+                                               f_index, **results_dict))
 
         return(self.files)
 
+    def _get_file_lookup(self):
+        """Get the index -> L{File} and path -> L{File} dicts of self.files"""
+        if self._file_lookup is None:
+            by_index = {}
+            by_path = {}
+            for f in self.files:
+                by_index[f.index] = f
+                path = getattr(f, "path", None)
+                if path is not None:
+                    by_path[path] = f
+
+            self._file_lookup = (by_index, by_path)
+
+        return(self._file_lookup)
+
+    def get_file(self, index):
+        """Get the file at position C{B{index}} of the torrent's file list
+
+        @note: looks in self.files, see L{get_files}
+
+        @rtype: L{File} instance or None
+        """
+        return(self._get_file_lookup()[0].get(index))
+
+    def find_file(self, path):
+        """Get the file with the given path (relative to the torrent's
+        directory, see L{File.path})
+
+        @note: looks in self.files, see L{get_files}. The path field has to
+        have been retrieved
+
+        @rtype: L{File} instance or None
+        """
+        return(self._get_file_lookup()[1].get(path))
+
+    def get_chunk_bitfield(self):
+        """Get the chunks the torrent has as a L{Bitfield}
+
+        @note: rTorrent only returns the bitfield of open torrents, a
+        closed torrent counts as having every chunk if it's complete and
+        no chunk otherwise
+
+        @rtype: L{Bitfield} instance
+        """
+        m = rtorrent.rpc.Multicall(self)
+        self.multicall_add(m, "d.get_bitfield")
+        self.multicall_add(m, "d.get_size_chunks")
+        self.multicall_add(m, "d.get_complete")
+
+        self.bitfield, self.size_chunks, self.complete = m.call()
+
+        return(self._build_bitfield())
+
+    def _build_bitfield(self):
+        """Build the L{Bitfield} from self.bitfield, self.size_chunks and
+        self.complete"""
+        if self.bitfield:
+            return(Bitfield.from_hex(self.bitfield, self.size_chunks))
+
+        fill = b"\xff" if self.complete else b"\x00"
+        return(Bitfield(fill * ((self.size_chunks + 7) // 8),
+                        self.size_chunks))
+
+    def get_file_completion(self):
+        """Get the completed chunks of every file from the torrent's bitfield
+
+        Makes one call for the bitfield instead of one f.get_completed_chunks
+        call per file. Chunks that are shared by two files count for both.
+
+        @return: (L{File}, completed chunk count, missing chunk runs) tuples,
+        the runs are (first chunk, last chunk + 1) tuples
+        @rtype: list
+
+        @note: sets File.completed_chunks of self.files, see L{get_files}
+        """
+        bitfield = self.get_chunk_bitfield()
+        # the chunk ranges don't change, so this only calls once
+        files = self.get_files(fields=["range_first", "range_second"])
+
+        return(self._get_file_completion(bitfield, files))
+
+    @staticmethod
+    def _get_file_completion(bitfield, files):
+        """Split C{B{bitfield}} over the chunk ranges of C{B{files}}"""
+        ranges = [(f.range_first, f.range_second) for f in files]
+        completion = []
+        for f, (count, runs) in zip(files, bitfield.split(ranges)):
+            f.completed_chunks = count
+            completion.append((f, count, runs))
+
+        return(completion)
+
     def set_directory(self, d):
         """Modify download directory
 
@@ -170,7 +350,7 @@ class Torrent:
         self.multicall_add(m, "d.try_stop")
         self.multicall_add(m, "d.set_directory", d)
 
-        self.directory = m.call()[-1]
+        m.call()
 
     def set_directory_base(self, d):
         """Modify base download directory
@@ -183,6 +363,8 @@ class Torrent:
         self.multicall_add(m, "d.try_stop")
         self.multicall_add(m, "d.set_directory_base", d)
 
+        m.call()
+
     def start(self):
         """Start the torrent"""
         m = rtorrent.rpc.Multicall(self)
@@ -247,13 +429,16 @@ class Torrent:
     def update(self):
         """Refresh torrent data
 
-        @note: All fields are stored as attributes to self.
+        @note: All fields are stored as attributes to self. Immutable
+        fields that were retrieved already aren't retrieved again.
 
         @return: None
         """
         multicall = rtorrent.rpc.Multicall(self)
         retriever_methods = [m for m in methods
-                             if m.is_retriever() and m.is_available(self._rt_obj)]
+                             if m.is_retriever() and m.is_available(self._rt_obj)
+                             and not (m.is_immutable() and
+                                      hasattr(self, m.varname))]
         for method in retriever_methods:
             multicall.add(method, self.rpc_id)
 
@@ -415,88 +600,149 @@ methods = [
     Method(Torrent, 'is_hash_checking', 'd.is_hash_checking',
            boolean=True,
            ),
-    Method(Torrent, 'get_peers_max', 'd.get_peers_max'),
+    Method(Torrent, 'get_peers_max', 'd.get_peers_max',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_tracker_focus', 'd.get_tracker_focus'),
     Method(Torrent, 'get_skip_total', 'd.get_skip_total'),
     Method(Torrent, 'get_state', 'd.get_state'),
-    Method(Torrent, 'get_peer_exchange', 'd.get_peer_exchange'),
+    Method(Torrent, 'get_peer_exchange', 'd.get_peer_exchange',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_down_rate', 'd.get_down_rate'),
-    Method(Torrent, 'get_connection_seed', 'd.get_connection_seed'),
-    Method(Torrent, 'get_uploads_max', 'd.get_uploads_max'),
-    Method(Torrent, 'get_priority_str', 'd.get_priority_str'),
+    Method(Torrent, 'get_connection_seed', 'd.get_connection_seed',
+           volatility=SLOW,
+           ),
+    Method(Torrent, 'get_uploads_max', 'd.get_uploads_max',
+           volatility=SLOW,
+           ),
+    Method(Torrent, 'get_priority_str', 'd.get_priority_str',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'is_open', 'd.is_open',
            boolean=True,
            ),
-    Method(Torrent, 'get_peers_min', 'd.get_peers_min'),
+    Method(Torrent, 'get_peers_min', 'd.get_peers_min',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_peers_complete', 'd.get_peers_complete'),
-    Method(Torrent, 'get_tracker_numwant', 'd.get_tracker_numwant'),
-    Method(Torrent, 'get_connection_current', 'd.get_connection_current'),
+    Method(Torrent, 'get_tracker_numwant', 'd.get_tracker_numwant',
+           volatility=SLOW,
+           ),
+    Method(Torrent, 'get_connection_current', 'd.get_connection_current',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'is_complete', 'd.get_complete',
            boolean=True,
            ),
     Method(Torrent, 'get_peers_connected', 'd.get_peers_connected'),
-    Method(Torrent, 'get_chunk_size', 'd.get_chunk_size'),
+    Method(Torrent, 'get_chunk_size', 'd.get_chunk_size',
+           volatility=IMMUTABLE,
+           ),
     Method(Torrent, 'get_state_counter', 'd.get_state_counter'),
-    Method(Torrent, 'get_base_filename', 'd.get_base_filename'),
+    Method(Torrent, 'get_base_filename', 'd.get_base_filename',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_state_changed', 'd.get_state_changed'),
     Method(Torrent, 'get_peers_not_connected', 'd.get_peers_not_connected'),
-    Method(Torrent, 'get_directory', 'd.get_directory'),
+    Method(Torrent, 'get_directory', 'd.get_directory',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'is_incomplete', 'd.incomplete',
            boolean=True,
            ),
-    Method(Torrent, 'get_tracker_size', 'd.get_tracker_size'),
+    Method(Torrent, 'get_tracker_size', 'd.get_tracker_size',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'is_multi_file', 'd.is_multi_file',
            boolean=True,
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_local_id', 'd.get_local_id',
+           volatility=IMMUTABLE,
            ),
-    Method(Torrent, 'get_local_id', 'd.get_local_id'),
     Method(Torrent, 'get_ratio', 'd.get_ratio',
            post_process_func=lambda x: x / 1000.0,
            ),
-    Method(Torrent, 'get_loaded_file', 'd.get_loaded_file'),
-    Method(Torrent, 'get_max_file_size', 'd.get_max_file_size'),
-    Method(Torrent, 'get_size_chunks', 'd.get_size_chunks'),
+    Method(Torrent, 'get_loaded_file', 'd.get_loaded_file',
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_max_file_size', 'd.get_max_file_size',
+           volatility=SLOW,
+           ),
+    Method(Torrent, 'get_size_chunks', 'd.get_size_chunks',
+           volatility=IMMUTABLE,
+           ),
     Method(Torrent, 'is_pex_active', 'd.is_pex_active',
            boolean=True,
            ),
     Method(Torrent, 'get_hashing', 'd.get_hashing'),
     Method(Torrent, 'get_bitfield', 'd.get_bitfield'),
-    Method(Torrent, 'get_local_id_html', 'd.get_local_id_html'),
-    Method(Torrent, 'get_connection_leech', 'd.get_connection_leech'),
+    Method(Torrent, 'get_local_id_html', 'd.get_local_id_html',
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_connection_leech', 'd.get_connection_leech',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_peers_accounted', 'd.get_peers_accounted'),
     Method(Torrent, 'get_message', 'd.get_message'),
     Method(Torrent, 'is_active', 'd.is_active',
            boolean=True,
            ),
-    Method(Torrent, 'get_size_bytes', 'd.get_size_bytes'),
-    Method(Torrent, 'get_ignore_commands', 'd.get_ignore_commands'),
-    Method(Torrent, 'get_creation_date', 'd.get_creation_date'),
-    Method(Torrent, 'get_base_path', 'd.get_base_path'),
+    Method(Torrent, 'get_size_bytes', 'd.get_size_bytes',
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_ignore_commands', 'd.get_ignore_commands',
+           volatility=SLOW,
+           ),
+    Method(Torrent, 'get_creation_date', 'd.get_creation_date',
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_base_path', 'd.get_base_path',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_left_bytes', 'd.get_left_bytes'),
-    Method(Torrent, 'get_size_files', 'd.get_size_files'),
+    Method(Torrent, 'get_size_files', 'd.get_size_files',
+           volatility=IMMUTABLE,
+           ),
     Method(Torrent, 'get_size_pex', 'd.get_size_pex'),
     Method(Torrent, 'is_private', 'd.is_private',
            boolean=True,
+           volatility=IMMUTABLE,
+           ),
+    Method(Torrent, 'get_max_size_pex', 'd.get_max_size_pex',
+           volatility=SLOW,
            ),
-    Method(Torrent, 'get_max_size_pex', 'd.get_max_size_pex'),
     Method(Torrent, 'get_num_chunks_hashed', 'd.get_chunks_hashed',
            aliases=("get_chunks_hashed",)),
     Method(Torrent, 'get_num_chunks_wanted', 'd.wanted_chunks'),
-    Method(Torrent, 'get_priority', 'd.get_priority'),
+    Method(Torrent, 'get_priority', 'd.get_priority',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_skip_rate', 'd.get_skip_rate'),
     Method(Torrent, 'get_completed_bytes', 'd.get_completed_bytes'),
-    Method(Torrent, 'get_name', 'd.get_name'),
+    Method(Torrent, 'get_name', 'd.get_name',
+           volatility=IMMUTABLE,
+           ),
     Method(Torrent, 'get_completed_chunks', 'd.get_completed_chunks'),
-    Method(Torrent, 'get_throttle_name', 'd.get_throttle_name'),
+    Method(Torrent, 'get_throttle_name', 'd.get_throttle_name',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_free_diskspace', 'd.get_free_diskspace'),
-    Method(Torrent, 'get_directory_base', 'd.get_directory_base'),
+    Method(Torrent, 'get_directory_base', 'd.get_directory_base',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_hashing_failed', 'd.get_hashing_failed'),
-    Method(Torrent, 'get_tied_to_file', 'd.get_tied_to_file'),
+    Method(Torrent, 'get_tied_to_file', 'd.get_tied_to_file',
+           volatility=SLOW,
+           ),
     Method(Torrent, 'get_down_total', 'd.get_down_total'),
     Method(Torrent, 'get_bytes_done', 'd.get_bytes_done'),
     Method(Torrent, 'get_up_rate', 'd.get_up_rate'),
     Method(Torrent, 'get_up_total', 'd.get_up_total'),
     Method(Torrent, 'is_accepting_seeders', 'd.accepting_seeders',
            boolean=True,
+           volatility=SLOW,
            ),
     Method(Torrent, "get_chunks_seen", "d.chunks_seen",
            min_version=(0, 9, 1),
@@ -507,12 +753,24 @@ methods = [
     Method(Torrent, "is_not_partially_done", "d.is_not_partially_done",
            boolean=True,
            ),
-    Method(Torrent, "get_time_started", "d.timestamp.started"),
-    Method(Torrent, "get_custom1", "d.get_custom1"),
-    Method(Torrent, "get_custom2", "d.get_custom2"),
-    Method(Torrent, "get_custom3", "d.get_custom3"),
-    Method(Torrent, "get_custom4", "d.get_custom4"),
-    Method(Torrent, "get_custom5", "d.get_custom5"),
+    Method(Torrent, "get_time_started", "d.timestamp.started",
+           volatility=SLOW,
+           ),
+    Method(Torrent, "get_custom1", "d.get_custom1",
+           volatility=SLOW,
+           ),
+    Method(Torrent, "get_custom2", "d.get_custom2",
+           volatility=SLOW,
+           ),
+    Method(Torrent, "get_custom3", "d.get_custom3",
+           volatility=SLOW,
+           ),
+    Method(Torrent, "get_custom4", "d.get_custom4",
+           volatility=SLOW,
+           ),
+    Method(Torrent, "get_custom5", "d.get_custom5",
+           volatility=SLOW,
+           ),
 
     # MODIFIERS
     Method(Torrent, 'set_uploads_max', 'd.set_uploads_max'),
@@ -533,3 +791,26 @@ methods = [
     Method(Torrent, 'set_custom3', 'd.set_custom3'),
     Method(Torrent, 'set_connection_current', 'd.set_connection_current'),
 ]
+
+# default fields of RTorrent.sync(): static fields don't change once a
+# torrent is loaded, so they're only retrieved for new torrents, slow fields
+# rarely change (mostly through modifiers, which update the local value), so
+# they're retrieved for new torrents and then every slow_interval seconds,
+# volatile fields are retrieved for every torrent on every sync (the most
+# used of the VOLATILE fields, every field would make the syncs much bigger)
+static_fields = tuple([m.varname for m in methods
+                       if m.is_retriever() and m.is_immutable()])
+slow_fields = tuple([m.varname for m in methods
+                     if m.is_retriever() and m.volatility == rtorrent.rpc.SLOW])
+volatile_fields = ("state", "active", "complete", "hashing", "hash_checking",
+                   "message", "down_rate", "up_rate", "down_total",
+                   "up_total", "completed_bytes", "ratio", "peers_connected",
+                   "peers_complete")
+
+Torrent = rtorrent.rpc._add_slots(Torrent, methods,
+                                   extra=("_rt_obj", "info_hash", "rpc_id",
+                                          "peers", "trackers", "files",
+                                          "_file_fields", "_file_lookup",
+                                          "dirty_fields",
+                                          "hash_checking_queued", "paused",
+                                          "started"))
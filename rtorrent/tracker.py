@@ -24,6 +24,8 @@ import rtorrent.rpc
 from rtorrent.common import safe_repr
 
 Method = rtorrent.rpc.Method
+IMMUTABLE = rtorrent.rpc.IMMUTABLE
+SLOW = rtorrent.rpc.SLOW
 
 
 class Tracker:
@@ -39,18 +41,19 @@ class Tracker:
         self.index = self.group  # : position of tracker within the torrent's tracker list
         self.rpc_id = "{0}:t{1}".format(
             self.info_hash, self.index)  # : unique id to pass to rTorrent
+        self.dirty_fields = set()  # : fields a modifier might not have set
 
     def __repr__(self):
         return safe_repr("Tracker(index={0}, url=\"{1}\")",
-                        self.index, self.url)
+                        self.index, getattr(self, "url", None))
 
     def enable(self):
-        """Alias for set_enabled("yes")"""
-        self.set_enabled("yes")
+        """Alias for set_enabled(True)"""
+        self.set_enabled(True)
 
     def disable(self):
-        """Alias for set_enabled("no")"""
-        self.set_enabled("no")
+        """Alias for set_enabled(False)"""
+        self.set_enabled(False)
 
     def update(self):
         """Refresh tracker data
@@ -84,17 +87,32 @@ class Tracker:
 
 methods = [
     # RETRIEVERS
-    Method(Tracker, 'is_enabled', 't.is_enabled', boolean=True),
-    Method(Tracker, 'get_id', 't.get_id'),
+    Method(Tracker, 'is_enabled', 't.is_enabled',
+           boolean=True,
+           volatility=SLOW,
+           ),
+    Method(Tracker, 'get_id', 't.get_id',
+           volatility=SLOW,
+           ),
     Method(Tracker, 'get_scrape_incomplete', 't.get_scrape_incomplete'),
     Method(Tracker, 'is_open', 't.is_open', boolean=True),
-    Method(Tracker, 'get_min_interval', 't.get_min_interval'),
+    Method(Tracker, 'get_min_interval', 't.get_min_interval',
+           volatility=SLOW,
+           ),
     Method(Tracker, 'get_scrape_downloaded', 't.get_scrape_downloaded'),
-    Method(Tracker, 'get_group', 't.get_group'),
+    Method(Tracker, 'get_group', 't.get_group',
+           volatility=IMMUTABLE,
+           ),
     Method(Tracker, 'get_scrape_time_last', 't.get_scrape_time_last'),
-    Method(Tracker, 'get_type', 't.get_type'),
-    Method(Tracker, 'get_normal_interval', 't.get_normal_interval'),
-    Method(Tracker, 'get_url', 't.get_url'),
+    Method(Tracker, 'get_type', 't.get_type',
+           volatility=IMMUTABLE,
+           ),
+    Method(Tracker, 'get_normal_interval', 't.get_normal_interval',
+           volatility=SLOW,
+           ),
+    Method(Tracker, 'get_url', 't.get_url',
+           volatility=IMMUTABLE,
+           ),
     Method(Tracker, 'get_scrape_complete', 't.get_scrape_complete',
            min_version=(0, 8, 9),
            ),
@@ -118,7 +136,8 @@ methods = [
            ),
     Method(Tracker, 'can_scrape', 't.can_scrape',
            min_version=(0, 9, 1),
-           boolean=True
+           boolean=True,
+           volatility=SLOW,
            ),
     Method(Tracker, 'get_failed_counter', 't.failed_counter',
            min_version=(0, 8, 9)
@@ -140,6 +159,7 @@ methods = [
     Method(Tracker, 'is_extra_tracker', 't.is_extra_tracker',
            min_version=(0, 9, 1),
            boolean=True,
+           volatility=IMMUTABLE,
            ),
     Method(Tracker, "get_latest_sum_peers", "t.latest_sum_peers",
            min_version=(0, 9, 0)
@@ -151,3 +171,7 @@ methods = [
     # MODIFIERS
     Method(Tracker, 'set_enabled', 't.set_enabled'),
 ]
+
+Tracker = rtorrent.rpc._add_slots(Tracker, methods,
+                                   extra=("_rt_obj", "info_hash", "index",
+                                          "rpc_id", "dirty_fields"))
@@ -1,4 +1,5 @@
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 import os, sys
 
 version = __import__('rtorrent').__version__
@@ -8,6 +9,18 @@ def read(fname):
 
 required_pkgs = []
 
+
+class BuildPy(build_py):
+    """Leave out the asyncio modules (rtorrent.aio, rtorrent.lib.xmlrpc.aio)
+    on Python < 3.5, they'd fail to byte-compile"""
+
+    def find_package_modules(self, package, package_dir):
+        modules = build_py.find_package_modules(self, package, package_dir)
+        if sys.version_info < (3, 5):
+            modules = [m for m in modules if m[1] != "aio"]
+        return modules
+
+
 classifiers = [
     "Development Status :: 4 - Beta",
     "Intended Audience :: Developers",
@@ -31,9 +44,10 @@ setup(
     long_description=read("README.md"),
     keywords="rtorrent p2p",
     license="MIT",
-    packages=find_packages(),
+    packages=find_packages(exclude=["tests", "tests.*", "benchmarks"]),
     scripts=[],
     install_requires=required_pkgs,
     classifiers=classifiers,
     include_package_data=True,
+    cmdclass={"build_py": BuildPy},
 )
@@ -0,0 +1,260 @@
+"""A fake rTorrent that answers XML-RPC over SCGI, for the tests and the
+benchmarks
+
+Every torrent, file, peer and tracker field gets a deterministic value, the
+modifiers store what they're given, and every RPC call (including the calls
+inside a system.multicall) is recorded in FakeRTorrent.calls, with its
+parameters in FakeRTorrent.params.
+"""
+
+import hashlib
+import re
+import socket
+import threading
+import time
+import zlib
+
+try:
+    import xmlrpc.client as xmlrpclib
+    from xmlrpc.server import SimpleXMLRPCDispatcher
+except ImportError:
+    import xmlrpclib
+    from SimpleXMLRPCServer import SimpleXMLRPCDispatcher
+
+_STR_HINTS = ("name", "path", "directory", "message", "hash", "url",
+              "address", "bitfield", "custom", "id", "str", "version", "file",
+              "html", "throttle", "bind", "ip", "proxy", "session", "cacert",
+              "capath", "suffix", "range", "type")
+_INT_HINTS = ("rate", "total", "size", "chunk", "offset", "peers", "time",
+              "counter", "interval", "priority", "state", "hashing", "depth")
+
+# raw RPC calls the library uses that don't have a Method
+_EXTRA_METHODS = ["d.multicall", "p.multicall", "t.multicall", "f.multicall",
+                  "system.multicall", "download_list", "d.try_start",
+                  "d.try_stop", "d.pause", "d.resume", "d.close", "d.erase",
+                  "d.check_hash", "d.get_hash", "d.set_directory",
+                  "d.set_directory_base", "load_raw", "load_raw_start",
+                  "view_list", "d.tracker_announce", "d.tracker.insert",
+                  "d.accepting_seeders.enable", "d.accepting_seeders.disable",
+                  "view.set_visible", "view.set_not_visible"]
+
+# raw RPC calls that change something, they return 0
+_ACTIONS = ("d.try_start", "d.try_stop", "d.pause", "d.resume", "d.close",
+            "d.check_hash", "d.tracker_announce", "d.tracker.insert",
+            "d.accepting_seeders.enable", "d.accepting_seeders.disable",
+            "view.set_visible", "view.set_not_visible")
+
+
+def info_hash(i):
+    """Info hash of the i-th torrent of a L{FakeRTorrent}"""
+    return hashlib.sha1(str(i).encode()).hexdigest().upper()
+
+
+class FakeRTorrent(object):
+
+    def __init__(self, torrents=10, files=3, peers=2, trackers=2, delay=0):
+        """
+        @param delay: seconds to wait before answering each request, to
+        simulate a busy rTorrent or a slow network
+        """
+        self.torrents = {}  # : info hash -> {field: value}
+        for i in range(torrents):
+            self.add_torrent(info_hash(i), i)
+        self.files, self.peers, self.trackers = files, peers, trackers
+        self.file_lists = {}  # : info hash -> [{field: value}], see value()
+        self.delay = delay
+        self.calls = []
+        self.params = []  # : parameters of each call in self.calls
+        self.requests = 0  # : number of SCGI requests received
+        self.missing = set()  # : RPC calls left out of system.listMethods
+        self._lock = threading.Lock()
+        self._server = None
+
+    def add_torrent(self, h, i=0):
+        self.torrents[h] = {"name": "torrent-%d" % i, "complete": i % 2,
+                            "state": 1, "message": "", "ratio": 1500,
+                            "down_rate": i * 10, "up_rate": i,
+                            "directory": "/data/%d" % (i % 3),
+                            "size_bytes": 1000 * (i + 1), "priority": 2,
+                            "size_chunks": 16, "chunk_size": 262144,
+                            "bitfield": "F0F0"}
+
+    def value(self, cmd, h, sub=0):
+        base = cmd.rstrip("=")
+        t = self.torrents.get(h)
+        if t is None:
+            raise xmlrpclib.Fault(-501, "Could not find info-hash.")
+
+        var = re.sub(r"^[dptf]\.(get_|is_|set_)?", "", base)
+        if base.startswith("d.") and var in t:
+            return t[var]
+        if base in ("d.get_hash", "d.hash"):
+            return h
+        if base.startswith("f.") and h in self.file_lists:
+            if var in self.file_lists[h][sub]:
+                return self.file_lists[h][sub][var]
+        if base.startswith("f."):
+            fixed = {"offset": sub * 1000, "path": "file%d.bin" % sub,
+                     "range_first": sub * 5, "range_second": sub * 5 + 5,
+                     "size_bytes": 1000}
+            if var in fixed:
+                return fixed[var]
+        if base.startswith("p.") and var == "id":
+            return "PEER%d" % sub
+        if base.startswith("t.") and var == "group":
+            return sub
+        if base.startswith("t.") and var == "url":
+            return "http://tracker/%d" % sub
+        if ".is_" in base:
+            return 1
+        if any(k in var for k in _INT_HINTS):
+            return zlib.crc32((h + var).encode()) % 1000
+        if any(k in var for k in _STR_HINTS):
+            return "%s-%s" % (var, h[:6])
+        return zlib.crc32((h + var).encode()) % 100
+
+    def _dispatch(self, method, params):
+        with self._lock:
+            self.calls.append(method)
+            self.params.append(params)
+
+        if method == "system.listMethods":
+            return self.list_methods()
+        if method == "system.client_version":
+            return "0.9.2"
+        if method == "system.library_version":
+            return "0.13.2"
+        if method == "system.multicall":
+            results = []
+            for c in params[0]:
+                try:
+                    results.append([self._dispatch(c["methodName"],
+                                                   c["params"])])
+                except xmlrpclib.Fault as f:
+                    results.append({"faultCode": f.faultCode,
+                                    "faultString": f.faultString})
+            return results
+        if method == "download_list":
+            return list(self.torrents)
+        if method == "view_list":
+            return ["main", "default"]
+        if method == "d.multicall":
+            cmds = params[1:]
+            return [[self.value(c, h) for c in cmds] for h in self.torrents]
+        if method in ("p.multicall", "t.multicall", "f.multicall"):
+            h, cmds = params[0], params[2:]
+            if h not in self.torrents:
+                raise xmlrpclib.Fault(-501, "Could not find info-hash.")
+            n = {"p": self.peers, "t": self.trackers,
+                 "f": self.files}[method[0]]
+            if method[0] == "f" and h in self.file_lists:
+                n = len(self.file_lists[h])
+            return [[self.value(c, h, i) for c in cmds] for i in range(n)]
+        if method.startswith("load_raw"):
+            from rtorrent.lib.torrentparser import TorrentParser
+            try:
+                h = TorrentParser(params[-1].data).info_hash
+            except Exception:
+                raise xmlrpclib.Fault(-503, "Could not create download.")
+            self.add_torrent(h, len(self.torrents))
+            return 0
+        if method.startswith(("d.set_", "t.set_", "f.set_", "p.set_")):
+            h = params[0].split(":")[0]
+            if h not in self.torrents:
+                raise xmlrpclib.Fault(-501, "Could not find info-hash.")
+            var = re.sub(r"^[dptf]\.set_", "", method)
+            self.torrents[h][var] = params[1] if len(params) > 1 else None
+            return 0
+        if method in _ACTIONS:
+            if params[0] not in self.torrents:
+                raise xmlrpclib.Fault(-501, "Could not find info-hash.")
+            return 0
+        if method == "d.erase":
+            if self.torrents.pop(params[0], None) is None:
+                raise xmlrpclib.Fault(-501, "Could not find info-hash.")
+            return 0
+        if method.startswith(("d.", "p.", "t.", "f.")):
+            target = params[0].split(":") if params else [""]
+            sub = 0
+            if len(target) > 1 and target[1][1:].isdigit():
+                sub = int(target[1][1:])
+            return self.value(method, target[0], sub)
+        if method.startswith("get_"):
+            return 1
+        return 0
+
+    def list_methods(self):
+        import rtorrent
+        names = set(_EXTRA_METHODS)
+        for method_list in rtorrent._all_methods_list:
+            for m in method_list:
+                names.add(m.rpc_call)
+
+        return sorted(names - self.missing)
+
+    def serve(self):
+        """Start answering requests in background threads
+
+        @return: the scgi:// URI to connect to
+        """
+        dispatcher = SimpleXMLRPCDispatcher(allow_none=True, encoding=None)
+        dispatcher.register_instance(self)
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(128)
+        self._server = server
+
+        def handle(conn):
+            f = conn.makefile("rb")
+            try:
+                length = b""
+                while True:
+                    c = f.read(1)
+                    if not c:
+                        return
+                    if c == b":":
+                        break
+                    length += c
+                parts = f.read(int(length)).split(b"\x00")
+                f.read(1)  # trailing comma of the netstring
+                headers = dict(zip(parts[0::2], parts[1::2]))
+                body = f.read(int(headers[b"CONTENT_LENGTH"]))
+
+                with self._lock:
+                    self.requests += 1
+                if self.delay:
+                    time.sleep(self.delay)
+
+                response = dispatcher._marshaled_dispatch(body)
+                conn.sendall(b"Status: 200 OK\r\nContent-Type: text/xml\r\n"
+                             b"Content-Length: " +
+                             str(len(response)).encode() + b"\r\n\r\n" +
+                             response)
+            except socket.error:
+                pass
+            finally:
+                # the socket stays open as long as f does
+                f.close()
+                conn.close()
+
+        def accept():
+            while True:
+                try:
+                    conn = server.accept()[0]
+                except (socket.error, OSError):
+                    return
+                t = threading.Thread(target=handle, args=(conn,))
+                t.daemon = True
+                t.start()
+
+        t = threading.Thread(target=accept)
+        t.daemon = True
+        t.start()
+
+        return "scgi://127.0.0.1:%d" % server.getsockname()[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
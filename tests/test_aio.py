@@ -0,0 +1,69 @@
+import sys
+import unittest
+
+if sys.version_info < (3, 5):
+    raise unittest.SkipTest("rtorrent.aio requires Python 3.5 or later")
+
+import asyncio
+
+from rtorrent.aio import AsyncRTorrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestAsyncTorrent(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=2, files=3)
+        self.rt = AsyncRTorrent(self.fake.serve())
+        self.loop = asyncio.new_event_loop()
+        self.wait(self.rt.connect())
+        self.torrent = self.wait(self.rt.get_torrents())[0]
+
+    def tearDown(self):
+        self.loop.close()
+        self.fake.close()
+
+    def wait(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_set_directory_base(self):
+        self.wait(self.torrent.set_directory_base("/new"))
+        self.assertEqual(self.fake.torrents[info_hash(0)]["directory_base"],
+                         "/new")
+        self.assertEqual(self.fake.calls[-2:],
+                         ["d.try_stop", "d.set_directory_base"])
+
+    def test_modifiers(self):
+        self.wait(self.torrent.accept_seeders(False))
+        self.assertEqual(self.fake.calls[-1], "d.accepting_seeders.disable")
+        self.wait(self.torrent.set_visible("main"))
+        self.assertEqual(self.fake.calls[-1], "view.set_visible")
+        self.wait(self.torrent.set_visible("main", False))
+        self.assertEqual(self.fake.calls[-1], "view.set_not_visible")
+        self.assertEqual(
+            self.wait(self.torrent.add_tracker(0, "http://tracker/new")), 0)
+        self.assertEqual(self.fake.calls[-1], "d.tracker.insert")
+
+    def test_get_files_keeps_immutable_fields(self):
+        files = self.wait(self.torrent.get_files())
+        self.assertEqual([f.path for f in files],
+                         ["file0.bin", "file1.bin", "file2.bin"])
+
+        # the files are updated in place, without building them again
+        self.assertEqual(self.wait(self.torrent.get_files()), files)
+        self.assertTrue(all(a is b for a, b in
+                            zip(self.torrent.files, files)))
+
+    def test_get_file_completion(self):
+        bitfield = self.wait(self.torrent.get_chunk_bitfield())
+        self.assertEqual(bitfield.count(), 8)
+
+        completion = self.wait(self.torrent.get_file_completion())
+        self.assertEqual([(count, runs) for f, count, runs in completion],
+                         [(4, [(4, 5)]), (2, [(5, 8)]), (2, [(12, 15)])])
+        self.assertEqual([f.completed_chunks for f in self.torrent.files],
+                         [4, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from rtorrent.lib import bencode
+from rtorrent.lib.bencode import BencodeDecodeError
+
+
+class TestBencode(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in (0, -42, 2 ** 70, b"", b"spam", [], [1, b"a", []],
+                      {"a": 1, "b": [b"x", {"c": b"d"}]}, {}):
+            self.assertEqual(bencode.decode(bencode.encode(value)), value)
+
+    def test_encode(self):
+        self.assertEqual(bencode.encode({"b": 1, "a": [b"x", "y"]}),
+                         b"d1:al1:x1:ye1:bi1ee")
+        self.assertFalse(bencode.encode(True))
+        self.assertFalse(bencode.encode(1.5))
+
+    def test_decode(self):
+        self.assertEqual(bencode.decode(b"i-3e"), -3)
+        self.assertEqual(bencode.decode(b"4:spam"), b"spam")
+        self.assertEqual(bencode.decode(b"li1el0:ee"), [1, [b""]])
+        self.assertEqual(bencode.decode("d1:ad1:bi0eee"), {"a": {"b": 0}})
+
+    def test_spans(self):
+        data = b"d4:infod6:lengthi5ee4:listli1ei2ee3:str3:abce"
+        spans = {}
+        decoded = bencode.decode(data, spans)
+        self.assertEqual(sorted(spans), ["info", "list", "str"])
+        for key, (start, end) in spans.items():
+            self.assertEqual(bencode.decode(data[start:end]), decoded[key])
+        self.assertEqual(data[slice(*spans["info"])], b"d6:lengthi5ee")
+        self.assertEqual(bencode.index(data), spans)
+
+    def test_decode_at(self):
+        data = b"xxd1:ai1e1:b3:fooe"
+        self.assertEqual(bencode.decode_at(data, 2), {"a": 1, "b": b"foo"})
+        spans = bencode.index(data, 2)
+        self.assertEqual(bencode.decode_at(data, spans["b"][0]), b"foo")
+        self.assertEqual(bencode.decode_at(data, spans["a"][0]), 1)
+
+    def check_error(self, data, position, decode=bencode.decode):
+        try:
+            decode(data)
+        except BencodeDecodeError as e:
+            self.assertEqual(e.position, position, e)
+        else:
+            self.fail("{0!r} was decoded".format(data))
+
+    def test_errors(self):
+        self.check_error(b"", 0)
+        self.check_error(b"i12", 0)  # unterminated integer
+        self.check_error(b"iabce", 0)
+        self.check_error(b"10:abc", 0)  # past the end of the data
+        self.check_error(b"l1:a", 4)  # truncated list
+        self.check_error(b"d1:ai1e", 7)  # truncated dictionary
+        self.check_error(b"di1ei2ee", 1)  # key isn't a string
+        self.check_error(b"l1:ax", 4)  # invalid value type
+        self.check_error(b"d1:ai1e1:b5:abc", 10, bencode.index)
+        self.check_error(b"d1:al", 5, bencode.index)
+
+    def test_error_is_value_error(self):
+        self.assertRaises(ValueError, bencode.decode, b"x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import rtorrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestBulkAction(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=3)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.info_hashes = [info_hash(i) for i in range(3)]
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_call(self):
+        result = self.rt.bulk(self.info_hashes + ["UNKNOWN"],
+                              chunk_size=2).set_priority(3)
+        self.assertEqual(sorted(result.results), sorted(self.info_hashes))
+        self.assertEqual(list(result.errors), ["UNKNOWN"])
+        self.assertTrue(all(self.fake.torrents[h]["priority"] == 3
+                            for h in self.info_hashes))
+
+    def test_set_directory(self):
+        result = self.rt.bulk(self.info_hashes + ["UNKNOWN"],
+                              chunk_size=3).set_directory("/new")
+        self.assertEqual(sorted(result.results), sorted(self.info_hashes))
+        self.assertEqual(list(result.errors), ["UNKNOWN"])
+
+        # each torrent is stopped before its directory is set
+        calls = [c for c in self.fake.calls
+                 if c in ("d.try_stop", "d.set_directory")]
+        self.assertEqual(calls, ["d.try_stop", "d.set_directory"] * 4)
+        self.assertTrue(all(self.fake.torrents[h]["directory"] == "/new"
+                            for h in self.info_hashes))
+
+    def test_set_directory_base(self):
+        result = self.rt.bulk(self.info_hashes).set_directory_base("/base")
+        self.assertTrue(result.ok())
+        self.assertEqual(self.fake.calls[-2:],
+                         ["d.try_stop", "d.set_directory_base"])
+
+
+if __name__ == "__main__":
+    unittest.main()
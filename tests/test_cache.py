@@ -0,0 +1,67 @@
+import hashlib
+import unittest
+
+import rtorrent
+from rtorrent.rpc import CallCache, Multicall
+from tests.fakeserver import FakeRTorrent, info_hash
+
+INFO = b"d6:lengthi100e4:name4:test12:piece lengthi16384e6:pieces20:" + \
+    b"\x01" * 20 + b"e"
+TORRENT = b"d8:announce14:http://tracker4:info" + INFO + b"e"
+
+
+class TestCallCache(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=2)
+        self.cache = CallCache()
+        self.rt = rtorrent.RTorrent(self.fake.serve(), cache=self.cache)
+
+    def tearDown(self):
+        self.fake.close()
+
+    def get_name(self, rt, h):
+        m = Multicall(rt)
+        m.add("d.get_name", h)
+        return(m.call()[0])
+
+    def test_cached(self):
+        h = info_hash(0)
+        self.assertEqual(self.get_name(self.rt, h), "torrent-0")
+        self.fake.torrents[h]["name"] = "renamed"
+        self.assertEqual(self.get_name(self.rt, h), "torrent-0")
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_servers(self):
+        other = FakeRTorrent(torrents=2)
+        other.torrents[info_hash(0)]["name"] = "other"
+        try:
+            rt = rtorrent.RTorrent(other.serve(), cache=self.cache)
+            self.assertEqual(self.get_name(self.rt, info_hash(0)),
+                             "torrent-0")
+            self.assertEqual(self.get_name(rt, info_hash(0)), "other")
+        finally:
+            other.close()
+
+    def test_erase(self):
+        h = info_hash(0)
+        self.get_name(self.rt, h)
+        self.rt.get_torrents()[0].erase()
+
+        self.fake.add_torrent(h, 7)
+        self.assertEqual(self.get_name(self.rt, h), "torrent-7")
+
+    def test_load(self):
+        h = hashlib.sha1(INFO).hexdigest().upper()
+        self.fake.add_torrent(h, 5)
+        self.get_name(self.rt, h)
+
+        # erased by another client
+        del self.fake.torrents[h]
+        torrent = self.rt.load_torrent(TORRENT, fields=["name"])
+        self.assertEqual(torrent.name, "torrent-2")
+        self.assertEqual(self.get_name(self.rt, h), "torrent-2")
+
+
+if __name__ == "__main__":
+    unittest.main()
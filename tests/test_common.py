@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+
+import rtorrent
+from rtorrent.common import SingleFlight
+from tests.fakeserver import FakeRTorrent
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def func(self, result):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(10)
+        if isinstance(result, Exception):
+            raise result
+        return(result)
+
+    def call_concurrently(self, result, n=5):
+        """Call self.func from C{B{n}} threads, the first one being in the
+        call when the others start
+
+        @return: what each thread got (result or exception)
+        """
+        outcomes = []
+
+        def run():
+            try:
+                outcomes.append(self.single_flight.do("key", self.func,
+                                                      result))
+            except Exception as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=run) for i in range(n)]
+        threads[0].start()
+        self.assertTrue(self.started.wait(10))
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.1)  # let them wait for the call in flight
+        self.release.set()
+        for t in threads:
+            t.join(10)
+
+        return(outcomes)
+
+    def test_shared_call(self):
+        result = object()
+        outcomes = self.call_concurrently(result)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(o is result for o in outcomes))
+
+    def test_shared_exception(self):
+        error = ValueError("failed")
+        outcomes = self.call_concurrently(error)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(outcomes), 5)
+        self.assertTrue(all(o is error for o in outcomes))
+
+    def test_next_call(self):
+        self.release.set()
+        self.assertEqual(self.single_flight.do("key", self.func, 1), 1)
+        self.assertEqual(self.single_flight.do("key", self.func, 2), 2)
+        self.assertEqual(self.single_flight.do("other", self.func, 3), 3)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual(self.single_flight._calls, {})
+
+
+class TestGetTorrentsSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=3)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.rt._get_capabilities()
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_identical_calls(self):
+        self.fake.delay = 0.3
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(self.rt.get_torrents(
+                fields=["name"]))) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.fake.calls.count("d.multicall"), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import rtorrent
+from rtorrent.events import ADDED, MESSAGE_CHANGED, REMOVED
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=3)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_poll_events(self):
+        self.assertEqual(self.rt.poll_events(), [])
+
+        del self.fake.torrents[info_hash(0)]
+        self.fake.add_torrent(info_hash(3), 3)
+        self.fake.torrents[info_hash(1)]["message"] = "Tracker: timeout"
+
+        events = self.rt.poll_events()
+        self.assertEqual(sorted((e.event_type, e.info_hash) for e in events),
+                         sorted([(ADDED, info_hash(3)),
+                                 (REMOVED, info_hash(0)),
+                                 (MESSAGE_CHANGED, info_hash(1))]))
+        self.assertTrue(all(e.view == "main" for e in events))
+
+    def test_subscribe_view(self):
+        received = {"main": [], "default": [], None: [], "added": []}
+        for view in ("main", "default", None):
+            self.rt.subscribe(received[view].append, view=view)
+        self.rt.subscribe(received["added"].append, [ADDED], view="main")
+
+        self.rt.poll_events("main")
+        self.rt.poll_events("default")
+        self.fake.add_torrent(info_hash(3), 3)
+        main = self.rt.poll_events("main")
+        default = self.rt.poll_events("default")
+
+        self.assertEqual(received["main"], main)
+        self.assertEqual(received["default"], default)
+        self.assertEqual(received[None], main + default)
+        self.assertEqual(received["added"], main)
+        self.assertEqual([e.view for e in received[None]],
+                         ["main", "default"])
+
+        self.rt.unsubscribe(received[None].append)
+        self.fake.add_torrent(info_hash(4), 4)
+        self.rt.poll_events("main")
+        self.assertEqual(len(received[None]), 2)
+        self.assertEqual(len(received["main"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import rtorrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=1)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.torrent = self.rt.get_torrents(fields=["name"])[0]
+
+    def tearDown(self):
+        self.fake.close()
+
+    def set_files(self, files):
+        """Files of the torrent, as (path, offset, size) tuples in the order
+        f.multicall lists them"""
+        self.fake.file_lists[info_hash(0)] = [
+            {"path": path, "offset": offset, "size_bytes": size}
+            for path, offset, size in files]
+
+    def test_index_by_offset(self):
+        self.set_files([("c", 300, 100), ("a", 0, 100), ("b", 100, 200)])
+        files = self.torrent.get_files(fields=["path"])
+        self.assertEqual([(f.path, f.index) for f in files],
+                         [("c", 2), ("a", 0), ("b", 1)])
+
+    def test_zero_length_files(self):
+        # zero-length files share their offset with the next file, they
+        # keep the order they're listed in
+        self.set_files([("a", 0, 100), ("empty1", 100, 0),
+                        ("empty2", 100, 0), ("b", 100, 50),
+                        ("empty3", 150, 0)])
+        files = self.torrent.get_files(fields=["path", "size_bytes"])
+        self.assertEqual([f.index for f in files], [0, 1, 2, 3, 4])
+        self.assertEqual(len(set(f.rpc_id for f in files)), 5)
+
+        self.set_files([("b", 100, 50), ("empty1", 100, 0), ("a", 0, 100),
+                        ("empty2", 100, 0)])
+        self.torrent.files = []
+        files = self.torrent.get_files(fields=["path"])
+        self.assertEqual([(f.path, f.index) for f in files],
+                         [("b", 1), ("empty1", 2), ("a", 0), ("empty2", 3)])
+
+    def test_get_file(self):
+        self.set_files([("b", 100, 100), ("a", 0, 100)])
+        self.assertIsNone(self.torrent.get_file(0))
+        files = self.torrent.get_files(fields=["path"])
+
+        self.assertIs(self.torrent.get_file(0), files[1])
+        self.assertIs(self.torrent.get_file(1), files[0])
+        self.assertIsNone(self.torrent.get_file(2))
+
+    def test_find_file(self):
+        self.set_files([("dir/b", 100, 100), ("a", 0, 100)])
+        files = self.torrent.get_files(fields=["path"])
+
+        self.assertIs(self.torrent.find_file("dir/b"), files[0])
+        self.assertIs(self.torrent.find_file("a"), files[1])
+        self.assertIsNone(self.torrent.find_file("b"))
+
+        # updated in place
+        self.torrent.get_files(fields=["path", "completed_chunks"])
+        self.assertIs(self.torrent.find_file("a"), files[1])
+        self.assertTrue(hasattr(files[1], "completed_chunks"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import hashlib
+import unittest
+
+try:
+    import xmlrpc.client as xmlrpclib
+except ImportError:
+    import xmlrpclib
+
+import rtorrent
+from rtorrent.err import DuplicateTorrentError
+from tests.fakeserver import FakeRTorrent
+
+
+def make_torrent(name):
+    """Raw data and info hash of a single file torrent"""
+    info = b"d6:lengthi100e4:name" + str(len(name)).encode() + b":" + \
+        name + b"12:piece lengthi16384e6:pieces20:" + b"\x01" * 20 + b"e"
+
+    return(b"d8:announce14:http://tracker4:info" + info + b"e",
+           hashlib.sha1(info).hexdigest().upper())
+
+
+class TestLoadTorrents(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=0)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def check_outcomes(self, workers):
+        one, one_hash = make_torrent(b"one")
+        two, two_hash = make_torrent(b"two")
+        outcomes = self.rt.load_torrents([one, b"garbage", one, two],
+                                         workers=workers)
+
+        self.assertEqual(len(outcomes), 4)
+        self.assertEqual(outcomes[0], (one_hash, 0))
+        self.assertIsNone(outcomes[1][0])
+        self.assertIsInstance(outcomes[1][1], Exception)
+        self.assertEqual(outcomes[2][0], one_hash)
+        self.assertIsInstance(outcomes[2][1], DuplicateTorrentError)
+        self.assertEqual(outcomes[2][1].index, 0)
+        self.assertEqual(outcomes[3], (two_hash, 0))
+
+        # the duplicate isn't loaded again
+        self.assertEqual(sorted(self.fake.torrents),
+                         sorted([one_hash, two_hash]))
+        self.assertEqual(self.fake.calls.count("load_raw"), 2)
+
+    def test_outcomes(self):
+        self.check_outcomes(workers=1)
+
+    def test_outcomes_thread_pool(self):
+        self.check_outcomes(workers=3)
+
+    def test_batch_size(self):
+        torrents = [make_torrent(str(i).encode())[0] for i in range(5)]
+        outcomes = self.rt.load_torrents(torrents, workers=2, batch_size=2)
+
+        self.assertEqual([r for h, r in outcomes], [0] * 5)
+        self.assertEqual(self.fake.calls.count("system.multicall"), 3)
+        self.assertEqual(len(self.fake.torrents), 5)
+
+    def test_rejected(self):
+        one, one_hash = make_torrent(b"one")
+
+        def reject(method, params, dispatch=self.fake._dispatch):
+            if method == "load_raw":
+                raise xmlrpclib.Fault(-503, "Could not create download.")
+            return(dispatch(method, params))
+        self.fake._dispatch = reject
+
+        outcomes = self.rt.load_torrents([one])
+        self.assertEqual(outcomes[0][0], one_hash)
+        self.assertIsInstance(outcomes[0][1], xmlrpclib.Fault)
+
+
+class TestLoadTorrent(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=2)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_indexed(self):
+        torrents = self.rt.get_torrents()
+        raw, h = make_torrent(b"new")
+
+        t = self.rt.load_torrent(raw, fields=["name"])
+        self.assertEqual(t.info_hash, h)
+        self.assertEqual(self.rt.torrents, torrents + [t])
+        self.assertIs(rtorrent.find_torrent(h, self.rt._torrent_index), t)
+
+        # loaded again: the instance is replaced
+        again = self.rt.load_torrent(raw, fields=["name"])
+        self.assertEqual(self.rt.torrents, torrents + [again])
+        self.assertIs(self.rt._torrent_index[h], again)
+
+    def test_sync_state_unchanged(self):
+        self.rt.sync()
+        raw, h = make_torrent(b"new")
+        self.rt.load_torrent(raw, fields=["name"])
+        self.assertIn(h, self.rt._torrent_index)
+
+        # the next sync still retrieves its static fields
+        added = self.rt.sync()[0]
+        self.assertEqual([t.info_hash for t in added], [h])
+
+    def test_verify_retries(self):
+        def ignore_load(method, params, dispatch=self.fake._dispatch):
+            if method == "load_raw":
+                return(0)
+            return(dispatch(method, params))
+        self.fake._dispatch = ignore_load
+
+        self.assertRaises(AssertionError, self.rt.load_torrent,
+                          make_torrent(b"new")[0], verify_timeout=60)
+        # the first check and 3 retries
+        self.assertEqual(self.fake.calls.count("d.get_hash"), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import rtorrent
+import rtorrent.file
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestPollTorrents(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=5, files=3, peers=2, trackers=2)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.torrents = self.rt.get_torrents(fields=["name"])
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_batch_size(self):
+        start = len(self.fake.calls)
+        self.assertEqual(self.rt.poll_torrents(batch_size=2), [])
+
+        calls = self.fake.calls[start:]
+        self.assertEqual(calls.count("system.multicall"), 3)
+        for name in ("p.multicall", "t.multicall", "f.multicall"):
+            self.assertEqual(calls.count(name), 5)
+
+        # 3 calls per torrent in each request
+        requests = [i for i, c in enumerate(calls) if c == "system.multicall"]
+        self.assertEqual([b - a - 1 for a, b in
+                          zip(requests, requests[1:] + [len(calls)])],
+                         [6, 6, 3])
+
+        for t in self.torrents:
+            self.assertEqual(len(t.peers), 2)
+            self.assertEqual(len(t.trackers), 2)
+            self.assertEqual(len(t.files), 3)
+            self.assertEqual(t.files[0].info_hash, t.info_hash)
+
+    def test_failed(self):
+        del self.fake.torrents[info_hash(1)]
+        failed = self.rt.poll_torrents(self.torrents[:3], batch_size=10)
+        self.assertEqual(failed, [self.torrents[1]])
+        self.assertEqual(self.torrents[1].files, [])
+        self.assertEqual(len(self.torrents[2].files), 3)
+
+    def f_multicall_fields(self, start):
+        return([p[2:] for c, p in zip(self.fake.calls[start:],
+                                      self.fake.params[start:])
+                if c == "f.multicall"])
+
+    def test_files_updated(self):
+        self.rt.poll_torrents()
+        files = [list(t.files) for t in self.torrents]
+
+        start = len(self.fake.calls)
+        self.assertEqual(self.rt.poll_torrents(), [])
+        for t, old_files in zip(self.torrents, files):
+            self.assertEqual(len(t.files), 3)
+            self.assertTrue(all(f is old for f, old in zip(t.files,
+                                                            old_files)))
+
+        # the immutable fields aren't retrieved again
+        fields = self.f_multicall_fields(start)
+        self.assertEqual(len(fields), 5)
+        immutable = [m.rpc_call + "=" for m in rtorrent.file.methods
+                     if m.is_immutable()]
+        self.assertTrue(fields[0])
+        self.assertFalse([f for f in fields[0] if f in immutable])
+
+    def test_file_list_changed(self):
+        self.rt.poll_torrents(self.torrents[:1])
+        old_files = list(self.torrents[0].files)
+
+        self.fake.files = 4
+        self.assertEqual(self.rt.poll_torrents(self.torrents[:1]), [])
+        self.assertEqual(len(self.torrents[0].files), 4)
+        self.assertFalse([f for f in self.torrents[0].files
+                          if f in old_files])
+
+
+if __name__ == "__main__":
+    unittest.main()
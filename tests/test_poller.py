@@ -0,0 +1,54 @@
+import threading
+import unittest
+
+import rtorrent
+from rtorrent.events import ADDED
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=3)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        for poller in self.rt._pollers.values():
+            poller.stop(5)
+        self.fake.close()
+
+    def test_manual_polls_keep_poller_events(self):
+        added = threading.Event()
+        received = []
+
+        def callback(event):
+            received.append(event)
+            added.set()
+
+        self.rt.subscribe(callback, [ADDED])
+        poller = self.rt.start_poller(0.05)
+        self.assertTrue(poller.ready.wait(5))
+
+        self.fake.add_torrent(info_hash(3), 3)
+        # the first manual poll has nothing to compare with, and doesn't
+        # replace the poller's previous snapshot
+        self.assertEqual(self.rt.poll_events(fields=["name"]), [])
+
+        self.assertTrue(added.wait(5))
+        self.assertEqual([e.info_hash for e in received], [info_hash(3)])
+
+    def test_get_snapshot(self):
+        self.assertEqual(self.rt.get_snapshot(), None)
+
+        self.rt.poll_events(fields=["name"])
+        self.assertEqual(self.rt.get_snapshot(), None)
+        self.assertEqual(len(self.rt.get_snapshot(fields=["name"])), 3)
+
+        poller = self.rt.start_poller(60)
+        self.assertTrue(poller.ready.wait(5))
+        self.assertTrue("name" not in self.rt.get_snapshot())
+        self.assertEqual(len(self.rt.get_snapshot()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+import rtorrent
+import rtorrent.peer
+import rtorrent.torrent
+from rtorrent.rpc import CapabilityIndex, Method, get_retriever_methods
+from tests.fakeserver import FakeRTorrent
+
+
+class TestGetRetrieverMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=1)
+        self.uri = self.fake.serve()
+
+    def tearDown(self):
+        self.fake.close()
+
+    def get_rpc_calls(self, fields):
+        rt = rtorrent.RTorrent(self.uri)
+        return([m.rpc_call for m in
+                get_retriever_methods(rtorrent.peer.methods, rt, fields)])
+
+    def test_available_alias(self):
+        self.fake.missing = set(["p.client_version", "p.completed_percent"])
+        self.assertEqual(self.get_rpc_calls(["client_version",
+                                             "completed_percent"]),
+                         ["p.get_client_version", "p.get_completed_percent"])
+
+        self.fake.missing = set(["p.get_client_version",
+                                 "p.get_completed_percent"])
+        self.assertEqual(self.get_rpc_calls(["client_version",
+                                             "completed_percent"]),
+                         ["p.client_version", "p.completed_percent"])
+
+    def test_unavailable_field(self):
+        self.fake.missing = set(["p.client_version", "p.get_client_version"])
+        self.assertRaises(rtorrent.rpc.MethodError, self.get_rpc_calls,
+                          ["client_version"])
+
+    def test_invalid_field(self):
+        self.assertRaises(AssertionError, self.get_rpc_calls, ["nope"])
+
+
+class TestCapabilityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=1)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.name = rtorrent.rpc.find_method("d.get_name")
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_index(self):
+        index = CapabilityIndex(["d.get_name", "d.custom_method"], (0, 9, 2))
+        self.assertTrue(index.is_available(self.name))
+        self.assertFalse(index.is_available(
+            rtorrent.rpc.find_method("d.get_directory")))
+
+        # not in a method list
+        raw = rtorrent.rpc._get_method("d.custom_method")
+        self.assertTrue(index.is_available(raw))
+        self.assertFalse(index.is_available(
+            rtorrent.rpc._get_method("d.other_method")))
+
+    def test_min_version(self):
+        method = Method(rtorrent.torrent.Torrent, "get_new", "d.get_new",
+                        min_version=(0, 9, 4))
+        self.assertFalse(CapabilityIndex(["d.get_new"],
+                                         (0, 9, 2)).is_available(method))
+        self.assertTrue(CapabilityIndex(["d.get_new"],
+                                        (0, 9, 4)).is_available(method))
+
+    def test_detect(self):
+        self.fake.missing = set(["d.get_directory"])
+        self.assertTrue(self.name.is_available(self.rt))
+        self.assertFalse(rtorrent.rpc.find_method(
+            "d.get_directory").is_available(self.rt))
+
+        # built once, checking availability doesn't send any request
+        requests = self.fake.requests
+        for i in range(10):
+            self.name.is_available(self.rt)
+        self.assertEqual(self.fake.requests, requests)
+        self.assertEqual(self.fake.calls.count("system.listMethods"), 1)
+
+    def test_invalidate(self):
+        self.fake.missing = set(["d.get_directory"])
+        directory = rtorrent.rpc.find_method("d.get_directory")
+        self.assertFalse(directory.is_available(self.rt))
+
+        # new methods (ex. after create_group()) are picked up once the
+        # method list is requested again
+        self.fake.missing = set()
+        self.assertFalse(directory.is_available(self.rt))
+        self.rt._update_rpc_methods()
+        self.assertTrue(directory.is_available(self.rt))
+        self.assertEqual(self.fake.calls.count("system.listMethods"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
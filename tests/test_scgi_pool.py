@@ -0,0 +1,104 @@
+import socket
+import threading
+import time
+import unittest
+
+import rtorrent
+from rtorrent.lib.xmlrpc import scgi
+from rtorrent.lib.xmlrpc.scgi import PooledSCGITransport, SCGIServerProxy
+from tests.fakeserver import FakeRTorrent
+
+
+class TestPooledSCGITransport(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=5, files=2)
+        self.uri = self.fake.serve()
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_nested_call_while_streaming(self):
+        rt = rtorrent.RTorrent(self.uri, max_connections=1)
+        files = []
+
+        def run():
+            for t in rt.iter_torrents():
+                files.append(t.get_files())
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive(), "iter_torrents() deadlocked")
+        self.assertEqual(len(files), 5)
+        self.assertTrue(all(len(f) == 2 for f in files))
+
+    def test_abandoned_stream_keeps_no_slot(self):
+        rt = rtorrent.RTorrent(self.uri, max_connections=1)
+        stream = rt.iter_torrents()
+        next(stream)
+
+        result = []
+        thread = threading.Thread(target=lambda: result.append(rt.get_views()))
+        thread.daemon = True
+        thread.start()
+        thread.join(10)
+
+        self.assertEqual(result, [["main", "default"]])
+        stream.close()
+
+    def test_pending_connect_times_out(self):
+        # a full backlog: the connects after the first one stay pending
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(("127.0.0.1", 0))
+        server.listen(0)
+        socks = []
+        for i in range(3):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            sock.connect_ex(server.getsockname())
+            socks.append(sock)
+
+        timeout, scgi.CONNECT_TIMEOUT = scgi.CONNECT_TIMEOUT, 0.1
+        try:
+            self.assertIsNone(socket.getdefaulttimeout())
+            start = time.time()
+            self.assertFalse(PooledSCGITransport()._is_usable(socks[-1]))
+            self.assertLess(time.time() - start, 5)
+        finally:
+            scgi.CONNECT_TIMEOUT = timeout
+            for sock in socks:
+                sock.close()
+            server.close()
+
+    def test_replenish_one_socket_per_request(self):
+        transport = PooledSCGITransport(pool_size=3)
+        proxy = SCGIServerProxy(self.uri, transport=transport)
+        key = (self.uri[len("scgi://"):], "/")
+
+        proxy.system.client_version()
+        self.assertEqual(len(transport._idle[key]), 1)
+        for i in range(5):
+            proxy.system.client_version()
+            self.assertEqual(len(transport._idle[key]), 1)
+        transport.close()
+
+    def test_max_idle(self):
+        transport = PooledSCGITransport(max_idle=0)
+        proxy = SCGIServerProxy(self.uri, transport=transport)
+        key = (self.uri[len("scgi://"):], "/")
+
+        proxy.system.client_version()
+        stale = transport._idle[key][0][0]
+        time.sleep(0.01)
+        sock = transport._connect(*key)
+        self.assertIsNot(sock, stale)
+        self.assertEqual(stale.fileno(), -1)  # closed
+        sock.close()
+        transport.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
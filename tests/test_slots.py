@@ -0,0 +1,73 @@
+import unittest
+
+import rtorrent
+import rtorrent.file
+import rtorrent.peer
+import rtorrent.torrent
+import rtorrent.tracker
+from rtorrent.file import File
+from rtorrent.peer import Peer
+from rtorrent.torrent import Torrent
+from rtorrent.tracker import Tracker
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=2)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_round_trip(self):
+        for class_, method_list, args in (
+                (Torrent, rtorrent.torrent.methods, ("HASH",)),
+                (Peer, rtorrent.peer.methods, ("HASH",)),
+                (Tracker, rtorrent.tracker.methods, ("HASH",)),
+                (File, rtorrent.file.methods, ("HASH", 0))):
+            varnames = set(m.varname for m in method_list
+                           if m.is_retriever())
+            fields = dict((name, object()) for name in varnames)
+            obj = class_(self.rt, *args, **fields)
+
+            self.assertFalse(hasattr(obj, "__dict__"), class_)
+            for name, value in fields.items():
+                self.assertIs(getattr(obj, name), value, name)
+
+    def test_retrieved_fields(self):
+        t = self.rt.get_torrents()[0]
+        self.assertFalse(hasattr(t, "__dict__"))
+        self.assertEqual(t.info_hash, info_hash(0))
+        self.assertEqual(t.name, "torrent-0")
+        self.assertEqual(getattr(t, "timestamp.started"),
+                         self.fake.value("d.timestamp.started", t.info_hash))
+
+        for obj in t.get_peers() + t.get_trackers() + t.get_files():
+            self.assertFalse(hasattr(obj, "__dict__"))
+        peer = t.peers[0]
+        self.assertEqual(peer.completed_percent,
+                         self.fake.value("p.completed_percent",
+                                         t.info_hash))
+
+    def test_method_of_the_same_name(self):
+        # until the field is set, the method of the same name is returned
+        peer = Peer(self.rt, info_hash(0), id="PEER0")
+        self.assertEqual(peer.completed_percent(),
+                         self.fake.value("p.completed_percent",
+                                         info_hash(0)))
+
+        peer.completed_percent = 50
+        self.assertEqual(peer.completed_percent, 50)
+        self.assertTrue(callable(Peer.completed_percent))
+
+    def test_raw_call_results(self):
+        # the results of raw calls aren't kept on the instances
+        t = self.rt.get_torrents()[0]
+        t.get_peers()
+        self.assertFalse(hasattr(t, "multicall"))
+
+
+if __name__ == "__main__":
+    unittest.main()
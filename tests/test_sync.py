@@ -0,0 +1,157 @@
+import unittest
+
+import rtorrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestSync(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=4)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def multicall_fields(self):
+        """Commands of the last d.multicall"""
+        i = len(self.fake.calls) - 1 - self.fake.calls[::-1].index(
+            "d.multicall")
+        return(self.fake.params[i][2:])
+
+    def calls_since(self, start):
+        """(method, info hash) of the calls made since the C{start}-th"""
+        return([(c, p[0] if p else None) for c, p in
+                zip(self.fake.calls[start:], self.fake.params[start:])])
+
+    def test_first_sync(self):
+        added, removed = self.rt.sync()
+        self.assertEqual(sorted(t.info_hash for t in added),
+                         sorted(self.fake.torrents))
+        self.assertEqual(removed, [])
+        # a single d.multicall with every field
+        self.assertEqual(self.fake.calls, ["system.listMethods",
+                                           "system.client_version",
+                                           "d.multicall"])
+        self.assertIn("d.get_name=", self.multicall_fields())
+        self.assertIn("d.get_down_rate=", self.multicall_fields())
+
+    def test_volatile_fields_only(self):
+        self.rt.sync()
+        torrents = list(self.rt.torrents)
+        start, requests = len(self.fake.calls), self.fake.requests
+
+        self.assertEqual(self.rt.sync(), ([], []))
+        self.assertEqual(self.fake.calls[start:], ["d.multicall"])
+        self.assertEqual(self.fake.requests, requests + 1)
+        varnames = dict((m.rpc_call + "=", m.varname)
+                        for m in rtorrent.torrent.methods)
+        fields = self.multicall_fields()
+        self.assertEqual(sorted(varnames[f] for f in fields),
+                         sorted(rtorrent.torrent.volatile_fields))
+        self.assertNotIn("d.get_name=", fields)
+
+        # the same instances, updated in place
+        self.assertEqual([id(t) for t in self.rt.torrents],
+                         [id(t) for t in torrents])
+
+    def test_static_fields_once_per_new_hash(self):
+        self.rt.sync()
+        self.fake.add_torrent("NEW", 5)
+        start, requests = len(self.fake.calls), self.fake.requests
+
+        added, removed = self.rt.sync()
+        self.assertEqual([t.info_hash for t in added], ["NEW"])
+        self.assertEqual(removed, [])
+        calls = self.calls_since(start)
+        self.assertEqual(calls[0], ("d.multicall", "main"))
+        self.assertEqual(calls[1], ("system.multicall", calls[1][1]))
+        static_calls = calls[2:]
+        self.assertEqual(set(h for c, h in static_calls), set(["NEW"]))
+        self.assertIn("d.get_name", [c for c, h in static_calls])
+        self.assertEqual(len(static_calls), len(set(static_calls)))
+        self.assertEqual(self.fake.requests, requests + 2)
+
+        # not again on the next sync
+        start = len(self.fake.calls)
+        self.rt.sync()
+        self.assertEqual(self.fake.calls[start:], ["d.multicall"])
+
+    def test_removed(self):
+        self.rt.sync()
+        gone = self.rt.torrents[1]
+        del self.fake.torrents[gone.info_hash]
+
+        added, removed = self.rt.sync()
+        self.assertEqual(added, [])
+        self.assertEqual(removed, [gone])
+        self.assertNotIn(gone, self.rt.torrents)
+        self.assertNotIn(gone.info_hash, self.rt._torrent_index)
+
+    def test_batch_size(self):
+        self.rt.sync()
+        for i in range(10, 15):
+            self.fake.add_torrent(info_hash(i), i)
+        n = len(rtorrent.torrent.static_fields) + \
+            len(rtorrent.torrent.slow_fields)
+        start = len(self.fake.calls)
+
+        # room for the fields of 2 torrents per request
+        added = self.rt.sync(batch_size=2 * n + 1)[0]
+        self.assertEqual(len(added), 5)
+        self.assertEqual(self.fake.calls[start:].count("system.multicall"),
+                         3)
+        self.assertTrue(all(t.name == "torrent-%d" % i
+                            for t, i in zip(added, range(10, 15))))
+
+    def test_torrents_and_index(self):
+        self.rt.sync()
+        del self.fake.torrents[info_hash(0)]
+        self.fake.add_torrent("NEW", 5)
+        self.rt.sync()
+
+        self.assertEqual([t.info_hash for t in self.rt.torrents],
+                         list(self.fake.torrents))
+        self.assertEqual(sorted(self.rt._torrent_index),
+                         sorted(self.fake.torrents))
+        for t in self.rt.torrents:
+            self.assertIs(self.rt._torrent_index[t.info_hash], t)
+
+    def test_slow_fields(self):
+        self.rt.sync()
+        for t in self.rt.torrents:
+            self.assertEqual(t.directory,
+                             self.fake.torrents[t.info_hash]["directory"])
+            self.assertTrue(t.base_path)
+
+        t = self.rt.torrents[0]
+        self.fake.torrents[t.info_hash]["directory"] = "/moved"
+        self.fake.torrents[t.info_hash]["down_rate"] = 12345
+        self.rt.sync()
+        self.assertNotIn("d.get_directory=", self.multicall_fields())
+        self.assertEqual(t.down_rate, 12345)
+        self.assertNotEqual(t.directory, "/moved")
+
+        self.rt.sync(slow_interval=0)
+        self.assertIn("d.get_directory=", self.multicall_fields())
+        self.assertEqual(t.directory, "/moved")
+
+    def test_slow_fields_of_added_torrents(self):
+        self.rt.sync()
+        self.fake.add_torrent("NEW", 7)
+        added = self.rt.sync()[0]
+        self.assertEqual([t.info_hash for t in added], ["NEW"])
+        self.assertEqual(added[0].directory, "/data/1")
+        self.assertTrue(added[0].base_path)
+        self.assertEqual(added[0].name, "torrent-7")
+
+    def test_setter_updates_synced_torrent(self):
+        self.rt.sync()
+        t = self.rt.torrents[0]
+        t.set_directory("/new")
+        self.rt.sync()
+        self.assertEqual(t.directory, "/new")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import array
+import unittest
+
+import rtorrent
+from rtorrent.table import TorrentTable
+from tests.fakeserver import FakeRTorrent, info_hash
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+COLUMNS = [("info_hash", ["A", "B", "C", "D"]),
+           ("directory", ["/x", "/y", "/x", "/x"]),
+           ("up_rate", [5, 0, 7, 5]),
+           ("ratio", [1.5, 0.0, 2.0, 0.5]),
+           ("complete", [True, False, True, False]),
+           ("tags", [[1], [], [2], [3]])]
+
+
+class TableTests(object):
+
+    use_numpy = None
+
+    def setUp(self):
+        self.table = TorrentTable(COLUMNS, self.use_numpy)
+
+    def column(self, table, field):
+        return(list(table[field]))
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.fields, [f for f, v in COLUMNS])
+        self.assertIn("up_rate", self.table)
+        self.assertNotIn("down_rate", self.table)
+        for field, values in COLUMNS:
+            self.assertEqual(self.column(self.table, field), values)
+
+    def test_row(self):
+        self.assertEqual(self.table.row(1)["directory"], "/y")
+        self.assertEqual(self.table.find("C")["up_rate"], 7)
+        self.assertIsNone(self.table.find("Z"))
+        self.assertEqual([r["info_hash"] for r in self.table.rows()],
+                         ["A", "B", "C", "D"])
+
+    def test_filter(self):
+        for field, op, value, expected in (
+                ("up_rate", ">", 0, ["A", "C", "D"]),
+                ("up_rate", "==", 5, ["A", "D"]),
+                ("directory", "!=", "/x", ["B"]),
+                ("ratio", "<=", 0.5, ["B", "D"]),
+                ("directory", "in", ["/y", "/z"], ["B"])):
+            filtered = self.table.filter(field, op, value)
+            self.assertEqual(self.column(filtered, "info_hash"), expected)
+        self.assertRaises(AssertionError, self.table.filter, "up_rate", "~",
+                          0)
+
+    def test_select(self):
+        selected = self.table.select([False, True, True, False])
+        self.assertEqual(self.column(selected, "info_hash"), ["B", "C"])
+        self.assertEqual(self.column(selected, "tags"), [[], [2]])
+        self.assertEqual(len(self.table.select([False] * 4)), 0)
+
+    def test_sort(self):
+        self.assertEqual(
+            self.column(self.table.sort("up_rate"), "info_hash"),
+            ["B", "A", "D", "C"])
+        # stable in both directions
+        self.assertEqual(
+            self.column(self.table.sort("up_rate", reverse=True),
+                        "info_hash"), ["C", "A", "D", "B"])
+
+    def test_group_by(self):
+        groups = self.table.group_by("directory")
+        self.assertEqual(sorted(groups), ["/x", "/y"])
+        self.assertEqual(self.column(groups["/x"], "info_hash"),
+                         ["A", "C", "D"])
+        self.assertEqual(self.column(groups["/y"], "up_rate"), [0])
+
+    def test_sum(self):
+        self.assertEqual(self.table.sum("up_rate"), 17)
+        self.assertEqual(self.table.sum("up_rate", by="directory"),
+                         {"/x": 17, "/y": 0})
+        self.assertEqual(self.table.sum("ratio", by="complete"),
+                         {True: 3.5, False: 0.5})
+
+
+@unittest.skipIf(numpy is None, "numpy isn't installed")
+class TestNumpyTable(TableTests, unittest.TestCase):
+
+    use_numpy = True
+
+    def test_column_types(self):
+        self.assertIsInstance(self.table["up_rate"], numpy.ndarray)
+        self.assertEqual(self.table["up_rate"].dtype, numpy.int64)
+        self.assertEqual(self.table["ratio"].dtype, numpy.float64)
+        self.assertEqual(self.table["complete"].dtype, numpy.bool_)
+        self.assertEqual(self.table["tags"].dtype, object)
+        self.assertEqual(self.table["tags"].shape, (4,))
+
+    def test_mask_expression(self):
+        table = self.table.select((self.table["up_rate"] > 0) &
+                                  self.table["complete"])
+        self.assertEqual(self.column(table, "info_hash"), ["A", "C"])
+
+
+class TestArrayTable(TableTests, unittest.TestCase):
+
+    use_numpy = False
+
+    def test_column_types(self):
+        self.assertIsInstance(self.table["up_rate"], array.array)
+        self.assertEqual(self.table["ratio"].typecode, "d")
+        self.assertEqual(self.table["complete"].typecode, "b")
+        self.assertIsInstance(self.table["directory"], list)
+        # equal strings share one object
+        self.assertIs(self.table["directory"][0], self.table["directory"][2])
+
+    def test_sorted_table_keeps_column_types(self):
+        table = self.table.sort("ratio")
+        self.assertIsInstance(table["up_rate"], array.array)
+        self.assertIsInstance(table["directory"], list)
+
+
+class TestGetTorrentTable(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=4)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+
+    def tearDown(self):
+        self.fake.close()
+
+    def test_get_torrent_table(self):
+        table = self.rt.get_torrent_table("main", ["name", "up_rate"],
+                                          use_numpy=False)
+        self.assertEqual(table.fields, ["info_hash", "name", "up_rate"])
+        self.assertEqual(list(table["info_hash"]),
+                         [info_hash(i) for i in range(4)])
+        self.assertEqual(list(table["up_rate"]), [0, 1, 2, 3])
+        self.assertEqual(self.fake.params[-1][0], "main")
+
+
+if __name__ == "__main__":
+    unittest.main()
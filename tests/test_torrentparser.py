@@ -0,0 +1,69 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import rtorrent.lib.torrentparser as torrentparser
+from rtorrent.lib.torrentparser import (LazyTorrentParser, NewTorrentParser,
+                                        TorrentParser)
+
+INFO = b"d6:lengthi100e4:name4:test12:piece lengthi16384e6:pieces20:" + \
+    b"\x01" * 20 + b"e"
+TORRENT = b"d8:announce14:http://tracker4:info" + INFO + b"e"
+
+
+class TestLazyTorrentParser(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "test.torrent")
+        with open(self.path, "wb") as fp:
+            fp.write(TORRENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def check(self, pieces_type):
+        with LazyTorrentParser(self.path) as tp:
+            self.assertEqual(tp.info_hash,
+                             hashlib.sha1(INFO).hexdigest().upper())
+            self.assertEqual(tp.name, b"test")
+            self.assertEqual(tp.total_size, 100)
+
+            pieces = tp.pieces
+            self.assertIsInstance(pieces, pieces_type)
+            self.assertEqual(bytes(pieces), b"\x01" * 20)
+            if isinstance(pieces, memoryview):
+                pieces.release()
+
+    def test_parse(self):
+        self.check(memoryview)
+
+    def test_parse_py2(self):
+        # Python 2's mmap doesn't support memoryview
+        is_py3 = torrentparser.is_py3
+        torrentparser.is_py3 = lambda: False
+        try:
+            self.check(bytes)
+        finally:
+            torrentparser.is_py3 = is_py3
+
+
+class TestTorrentParser(unittest.TestCase):
+
+    def test_parse(self):
+        info_hash = hashlib.sha1(INFO).hexdigest().upper()
+        self.assertEqual(TorrentParser(TORRENT).info_hash, info_hash)
+        self.assertEqual(NewTorrentParser(TORRENT)._calc_info_hash(),
+                         info_hash)
+
+    def test_info_not_a_dict(self):
+        for data in (b"d4:infoi1ee", b"d4:info4:spame", b"d4:infolee"):
+            self.assertRaises(AssertionError, TorrentParser, data)
+            self.assertRaises(AssertionError,
+                              NewTorrentParser(data)._calc_info_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+try:
+    import xmlrpc.client as xmlrpclib
+except ImportError:
+    import xmlrpclib
+
+import rtorrent
+from tests.fakeserver import FakeRTorrent, info_hash
+
+
+class TestWriteThrough(unittest.TestCase):
+
+    def setUp(self):
+        self.fake = FakeRTorrent(torrents=2)
+        self.rt = rtorrent.RTorrent(self.fake.serve())
+        self.torrent = self.rt.get_torrents(fields=["priority",
+                                                    "message"])[0]
+
+    def tearDown(self):
+        self.fake.close()
+
+    def answer(self, method, result):
+        """Make the fake answer C{B{method}} with C{B{result}} (raised if
+        it's an exception)"""
+        def dispatch(name, params, dispatch=self.fake._dispatch):
+            if name != method:
+                return(dispatch(name, params))
+            self.fake.calls.append(name)
+            if isinstance(result, Exception):
+                raise result
+            return(result)
+
+        self.fake._dispatch = dispatch
+
+    def test_set(self):
+        self.torrent.set_priority(3)
+        self.assertEqual(self.torrent.priority, 3)
+        self.assertEqual(self.fake.torrents[info_hash(0)]["priority"], 3)
+        self.assertNotIn("priority", self.torrent.dirty_fields)
+
+        # not retrieved again
+        calls = len(self.fake.calls)
+        self.assertEqual(self.torrent.priority, 3)
+        self.assertEqual(len(self.fake.calls), calls)
+
+    def test_set_clears_dirty_field(self):
+        self.torrent.dirty_fields.add("message")
+        self.torrent.set_message("hello")
+        self.assertEqual(self.torrent.message, "hello")
+        self.assertEqual(self.torrent.dirty_fields, set())
+
+    def test_not_set(self):
+        # rTorrent returns something else than 0: the value is unknown
+        self.answer("d.set_priority", 1)
+        self.torrent.set_priority(3)
+        self.assertEqual(self.torrent.priority, 2)
+        self.assertIn("priority", self.torrent.dirty_fields)
+
+        # until it's retrieved again
+        self.fake.torrents[info_hash(0)]["priority"] = 1
+        self.assertEqual(self.torrent.get_priority(), 1)
+        self.assertEqual(self.torrent.priority, 1)
+        self.assertNotIn("priority", self.torrent.dirty_fields)
+
+    def test_fault(self):
+        self.answer("d.set_priority",
+                    xmlrpclib.Fault(-503, "Invalid priority."))
+        self.assertRaises(xmlrpclib.Fault, self.torrent.set_priority, 9)
+        self.assertEqual(self.torrent.priority, 2)
+        self.assertNotIn("priority", self.torrent.dirty_fields)
+
+    def test_other_torrent(self):
+        # modifiers of other objects' fields aren't written through
+        m = rtorrent.rpc.Multicall(self.rt)
+        m.add("d.set_priority", info_hash(1), 0)
+        m.call()
+        self.assertFalse(hasattr(self.rt, "priority"))
+        self.assertEqual(self.torrent.priority, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()